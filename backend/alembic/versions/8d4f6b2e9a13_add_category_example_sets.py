@@ -0,0 +1,50 @@
+"""Add category_example_sets table for reusing LLM example sentences
+
+Revision ID: 8d4f6b2e9a13
+Revises: 5a8e1d3c7f20
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d4f6b2e9a13"
+down_revision: Union[str, Sequence[str], None] = "5a8e1d3c7f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "category_example_sets",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("keywords", sa.Text(), nullable=False),
+        sa.Column("sentences", sa.Text(), nullable=False),
+        sa.Column("embeddings", sa.LargeBinary(), nullable=False),
+        sa.Column("hits", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("last_used_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(
+        op.f("ix_category_example_sets_last_used_at"),
+        "category_example_sets",
+        ["last_used_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_category_example_sets_last_used_at"),
+        table_name="category_example_sets",
+    )
+    op.drop_table("category_example_sets")
@@ -0,0 +1,34 @@
+"""Add prototype matrix to categories
+
+Revision ID: 9b3d2f6a1c7e
+Revises: 4f92dbe5dc1b
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b3d2f6a1c7e"
+down_revision: Union[str, Sequence[str], None] = "4f92dbe5dc1b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("categories", sa.Column("prototypes", sa.LargeBinary(), nullable=True))
+    # 기존 카테고리는 대표 벡터 하나를 유일한 프로토타입으로 사용
+    op.execute(
+        "UPDATE categories SET prototypes = embedding "
+        "WHERE prototypes IS NULL AND embedding IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("categories", "prototypes")
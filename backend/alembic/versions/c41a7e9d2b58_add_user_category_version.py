@@ -0,0 +1,34 @@
+"""Add category_version counter to users
+
+Revision ID: c41a7e9d2b58
+Revises: 9b3d2f6a1c7e
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41a7e9d2b58"
+down_revision: Union[str, Sequence[str], None] = "9b3d2f6a1c7e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column(
+            "category_version", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "category_version")
@@ -0,0 +1,32 @@
+"""Add optimistic-concurrency version to categories
+
+Revision ID: e7b2c9f04a31
+Revises: c41a7e9d2b58
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b2c9f04a31"
+down_revision: Union[str, Sequence[str], None] = "c41a7e9d2b58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "categories",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("categories", "version")
@@ -1,18 +1,21 @@
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
+from app.core.auth_cache import Principal, principal_cache, token_cache
 from app.core.security import decode_access_token
-from app.db import get_db
+from app.db import SessionLocal, get_db
 from app.v2.models import User
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: Session = Depends(get_db),
-) -> User:
+def _user_id_from_credentials(
+    credentials: HTTPAuthorizationCredentials | None,
+) -> int:
+    """Bearer 토큰을 검증해 사용자 ID(sub)를 돌려준다. 같은 토큰의 서명 검증 결과는 캐시한다."""
+
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -21,6 +24,10 @@ def get_current_user(
 
     token = credentials.credentials
 
+    cached_user_id = token_cache.get(token)
+    if cached_user_id is not None:
+        return cached_user_id
+
     try:
         payload = decode_access_token(token)
     except ValueError as exc:
@@ -44,6 +51,16 @@ def get_current_user(
             detail="Invalid authentication token.",
         ) from exc
 
+    token_cache.set(token, user_id, payload.get("exp"))
+    return user_id
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: Session = Depends(get_db),
+) -> User:
+    user_id = _user_id_from_credentials(credentials)
+
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
@@ -56,3 +73,35 @@ def get_current_user(
 
 def get_current_user_id(user: User = Depends(get_current_user)) -> int:
     return user.id
+
+
+def _load_principal(user_id: int) -> Principal | None:
+    # 캐시 미스일 때만 세션을 열어 사용자 존재 여부를 확인한다.
+    with SessionLocal() as db:
+        row = db.query(User.id, User.username).filter(User.id == user_id).first()
+    if row is None:
+        return None
+    return Principal(id=row.id, username=row.username)
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+) -> Principal:
+    """
+    DB 세션 없이 인증된 사용자 정보를 얻는 의존성 (필터 같은 읽기 전용 hot path용).
+    토큰 검증 결과와 사용자 정보가 모두 캐시에 있으면 DB 왕복도, 스레드 전환도 없다.
+    """
+
+    user_id = _user_id_from_credentials(credentials)
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = await run_in_threadpool(_load_principal, user_id)
+        if principal is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found.",
+            )
+        principal_cache.set(principal)
+
+    return principal
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Response, status
+
+from app.db import database_pool_status
+from app.services.v1.llm import llm_client_status
+from app.services.v1.verdict_cache import verdict_cache
+from app.services.v2.category_cache import category_cache_status
+from app.services.v2.embedding import embedding_model_status
+from app.services.v2.embedding_cache import embedding_cache
+from app.services.v2.feedback import feedback_writer
+
+router = APIRouter()
+
+
+@router.get("/live")
+def live():
+    """프로세스가 살아 있는지만 확인합니다."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def ready(response: Response):
+    """임베딩 모델 로드와 워밍업이 끝나 요청을 받을 준비가 되었는지 확인합니다."""
+    model_status = embedding_model_status()
+    if model_status["state"] != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": model_status["state"],
+        "embedding": model_status,
+        "embedding_cache": embedding_cache.stats(),
+        "category_cache": category_cache_status(),
+        "database": database_pool_status(),
+        "feedback_writer": feedback_writer.stats(),
+        "llm": llm_client_status(),
+        "v1_verdict_cache": verdict_cache.stats(),
+    }
@@ -6,5 +6,5 @@ router = APIRouter()
 
 
 @router.post("/")
-def filter(form: FilterRequest) -> FilterResponse:
-    return detectCategory(form)
+async def filter(form: FilterRequest) -> FilterResponse:
+    return await detectCategory(form)
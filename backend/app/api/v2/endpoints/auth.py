@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_db
+from app.db import get_async_db
 from app.core.security import create_access_token
 from app.schemas.v2.auth import (
     SignupRequest,
@@ -9,17 +9,26 @@ from app.schemas.v2.auth import (
     LoginRequest,
     LoginResponse,
 )
-from app.services.v2.auth import create_user, authenticate_user
+from app.services.v2.auth import (
+    PasswordHashingBusyError,
+    authenticate_user,
+    create_user,
+)
 
 router = APIRouter()
 
 
 @router.post("/signup", response_model=SignupResponse, status_code=status.HTTP_201_CREATED)
-def signup(req: SignupRequest, db: Session = Depends(get_db)):
+async def signup(req: SignupRequest, db: AsyncSession = Depends(get_async_db)):
     try:
-        user = create_user(db=db, username=req.username, password=req.password)
+        user = await create_user(db=db, username=req.username, password=req.password)
         token = create_access_token({"sub": str(user.id), "username": user.username})
         return SignupResponse(id=user.id, username=user.username, access_token=token)
+    except PasswordHashingBusyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        ) from exc
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -33,8 +42,16 @@ def signup(req: SignupRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=LoginResponse, status_code=status.HTTP_200_OK)
-def login(req: LoginRequest, db: Session = Depends(get_db)):
-    user = authenticate_user(db=db, username=req.username, password=req.password)
+async def login(req: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    try:
+        user = await authenticate_user(
+            db=db, username=req.username, password=req.password
+        )
+    except PasswordHashingBusyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        ) from exc
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
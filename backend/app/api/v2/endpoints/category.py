@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.schemas.v2.category import (
     CategoryCreateRequest,
     CategoryDeleteRequest,
     CategoryDeleteResponse,
+    CategoryJobResponse,
     CategoryResponse,
 )
 from app.services.v2.category import (
@@ -12,8 +14,10 @@ from app.services.v2.category import (
     delete_category as delete_category_service,
     list_user_categories,
 )
-from app.db import get_db  # DB 세션 주입용
-from app.api.dependencies.auth import get_current_user
+from app.services.v2.category_jobs import get_category_job, submit_category_job
+from app.db import get_async_db, get_db  # DB 세션 주입용
+from app.api.dependencies.auth import get_current_principal, get_current_user
+from app.core.auth_cache import Principal
 from app.v2.models import User
 
 router = APIRouter()
@@ -41,13 +45,44 @@ def category(
         raise HTTPException(status_code=500, detail="카테고리 생성 중 서버 오류 발생")
 
 
-@router.get("/", response_model=list[CategoryResponse])
-def get_categories(
+@router.post("/jobs", response_model=CategoryJobResponse, status_code=202)
+def submit_category(
+    req: CategoryCreateRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
 ):
+    # LLM 호출/임베딩은 백그라운드에서 처리하고 작업 ID만 바로 돌려준다.
     try:
-        categories = list_user_categories(db=db, user_id=user.id)
+        return submit_category_job(
+            db=db,
+            user_id=principal.id,
+            name=req.name,
+            keywords=req.keywords,
+            description=req.description,
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/jobs/{job_id}", response_model=CategoryJobResponse)
+async def get_category_job_status(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    principal: Principal = Depends(get_current_principal),
+):
+    job = await get_category_job(db=db, user_id=principal.id, job_id=job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="카테고리 생성 작업을 찾을 수 없습니다.")
+    return job
+
+
+@router.get("/", response_model=list[CategoryResponse])
+async def get_categories(
+    db: AsyncSession = Depends(get_async_db),
+    principal: Principal = Depends(get_current_principal),
+):
+    try:
+        categories = await list_user_categories(db=db, user_id=principal.id)
         return categories
     except Exception:
         # todo: 로깅 추가
@@ -55,13 +90,15 @@ def get_categories(
 
 
 @router.delete("/", response_model=CategoryDeleteResponse)
-def delete_category(
+async def delete_category(
     req: CategoryDeleteRequest,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    principal: Principal = Depends(get_current_principal),
 ):
     try:
-        deleted_id = delete_category_service(db=db, user_id=user.id, category_id=req.id)
+        deleted_id = await delete_category_service(
+            db=db, user_id=principal.id, category_id=req.id
+        )
         return CategoryDeleteResponse(id=deleted_id, message="카테고리를 삭제했습니다.")
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
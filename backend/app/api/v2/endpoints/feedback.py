@@ -1,8 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.schemas.v2.feedback import FeedbackRequest, FeedbackResponse
-from app.services.v2.feedback import process_feedback
+from app.schemas.v2.feedback import (
+    FeedbackBatchRequest,
+    FeedbackBatchResponse,
+    FeedbackRequest,
+    FeedbackResponse,
+)
+from app.services.v2.feedback import process_feedback, process_feedback_batch
 from app.db import get_db # DB 세션
 from app.api.dependencies.auth import get_current_user
 from app.v2.models import User
@@ -32,3 +37,24 @@ def handle_feedback(
     except Exception as e:
         # (500) 기타 예상치 못한 오류
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {e}")
+
+
+@router.post("/batch", response_model=FeedbackBatchResponse, status_code=201)
+def handle_feedback_batch(
+    req: FeedbackBatchRequest,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user)
+):
+    """
+    v2: 여러 피드백을 한 번에 처리합니다 (페이지 단위 일괄 수정용).
+    텍스트를 한 번에 임베딩하고, 요청 순서대로 카테고리 벡터를 조정한 뒤 하나의 트랜잭션으로 저장합니다.
+    하나라도 접근할 수 없는 카테고리가 있으면 아무것도 반영하지 않고 404를 반환합니다.
+    """
+    try:
+        return process_feedback_batch(db=db, user_id=user.id, items=req.items)
+    except HTTPException as e:
+        raise e
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {e}")
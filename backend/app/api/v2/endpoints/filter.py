@@ -1,34 +1,73 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
 
-from app.schemas.v2.filter import FilterRequest, FilterResponse
+from app.schemas.v2.filter import (
+    FilterRequest,
+    FilterResponse,
+    HybridFilterRequest,
+    HybridFilterResponse,
+)
+from app.services.v2.hybrid import cascade_filter
+from app.services.v2.inference import InferenceBusyError, run_inference
 from app.services.v2.similarity import similarity
-from app.db import get_db # DB 세션
-from app.api.dependencies.auth import get_current_user
-from app.v2.models import User
+from app.db import SessionLocal # DB 세션
+from app.api.dependencies.auth import get_current_principal
+from app.core.auth_cache import Principal
 
 router = APIRouter()
 
+
+def _filter_with_lazy_session(user_id: int, req: FilterRequest) -> FilterResponse:
+    # Session은 첫 쿼리 때 커넥션을 빌리므로, 임베딩과 카테고리가 모두 캐시에 있으면
+    # 커넥션 풀을 건드리지 않고 끝난다.
+    with SessionLocal() as db:
+        return similarity(
+            db=db,
+            user_id=user_id,
+            texts_to_check=req.texts,
+            threshold=req.threshold,
+            long_text_mode=req.long_text_mode,
+            pooling=req.pooling,
+        )
+
+
 @router.post("/", response_model=FilterResponse)
-def filter_v2(
+async def filter_v2(
     req: FilterRequest,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user)
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     v2: SBERT와 벡터 DB를 사용하여 텍스트 필터링을 수행합니다.
+    임베딩/점수 계산은 전용 추론 스레드 풀에서 실행됩니다.
+    인증 정보와 카테고리 벡터가 캐시에 있으면 DB 왕복 없이 처리됩니다.
     """
     try:
-        response = similarity(
-            db=db,
-            user_id=user.id,
-            texts_to_check=req.texts,
-            threshold=req.threshold
-        )
+        response = await run_inference(_filter_with_lazy_session, principal.id, req)
         return response
+    except InferenceBusyError as e:
+        # 추론 대기열 초과: 재시도 가능한 과부하 응답
+        raise HTTPException(status_code=503, detail=str(e))
     except RuntimeError as e:
         # 서비스 로직에서 발생한 SBERT/DB 오류
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         # 기타 예상치 못한 오류
         raise HTTPException(status_code=500, detail=f"필터링 중 서버 오류 발생: {e}")
+
+
+@router.post("/hybrid", response_model=HybridFilterResponse)
+async def filter_hybrid(
+    req: HybridFilterRequest,
+    principal: Principal = Depends(get_current_principal)
+):
+    """
+    하이브리드: v2 임베딩 점수로 먼저 판정하고, 임계값 주변의 애매한 텍스트만 v1(LLM)으로 넘깁니다.
+    응답의 escalated로 LLM에 넘긴 텍스트 수를 확인할 수 있습니다.
+    """
+    try:
+        return await cascade_filter(principal.id, req)
+    except InferenceBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"필터링 중 서버 오류 발생: {e}")
@@ -0,0 +1,117 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Tuple
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """인증된 요청의 사용자 정보 (ORM 객체와 달리 세션 없이 캐시/공유 가능)."""
+
+    id: int
+    username: str
+
+
+class _TokenCache:
+    """
+    JWT 서명 검증 결과(토큰 → 사용자 ID)를 보관하는 LRU 캐시.
+    토큰 원문 대신 SHA-256 다이제스트를 키로 쓰고, 항목은 토큰 만료(exp)와 TTL 중 이른 시점에 버린다.
+    """
+
+    def __init__(self, capacity: int, ttl_seconds: float) -> None:
+        self._capacity = max(0, capacity)
+        self._ttl = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[int, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> int | None:
+        if self._capacity == 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user_id, valid_until = entry
+            if time.time() >= valid_until:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user_id
+
+    def set(self, token: str, user_id: int, expires_at: float | None) -> None:
+        if self._capacity == 0:
+            return
+        valid_until = time.time() + self._ttl
+        if expires_at is not None:
+            valid_until = min(valid_until, float(expires_at))
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (user_id, valid_until)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class _PrincipalCache:
+    """사용자 ID → Principal 짧은 TTL 캐시. 사용자 행 조회를 요청마다 반복하지 않는다."""
+
+    def __init__(self, capacity: int, ttl_seconds: float) -> None:
+        self._capacity = max(0, capacity)
+        self._ttl = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[Principal, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, user_id: int) -> Principal | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            principal, stored_at = entry
+            if time.monotonic() - stored_at > self._ttl:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def set(self, principal: Principal) -> None:
+        if self._capacity == 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (principal, time.monotonic())
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = _TokenCache(
+    capacity=settings.AUTH_CACHE_CAPACITY,
+    ttl_seconds=settings.AUTH_TOKEN_CACHE_TTL_SECONDS,
+)
+principal_cache = _PrincipalCache(
+    capacity=settings.AUTH_CACHE_CAPACITY,
+    ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+__all__ = ["Principal", "principal_cache", "token_cache"]
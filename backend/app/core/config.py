@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Union, List
+from typing import Literal, Union, List
 
 
 class Settings(BaseSettings):
@@ -12,11 +12,128 @@ class Settings(BaseSettings):
     # CORS 설정
     CORS_ORIGINS: Union[str, List[str]] = []
     GEMINI_API_KEY: str
+    # Gemini API 주소 (로컬 부하 테스트 시 benchmarks.llm_stub_server 주소로 지정)
+    GEMINI_BASE_URL: str | None = None
+    # Gemini 호출: 동시 호출 상한(= 연결 풀 크기), 초당 요청 수(토큰 버킷), 시도별 타임아웃과 전체 기한
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_RATE_PER_SECOND: float = 10.0
+    LLM_RATE_BURST: int = 10
+    LLM_TIMEOUT_SECONDS: float = 20.0
+    LLM_DEADLINE_SECONDS: float = 45.0
+    # 429/5xx/타임아웃 재시도 (지수 백오프 + full jitter)
+    LLM_MAX_RETRIES: int = 3
+    LLM_BACKOFF_BASE_SECONDS: float = 0.5
+    LLM_BACKOFF_MAX_SECONDS: float = 8.0
+    # v1(LLM) 필터: 텍스트별 판정 캐시, 한 번의 LLM 요청에 담을 최대 텍스트 수/글자 수 (초과 시 병렬 분할)
+    V1_VERDICT_CACHE_CAPACITY: int = 50000
+    V1_VERDICT_CACHE_TTL_SECONDS: float = 24 * 60 * 60
+    V1_FILTER_SHARD_MAX_TEXTS: int = 40
+    V1_FILTER_SHARD_MAX_CHARS: int = 8000
     DATABASE_URL: str
+    # 비동기 엔진 URL (없으면 DATABASE_URL을 postgresql+psycopg 드라이버로 사용)
+    DATABASE_ASYNC_URL: str | None = None
+    # 커넥션 풀 (동기/비동기 엔진 각각에 적용)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # true면 풀 없이(NullPool) 요청마다 연결 (Lambda + RDS Proxy/PgBouncer).
+    # 지정하지 않으면 AWS_LAMBDA_FUNCTION_NAME 환경 변수가 있을 때 자동으로 켠다.
+    DB_SERVERLESS: bool | None = None
     SBERT_MODEL_NAME: str
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 600
+    # 비밀번호 해시: 새로 저장할 KDF와 비용 (기존 해시는 로그인 성공 시 자동으로 재해시)
+    PASSWORD_HASH_SCHEME: Literal["pbkdf2-sha256", "scrypt"] = "pbkdf2-sha256"
+    PASSWORD_PBKDF2_ITERATIONS: int = 100_000
+    PASSWORD_SCRYPT_LN: int = 14  # N = 2**14, r=8 → 약 16MB 메모리
+    PASSWORD_SCRYPT_R: int = 8
+    PASSWORD_SCRYPT_P: int = 1
+    # 비밀번호 KDF 전용 스레드 풀 (로그인 폭주가 다른 요청의 스레드를 잡아먹지 않도록)
+    PASSWORD_KDF_MAX_WORKERS: int = 2
+    PASSWORD_KDF_MAX_QUEUE: int = 32
+    # 인증 캐시: 토큰 검증 결과 / 사용자 정보 (필터 hot path에서 DB 조회 생략)
+    AUTH_CACHE_CAPACITY: int = 10_000
+    AUTH_TOKEN_CACHE_TTL_SECONDS: float = 300.0
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+
+    # 임베딩 실행 백엔드: torch(기본), onnx(ONNX Runtime), onnx-int8(동적 int8 양자화 ONNX)
+    EMBEDDING_BACKEND: Literal["torch", "onnx", "onnx-int8"] = "torch"
+    EMBEDDING_ONNX_DIR: str = ".onnx"
+    # 인코딩 시 최대 토큰 길이(None이면 모델 기본값, bge-m3는 8192)와 초과분을 잘라낼 방향,
+    # 길이 버킷(마이크로배치)당 최대 텍스트 수
+    EMBEDDING_MAX_SEQ_LENGTH: int | None = None
+    EMBEDDING_TRUNCATION_SIDE: Literal["right", "left"] = "right"
+    EMBEDDING_ENCODE_BATCH_SIZE: int = 32
+    # 서버 시작 시 모델을 백그라운드로 미리 로드할지, 로드 후 워밍업 인코딩을 할지
+    EMBEDDING_PRELOAD: bool = True
+    EMBEDDING_WARMUP: bool = True
+    EMBEDDING_ONNX_QUANTIZATION: Literal["arm64", "avx2", "avx512", "avx512_vnni"] = (
+        "avx2"
+    )
+
+    # 임베딩 전 텍스트 정규화 시 대소문자 구분 제거(case folding) 여부
+    EMBEDDING_CASEFOLD: bool = False
+
+    # long_text_mode에서 긴 텍스트를 나눌 구간(문장 묶음)의 최대 글자 수
+    LONG_TEXT_WINDOW_CHARS: int = 400
+
+    # 하이브리드 필터: 임계값 ± 여유 구간 안의 애매한 텍스트만 LLM(v1)으로 넘김, 요청당 최대 전달 수
+    HYBRID_UPPER_MARGIN: float = 0.1
+    HYBRID_LOWER_MARGIN: float = 0.1
+    HYBRID_MAX_ESCALATIONS: int = 100
+
+    # 카테고리 벡터 캐시: 버전 기반 무효화 (Postgres LISTEN/NOTIFY)
+    CATEGORY_CACHE_TTL_SECONDS: float = 6 * 60 * 60
+    CATEGORY_CACHE_REVALIDATE_SECONDS: float = 5.0
+    # 카테고리 벡터 캐시 전체 바이트 예산 (초과 시 LRU로 사용자 단위 축출)
+    CATEGORY_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    CATEGORY_INVALIDATION_LISTEN: bool = True
+    CATEGORY_INVALIDATION_CHANNEL: str = "category_invalidation"
+
+    # 피드백 반영: 낙관적 동시성 충돌 시 재시도 횟수, write-behind(모아서 쓰기) 설정
+    FEEDBACK_OCC_RETRIES: int = 3
+    FEEDBACK_WRITE_BEHIND: bool = False
+    FEEDBACK_FLUSH_INTERVAL_MS: float = 200.0
+    FEEDBACK_FLUSH_MAX_EVENTS: int = 64
+
+    # 카테고리 예시 문장 생성 LLM (stub: 네트워크 없이 고정 문장, 로컬 테스트용)
+    CATEGORY_LLM_BACKEND: Literal["gemini", "stub"] = "gemini"
+    # 비동기 카테고리 생성 작업: 동시 LLM 호출 수, 임베딩 배치를 모으는 대기 시간
+    CATEGORY_JOB_LLM_CONCURRENCY: int = 4
+    CATEGORY_JOB_EMBED_WAIT_MS: float = 50.0
+    # 처리 중인 작업의 하트비트 주기와, 하트비트가 이보다 오래 끊긴 작업을 실패로 정리하는 기준
+    CATEGORY_JOB_HEARTBEAT_SECONDS: float = 30.0
+    CATEGORY_JOB_STALE_SECONDS: float = 120.0
+    # LLM 예시 문장 + 임베딩 재사용 캐시 (정규화된 이름 + 정렬된 키워드 기준). 0이면 사용 안 함
+    CATEGORY_EXAMPLE_CACHE_TTL_SECONDS: float = 30 * 24 * 60 * 60
+    CATEGORY_EXAMPLE_CACHE_MAX_ENTRIES: int = 5000
+
+    # 카테고리당 보관할 최대 프로토타입 벡터 수 (예시 문장 + 강화 피드백)
+    CATEGORY_MAX_PROTOTYPES: int = 16
+
+    # 임베딩 마이크로배칭 설정 (동시 요청의 텍스트를 모아 한 번에 인코딩)
+    EMBEDDING_BATCH_ENABLED: bool = True
+    EMBEDDING_BATCH_MAX_SIZE: int = 64
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0
+
+    # 프로세스 내 임베딩 캐시(L1) 메모리 예산(바이트). 슬롯 수는 임베딩 차원과 저장 자료형
+    # (EMBEDDING_QUANTIZATION)으로 계산하며, 기본값은 이전 LRU(2048개 float32)와 비슷한 크기
+    EMBEDDING_CACHE_MAX_BYTES: int = 8 * 1024 * 1024
+
+    # 캐시된 텍스트 임베딩과 카테고리 행렬의 저장 정밀도 (none=float32)
+    EMBEDDING_QUANTIZATION: Literal["none", "float16", "int8"] = "none"
+
+    # 호스트 공유 임베딩 디스크 캐시 (L2). 경로를 지정하지 않으면 비활성화
+    EMBEDDING_DISK_CACHE_PATH: str | None = None
+    EMBEDDING_DISK_CACHE_MAX_ITEMS: int = 200_000
+
+    # 필터 추론 전용 스레드 풀과 일반(I/O) 엔드포인트 스레드 풀의 동시성 한도
+    INFERENCE_MAX_WORKERS: int = 16
+    INFERENCE_MAX_QUEUE: int = 64
+    IO_THREADPOOL_SIZE: int = 40
 
     # aws 배포시 api stage로 루트 설정
     STAGE: str | None = None
@@ -1,3 +1,4 @@
+import base64
 import hashlib
 import hmac
 import secrets
@@ -9,48 +10,137 @@ import jwt
 from app.core.config import settings
 
 PBKDF2_ALGORITHM = "sha256"
+# 레거시 "salt:hash" 형식에 쓰인 반복 횟수 (검증 전용)
 PBKDF2_ITERATIONS = 100_000
 SALT_BYTES = 16
+KEY_BYTES = 32
 
 
-def _derive_key(password: str, salt: bytes) -> bytes:
+def _b64encode(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.b64decode(value + "=" * (-len(value) % 4))
+
+
+def _derive_key(password: str, salt: bytes, iterations: int = PBKDF2_ITERATIONS) -> bytes:
     if not password:
         raise ValueError("Password must not be empty.")
     return hashlib.pbkdf2_hmac(
         PBKDF2_ALGORITHM,
         password.encode("utf-8"),
         salt,
-        PBKDF2_ITERATIONS,
+        iterations,
+    )
+
+
+def _derive_scrypt_key(password: str, salt: bytes, ln: int, r: int, p: int) -> bytes:
+    if not password:
+        raise ValueError("Password must not be empty.")
+    n = 1 << ln
+    return hashlib.scrypt(
+        password.encode("utf-8"),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=256 * n * r * p,
+        dklen=KEY_BYTES,
     )
 
 
 def hash_password(password: str) -> str:
     """
-    Generate a salted PBKDF2 hash for the given password.
-    Returns salt and hash encoded as hex, separated by a colon.
+    Hash a password with the configured KDF (PASSWORD_HASH_SCHEME).
+    Formats (all fit in users.password_hash, String(128)):
+      $pbkdf2-sha256$<iterations>$<salt>$<hash>
+      $scrypt$ln=<log2 N>,r=<r>,p=<p>$<salt>$<hash>
+    Salt and hash are unpadded base64.
     """
     salt = secrets.token_bytes(SALT_BYTES)
-    key = _derive_key(password, salt)
-    return f"{salt.hex()}:{key.hex()}"
+    if settings.PASSWORD_HASH_SCHEME == "scrypt":
+        ln, r, p = (
+            settings.PASSWORD_SCRYPT_LN,
+            settings.PASSWORD_SCRYPT_R,
+            settings.PASSWORD_SCRYPT_P,
+        )
+        key = _derive_scrypt_key(password, salt, ln, r, p)
+        return f"$scrypt$ln={ln},r={r},p={p}${_b64encode(salt)}${_b64encode(key)}"
+
+    iterations = settings.PASSWORD_PBKDF2_ITERATIONS
+    key = _derive_key(password, salt, iterations)
+    return f"$pbkdf2-sha256${iterations}${_b64encode(salt)}${_b64encode(key)}"
+
+
+def _parse_hash(stored_value: str) -> tuple[str, dict[str, int], bytes, bytes]:
+    """
+    Split a stored hash into (scheme, params, salt, key).
+    Raises ValueError for unknown or malformed values.
+    """
+    if not stored_value.startswith("$"):
+        # legacy "salt_hex:key_hex" written by earlier versions
+        salt_hex, key_hex = stored_value.split(":")
+        return (
+            "pbkdf2-sha256",
+            {"iterations": PBKDF2_ITERATIONS},
+            bytes.fromhex(salt_hex),
+            bytes.fromhex(key_hex),
+        )
+
+    _, scheme, raw_params, salt_b64, key_b64 = stored_value.split("$")
+    if scheme == "pbkdf2-sha256":
+        params = {"iterations": int(raw_params)}
+    elif scheme == "scrypt":
+        params = {
+            name: int(value)
+            for name, value in (item.split("=") for item in raw_params.split(","))
+        }
+        if set(params) != {"ln", "r", "p"}:
+            raise ValueError("Invalid scrypt parameters.")
+    else:
+        raise ValueError(f"Unknown password hash scheme: {scheme}")
+    return scheme, params, _b64decode(salt_b64), _b64decode(key_b64)
 
 
 def verify_password(password: str, stored_value: str) -> bool:
     """
-    Validate a plaintext password against the stored salt/hash pair.
+    Validate a plaintext password against any supported stored hash format.
     """
     try:
-        salt_hex, key_hex = stored_value.split(":")
+        scheme, params, salt, expected_key = _parse_hash(stored_value)
     except ValueError:
         return False
 
+    if scheme == "scrypt":
+        derived_key = _derive_scrypt_key(
+            password, salt, params["ln"], params["r"], params["p"]
+        )
+    else:
+        derived_key = _derive_key(password, salt, params["iterations"])
+    return hmac.compare_digest(derived_key, expected_key)
+
+
+def needs_rehash(stored_value: str) -> bool:
+    """
+    Return True when the stored hash was produced with a different scheme or
+    weaker parameters than the current settings, so it should be upgraded
+    after the next successful login.
+    """
     try:
-        salt = bytes.fromhex(salt_hex)
-        expected_key = bytes.fromhex(key_hex)
+        scheme, params, _, _ = _parse_hash(stored_value)
     except ValueError:
         return False
 
-    derived_key = _derive_key(password, salt)
-    return hmac.compare_digest(derived_key, expected_key)
+    if scheme != settings.PASSWORD_HASH_SCHEME:
+        return True
+    if scheme == "scrypt":
+        return params != {
+            "ln": settings.PASSWORD_SCRYPT_LN,
+            "r": settings.PASSWORD_SCRYPT_R,
+            "p": settings.PASSWORD_SCRYPT_P,
+        }
+    return params["iterations"] != settings.PASSWORD_PBKDF2_ITERATIONS
 
 
 def create_access_token(claims: Dict[str, Any], expires_delta: timedelta | None = None) -> str:
@@ -1,13 +1,175 @@
-from sqlalchemy import create_engine
+import os
+import time
+from threading import Lock
+from typing import Any, AsyncIterator, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from app.core.config import settings
 
-# 1. 데이터베이스 연결 엔진 생성
-engine = create_engine(settings.DATABASE_URL)
+
+class _PoolMetrics:
+    """커넥션 풀 대기 시간(빌리기까지 걸린 시간)과 점유 시간(빌려서 돌려줄 때까지)을 누적한다."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.checkouts = 0
+        self.checked_out = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.held_total = 0.0
+        self.held_max = 0.0
+        self.timeouts = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.checked_out += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_checkin(self, held_seconds: float) -> None:
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+            self.held_total += held_seconds
+            self.held_max = max(self.held_max, held_seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            count = max(self.checkouts, 1)
+            return {
+                "checkouts": self.checkouts,
+                "checked_out": self.checked_out,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": self.wait_total / count * 1000.0,
+                "wait_max_ms": self.wait_max * 1000.0,
+                "held_avg_ms": self.held_total / count * 1000.0,
+                "held_max_ms": self.held_max * 1000.0,
+            }
+
+
+class _TimedCheckoutMixin:
+    # pool._do_get(): 풀에서 커넥션을 꺼내거나(필요하면 새로 연결) 빈자리가 날 때까지 기다리는 구간
+    metrics: _PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+
+def _instrumented(pool_class: type, metrics: _PoolMetrics) -> type:
+    return type(
+        f"Instrumented{pool_class.__name__}",
+        (_TimedCheckoutMixin, pool_class),
+        {"metrics": metrics},
+    )
+
+
+def _serverless() -> bool:
+    # Lambda(Mangum)에서는 컨테이너마다 풀을 따로 들고 있고, 동결(freeze) 중에 연결이 끊기므로
+    # 풀을 두지 않고 요청마다 연결한다 (RDS Proxy/PgBouncer 같은 외부 풀러와 함께 사용).
+    if settings.DB_SERVERLESS is not None:
+        return settings.DB_SERVERLESS
+    return "AWS_LAMBDA_FUNCTION_NAME" in os.environ
+
+
+def _pool_kwargs(queue_pool_class: type, metrics: _PoolMetrics) -> Dict[str, Any]:
+    if _serverless():
+        return {"poolclass": _instrumented(NullPool, metrics)}
+    return {
+        "poolclass": _instrumented(queue_pool_class, metrics),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _track_checkin(target_engine, metrics: _PoolMetrics) -> None:
+    @event.listens_for(target_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(target_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            metrics.record_checkin(time.perf_counter() - started)
+
+
+def _async_database_url() -> str:
+    """DATABASE_ASYNC_URL이 없으면 DATABASE_URL의 드라이버를 psycopg(async 지원)로 바꿔 사용한다."""
+
+    if settings.DATABASE_ASYNC_URL:
+        return settings.DATABASE_ASYNC_URL
+    url = make_url(settings.DATABASE_URL)
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+psycopg")
+    elif url.drivername in ("sqlite", "sqlite+pysqlite"):
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
+
+sync_pool_metrics = _PoolMetrics()
+async_pool_metrics = _PoolMetrics()
+
+# 1. 데이터베이스 연결 엔진 생성 (풀 크기/재활용/pre-ping은 DB_POOL_* 설정)
+engine = create_engine(
+    settings.DATABASE_URL, **_pool_kwargs(QueuePool, sync_pool_metrics)
+)
+_track_checkin(engine, sync_pool_metrics)
 
 # 2. 데이터베이스 세션 생성기(Factory) 만들기
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# I/O 위주 엔드포인트(auth, category 조회/삭제/작업 상태)용 비동기 엔진: 스레드 풀을 거치지 않고
+# 이벤트 루프에서 바로 쿼리한다. 처음 사용할 때 만들어, async 드라이버가 없는 DATABASE_URL
+# (스크립트·테스트용 sqlite 등)로도 모듈 import와 동기 경로는 문제없이 동작한다.
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+_async_lock = Lock()
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        return _async_engine
+    with _async_lock:
+        if _async_engine is None:
+            async_engine = create_async_engine(
+                _async_database_url(),
+                **_pool_kwargs(AsyncAdaptedQueuePool, async_pool_metrics),
+            )
+            _track_checkin(async_engine.sync_engine, async_pool_metrics)
+            _async_session_factory = async_sessionmaker(
+                async_engine, autoflush=False, expire_on_commit=False
+            )
+            _async_engine = async_engine
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    get_async_engine()
+    return _async_session_factory()
+
 # 3. SQLAlchemy 모델의 Base 클래스 (models.py 에서도 사용)
 Base = declarative_base()
 
@@ -21,4 +183,20 @@ def get_db():
         db.close()  # 요청 처리 후 세션 닫기 (자원 반환)
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def database_pool_status() -> Dict[str, Any]:
+    """동기/비동기 풀 설정과 대기·점유 시간 지표."""
+
+    async_pool = _async_engine.pool.status() if _async_engine else "not initialized"
+    return {
+        "serverless": _serverless(),
+        "sync": {"pool": engine.pool.status(), **sync_pool_metrics.snapshot()},
+        "async": {"pool": async_pool, **async_pool_metrics.snapshot()},
+    }
+
+
 # Base.metadata.create_all(bind=engine)  # 직접 테이블 생성 (Alembic 사용 권장)  // 참고용
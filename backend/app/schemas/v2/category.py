@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel
 
 class CategoryCreateRequest(BaseModel):
@@ -20,3 +22,15 @@ class CategoryDeleteRequest(BaseModel):
 class CategoryDeleteResponse(BaseModel):
     id: int  # 삭제된 카테고리 ID
     message: str  # 예: "카테고리를 삭제했습니다."
+
+CategoryJobStatus = Literal["pending", "generating", "embedding", "succeeded", "failed"]
+
+class CategoryJobResponse(BaseModel):
+    id: str  # 작업 ID (상태 조회용)
+    name: str
+    status: CategoryJobStatus
+    category_id: int | None = None  # 성공 시 생성된 카테고리 ID
+    error: str | None = None  # 실패 사유
+
+    class Config:
+        from_attributes = True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Literal
 
 # weaken: 약화 피드백 reinforce: 강화 피드백
@@ -9,7 +9,30 @@ class FeedbackRequest(BaseModel):
     category_id: int = Field(..., description="연관된 카테고리 ID")
     feedback_type: FeedbackType = Field(..., description="피드백 유형")
 
+    @field_validator("text_content")
+    @classmethod
+    def _reject_blank_text(cls, value: str) -> str:
+        # 공백뿐인 텍스트는 임베딩할 수 없으므로 422로 거부
+        if not value.strip():
+            raise ValueError("text_content는 공백이 아닌 문자를 포함해야 합니다.")
+        return value
+
 class FeedbackResponse(BaseModel):
     message: str
     category_id: int
     new_log_id: int # 생성된 FeedbackLog의 ID
+
+# 한 번에 처리할 수 있는 최대 피드백 수
+FEEDBACK_BATCH_MAX_ITEMS = 256
+
+class FeedbackBatchRequest(BaseModel):
+    items: list[FeedbackRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=FEEDBACK_BATCH_MAX_ITEMS,
+        description="순서대로 적용할 피드백 목록",
+    )
+
+class FeedbackBatchResponse(BaseModel):
+    message: str
+    results: list[FeedbackResponse] # 요청 순서와 동일
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Literal
 
 from pydantic import BaseModel, Field
 
@@ -11,12 +11,27 @@ class FilterRequest(BaseModel):
         le=1.0,
         description="유사도 임계값 (이 값 이상이면 필터링)",
     )
+    long_text_mode: bool = Field(
+        default=False,
+        description="긴 텍스트를 문장 단위 구간으로 나눠 구간별로 점수를 계산",
+    )
+    pooling: Literal["max", "mean"] = Field(
+        default="max",
+        description="long_text_mode에서 구간 점수를 텍스트 점수로 합치는 방식",
+    )
+
+
+class MatchedSpan(BaseModel):
+    start: int = Field(..., description="매칭된 구간 시작 위치 (문자 offset)")
+    end: int = Field(..., description="매칭된 구간 끝 위치 (문자 offset, 미포함)")
 
 
 class MatchedCategoryInfo(BaseModel):
     id: int
     name: str
     similarity: float  # 실제 계산된 유사도
+    span: MatchedSpan | None = None  # long_text_mode에서 가장 높은 점수를 낸 구간
+    prototype_index: int | None = None  # 카테고리 내에서 가장 가까웠던 프로토타입 번호
 
 
 class FilterResult(BaseModel):
@@ -33,3 +48,35 @@ class FilterResponse(BaseModel):
         ...,
         description="각 텍스트별 필터링 결과 목록",
     )
+
+
+class HybridFilterRequest(FilterRequest):
+    upper_margin: float | None = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="최고 점수가 임계값 + 이 값 이상이면 LLM 없이 필터링 (미지정 시 HYBRID_UPPER_MARGIN)",
+    )
+    lower_margin: float | None = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="최고 점수가 임계값 - 이 값 미만이면 LLM 없이 통과 (미지정 시 HYBRID_LOWER_MARGIN)",
+    )
+    strength: int = Field(default=3, description="LLM(v1 필터)으로 넘길 때 사용할 강도")
+
+
+class HybridFilterResult(FilterResult):
+    escalated: bool = Field(..., description="LLM 판정으로 결정되었는지 여부")
+
+
+class HybridFilterResponse(BaseModel):
+    results: List[HybridFilterResult] = Field(
+        ...,
+        description="각 텍스트별 필터링 결과 목록",
+    )
+    escalated: int = Field(..., description="LLM 판정으로 결정된 텍스트 수 (LLM 호출이 실패한 텍스트는 제외)")
+    llm_fallback: bool = Field(
+        default=False,
+        description="LLM 호출 실패로 애매한 텍스트(일부 또는 전부)를 임베딩 점수(임계값)로 판정했는지 여부",
+    )
@@ -1,11 +1,23 @@
-from app.services.v1.llm import generate_text
-from app.schemas.v1.filter import FilterRequest, FilterResponse
+import asyncio
+from typing import Dict, List, Tuple
 
+from app.core.config import settings
+from app.services.v1.llm import agenerate_text
+from app.services.v1.verdict_cache import (
+    Verdict,
+    VerdictKey,
+    verdict_cache,
+    verdict_key,
+)
+from app.schemas.v1.filter import (
+    Content,
+    DetectedContent,
+    FilterRequest,
+    FilterResponse,
+    Option,
+)
 
-def detectCategory(req: FilterRequest) -> FilterResponse:
-    """genai api를 이용해 주어진 카테고리와 텍스트의 유사도를 평가하는 filter v1"""
-
-    prompt = f"""
+_PROMPT = f"""
 당신은 텍스트 검사기 입니다.
 텍스트 리스트와 카테고리 리스트가 주어집니다.
 당신의 역할은 카테고리가 포함된 텍스트를 구해서 리스트로 반환하는 것 입니다.
@@ -50,6 +62,146 @@ def detectCategory(req: FilterRequest) -> FilterResponse:
 	]
 }}
 """
-    req_str = req.model_dump_json()
-    resp = generate_text(content=req_str, prompt=prompt, respSchema=FilterResponse)
-    return resp
+
+
+def _shards(items: List[tuple[VerdictKey, str]]) -> List[List[VerdictKey]]:
+    """LLM 요청 하나가 V1_FILTER_SHARD_MAX_TEXTS개 / V1_FILTER_SHARD_MAX_CHARS자를 넘지 않도록 나눈다."""
+
+    max_texts = max(1, settings.V1_FILTER_SHARD_MAX_TEXTS)
+    max_chars = max(1, settings.V1_FILTER_SHARD_MAX_CHARS)
+    shards: List[List[VerdictKey]] = []
+    current: List[VerdictKey] = []
+    chars = 0
+    for key, text in items:
+        if current and (len(current) >= max_texts or chars + len(text) > max_chars):
+            shards.append(current)
+            current, chars = [], 0
+        current.append(key)
+        chars += len(text)
+    if current:
+        shards.append(current)
+    return shards
+
+
+async def _detect_shard(texts: List[str], option: Option) -> List[Verdict]:
+    """텍스트 묶음 하나를 LLM에 보내 텍스트별 검출 카테고리 튜플(없으면 빈 튜플)을 돌려준다."""
+
+    shard_req = FilterRequest(
+        contents=[Content(idx=idx, text=text) for idx, text in enumerate(texts)],
+        option=option,
+    )
+    resp = await agenerate_text(
+        content=shard_req.model_dump_json(), prompt=_PROMPT, respSchema=FilterResponse
+    )
+    if resp is None:
+        raise RuntimeError("Gemini 응답을 FilterResponse로 해석하지 못했습니다.")
+
+    allowed = set(option.categories)
+    detected_sets: List[set] = [set() for _ in texts]
+    for detected in resp.detectedContents:
+        # 묶음 안에서 매긴 idx 범위 밖이거나 요청에 없는 카테고리는 무시.
+        # 한 텍스트가 여러 카테고리에 해당하면 모두 남긴다.
+        if 0 <= detected.idx < len(texts) and detected.category in allowed:
+            detected_sets[detected.idx].add(detected.category)
+    return [tuple(sorted(categories)) for categories in detected_sets]
+
+
+# 캐시 미스로 LLM에 보낸 판정 키 → 결과 (판정, 실패 시 예외). 같은 키의 동시 요청은 이 결과를 기다린다.
+_in_flight: Dict[VerdictKey, "asyncio.Future[Tuple[Verdict, BaseException | None]]"] = {}
+
+
+async def _detect_pending(
+    pending: Dict[VerdictKey, str], option: Option
+) -> Dict[VerdictKey, Verdict]:
+    """
+    캐시에 없는 텍스트를 LLM으로 판정한다 (single-flight).
+    다른 요청이 이미 같은 키를 판정 중이면 새로 보내지 않고 그 결과를 기다린다.
+    """
+
+    loop = asyncio.get_running_loop()
+    owned: Dict[VerdictKey, asyncio.Future] = {}
+    joined: Dict[VerdictKey, asyncio.Future] = {}
+    for key in pending:
+        future = _in_flight.get(key)
+        if future is not None and future.get_loop() is loop:
+            joined[key] = future
+        else:
+            owned[key] = _in_flight[key] = loop.create_future()
+
+    fresh: Dict[VerdictKey, Verdict] = {}
+    error: BaseException | None = None
+    try:
+        if owned:
+            shards = _shards([(key, pending[key]) for key in owned])
+            # 응답을 기다리는 동안 워커 스레드를 점유하지 않도록 비동기 클라이언트 사용
+            results = await asyncio.gather(
+                *(
+                    _detect_shard([pending[key] for key in shard], option)
+                    for shard in shards
+                ),
+                return_exceptions=True,
+            )
+            for shard, result in zip(shards, results):
+                if isinstance(result, BaseException):
+                    error = error or result
+                    for key in shard:
+                        owned[key].set_result(((), result))
+                    continue
+                for key, verdict in zip(shard, result):
+                    fresh[key] = verdict
+                    owned[key].set_result((verdict, None))
+            # 실패한 묶음이 있어도 성공한 묶음의 판정은 캐시에 남김
+            verdict_cache.set_many(fresh)
+    finally:
+        for key, future in owned.items():
+            if not future.done():
+                # 이 요청이 취소됨: 기다리던 요청은 실패로 끝냄
+                future.set_result(((), RuntimeError("LLM 판정 요청이 취소되었습니다.")))
+            if _in_flight.get(key) is future:
+                del _in_flight[key]
+
+    for key, future in joined.items():
+        # 기다리는 쪽이 취소되어도 공유 결과는 취소하지 않음
+        verdict, joined_error = await asyncio.shield(future)
+        if joined_error is not None:
+            error = error or joined_error
+        else:
+            fresh[key] = verdict
+
+    if error is not None:
+        raise error
+    return fresh
+
+
+async def detectCategory(req: FilterRequest) -> FilterResponse:
+    """
+    genai api를 이용해 주어진 카테고리와 텍스트의 유사도를 평가하는 filter v1
+    텍스트별 판정을 캐시하고, 캐시에 없는 텍스트만 크기 제한이 있는 여러 요청으로 나눠 병렬로 보낸다.
+    동시에 들어온 요청의 같은 캐시 미스는 LLM에 한 번만 보낸다.
+    """
+
+    option = req.option
+    keys = [
+        verdict_key(c.text, option.categories, option.strength) for c in req.contents
+    ]
+    verdicts: Dict[VerdictKey, Verdict] = verdict_cache.get_many(
+        list(dict.fromkeys(keys))
+    )
+
+    # 같은 텍스트가 여러 번 나와도 LLM에는 한 번만 보냄
+    pending: Dict[VerdictKey, str] = {}
+    for content, key in zip(req.contents, keys):
+        if key not in verdicts:
+            pending.setdefault(key, content.text)
+
+    if pending:
+        verdicts.update(await _detect_pending(pending, option))
+
+    # 한 텍스트에서 여러 카테고리가 검출되면 카테고리마다 한 항목씩
+    return FilterResponse(
+        detectedContents=[
+            DetectedContent(idx=content.idx, category=category)
+            for content, key in zip(req.contents, keys)
+            for category in verdicts[key]
+        ]
+    )
@@ -1,20 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict
+
+import httpx
 from google import genai
+from google.genai import errors, types
+
 from app.core.config import settings
-from typing import Any
 
+DEFAULT_MODEL = "gemini-2.5-flash-lite"
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class LLMDeadlineExceededError(RuntimeError):
+    """대기·재시도를 포함한 Gemini 호출 전체 기한(LLM_DEADLINE_SECONDS) 초과."""
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TransportError)):
+        return True
+    return isinstance(exc, errors.APIError) and exc.code in _RETRYABLE_STATUS
+
+
+def _retry_after_seconds(exc: BaseException) -> float:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return 0.0
+    try:
+        return float(headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _TokenBucket:
+    """초당 `rate`개, 최대 `burst`개까지 모아 쓰는 요청 토큰. LLM 이벤트 루프 안에서만 사용한다."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self._rate = rate
+        self._capacity = float(max(1, burst))
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self.waits = 0
+
+    async def acquire(self, deadline: float) -> None:
+        if self._rate <= 0:
+            return
+        waited = False
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            delay = (1.0 - self._tokens) / self._rate
+            if now + delay > deadline:
+                raise LLMDeadlineExceededError("Gemini 요청 한도 대기 중 기한 초과")
+            if not waited:
+                self.waits += 1
+                waited = True
+            await asyncio.sleep(delay)
+
+
+class _GeminiClient:
+    """
+    Gemini 호출 전용 이벤트 루프 스레드에서 하나의 genai 클라이언트(공유 연결 풀)를 사용한다.
+    - 동시 호출 상한(semaphore)과 초당 요청 수(token bucket)를 프로세스 전체에 적용
+    - 시도별 타임아웃 + 전체 기한, 429/5xx/타임아웃은 지수 백오프(full jitter)로 재시도
+    동기 코드(스레드 풀)와 다른 이벤트 루프(FastAPI) 모두 이 루프에 작업을 넘겨 결과를 기다린다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._client: genai.Client | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._bucket = _TokenBucket(
+            settings.LLM_RATE_PER_SECOND, settings.LLM_RATE_BURST
+        )
+        self._in_flight = 0
+        self._calls = 0
+        self._retries = 0
+        self._failures = 0
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        if self._loop is not None:
+            return self._loop
+        with self._lock:
+            if self._loop is None:
+                http_options = types.HttpOptions(
+                    base_url=settings.GEMINI_BASE_URL,
+                    timeout=int(settings.LLM_TIMEOUT_SECONDS * 1000),
+                    async_client_args={
+                        "limits": httpx.Limits(
+                            max_connections=settings.LLM_MAX_CONCURRENCY,
+                            max_keepalive_connections=settings.LLM_MAX_CONCURRENCY,
+                        )
+                    },
+                )
+                self._client = genai.Client(
+                    api_key=settings.GEMINI_API_KEY, http_options=http_options
+                )
+                self._semaphore = asyncio.Semaphore(
+                    max(1, settings.LLM_MAX_CONCURRENCY)
+                )
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=loop.run_forever, name="gemini-client", daemon=True
+                )
+                self._thread.start()
+                self._loop = loop
+        return self._loop
+
+    def _submit(self, *args: Any):
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(self._generate(*args), loop)
+
+    def generate(self, *args: Any) -> Any:
+        future = self._submit(*args)
+        # 루프 쪽에서 기한을 지키므로 여기서는 여유를 두고 기다린다.
+        return future.result(timeout=settings.LLM_DEADLINE_SECONDS + 5.0)
+
+    async def agenerate(self, *args: Any) -> Any:
+        return await asyncio.wrap_future(self._submit(*args))
+
+    async def _generate(
+        self, content: str, prompt: str, model: str, respSchema: Any
+    ) -> Any:
+        assert self._client is not None and self._semaphore is not None
+        config: dict[str, Any] = {"system_instruction": prompt}
+        if respSchema is not None:
+            # 구조화 출력 사용
+            config["response_mime_type"] = "application/json"
+            config["response_schema"] = respSchema
+
+        self._calls += 1
+        deadline = time.monotonic() + settings.LLM_DEADLINE_SECONDS
+        attempt = 0
+        while True:
+            try:
+                resp = await self._attempt(model, content, config, deadline)
+                if respSchema is not None:
+                    return resp.parsed
+                return (resp.text or "").strip()
+            except Exception as e:
+                if not _is_retryable(e) or attempt >= settings.LLM_MAX_RETRIES:
+                    self._failures += 1
+                    raise
+                backoff = random.uniform(
+                    0.0,
+                    min(
+                        settings.LLM_BACKOFF_MAX_SECONDS,
+                        settings.LLM_BACKOFF_BASE_SECONDS * (2**attempt),
+                    ),
+                )
+                backoff = max(backoff, _retry_after_seconds(e))
+                if time.monotonic() + backoff >= deadline:
+                    self._failures += 1
+                    raise LLMDeadlineExceededError(
+                        f"Gemini 재시도 기한 초과 (시도 {attempt + 1}회): {type(e).__name__} {e}"
+                    ) from e
+                self._retries += 1
+                attempt += 1
+                await asyncio.sleep(backoff)
+
+    async def _attempt(
+        self, model: str, content: str, config: dict[str, Any], deadline: float
+    ) -> Any:
+        await self._bucket.acquire(deadline)
+        remaining = deadline - time.monotonic()
+        try:
+            await asyncio.wait_for(
+                self._semaphore.acquire(), timeout=max(0.0, remaining)
+            )
+        except asyncio.TimeoutError as e:
+            raise LLMDeadlineExceededError("Gemini 동시 호출 대기 중 기한 초과") from e
+
+        self._in_flight += 1
+        try:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMDeadlineExceededError("Gemini 호출 기한 초과")
+            return await asyncio.wait_for(
+                self._client.aio.models.generate_content(
+                    model=model, contents=content, config=config  # type: ignore
+                ),
+                timeout=min(settings.LLM_TIMEOUT_SECONDS, remaining),
+            )
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "started": self._loop is not None,
+            "in_flight": self._in_flight,
+            "calls": self._calls,
+            "retries": self._retries,
+            "failures": self._failures,
+            "rate_limited": self._bucket.waits,
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            loop, thread, client = self._loop, self._thread, self._client
+            self._loop = self._thread = self._client = None
+        if loop is None:
+            return
+        aclose = getattr(getattr(client, "aio", None), "aclose", None)
+        if aclose is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(aclose(), loop).result(timeout=5.0)
+            except Exception as e:
+                print(f"Gemini 클라이언트 종료 중 에러 발생: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5.0)
 
-# 설정 파일에서 API 키를 가져와 genai.Client 구성
-client = genai.Client(api_key=settings.GEMINI_API_KEY)
+
+gemini_client = _GeminiClient()
 
 
 def generate_text(
     content: str,
     prompt: str,
-    model: str = "gemini-2.5-flash-lite",
+    model: str = DEFAULT_MODEL,
     respSchema: Any = None,
 ) -> Any:
     """
     주어진 프롬프트, 콘텐츠, 모델을 기반으로 Gemini Developer API를 이용하여 텍스트를 생성합니다.
+    동기 코드(스레드 풀, 백그라운드 작업)용이며 최대 LLM_DEADLINE_SECONDS 동안 기다립니다.
 
     `content` : 콘텐츠
 
@@ -26,20 +249,28 @@ def generate_text(
     """
 
     try:
-        config: dict[str, Any] = {}
-        config["system_instruction"] = prompt
-        if respSchema is not None:
-            # 구조화 출력 사용
-            config["response_mime_type"] = "application/json"
-            config["response_schema"] = respSchema
+        return gemini_client.generate(content, prompt, model, respSchema)
+    except Exception as e:
+        raise RuntimeError(f"Gemini text generation failed: {e}") from e
 
-        resp = client.models.generate_content(
-            model=model,
-            contents=content,
-            config=config if config else None,  # type: ignore
-        )
-        if respSchema is not None:
-            return resp.parsed
-        return (resp.text or "").strip()
+
+async def agenerate_text(
+    content: str,
+    prompt: str,
+    model: str = DEFAULT_MODEL,
+    respSchema: Any = None,
+) -> Any:
+    """`generate_text`의 비동기 버전. 응답을 기다리는 동안 워커 스레드를 점유하지 않습니다."""
+
+    try:
+        return await gemini_client.agenerate(content, prompt, model, respSchema)
     except Exception as e:
         raise RuntimeError(f"Gemini text generation failed: {e}") from e
+
+
+def llm_client_status() -> Dict[str, Any]:
+    return gemini_client.status()
+
+
+def shutdown_llm_client() -> None:
+    gemini_client.shutdown()
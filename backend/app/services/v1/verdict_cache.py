@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Iterable, List, Tuple
+
+from app.core.config import settings
+from app.services.v2.text import canonicalize_text
+
+# (텍스트 다이제스트, 정렬된 카테고리, 강도)
+VerdictKey = Tuple[bytes, Tuple[str, ...], int]
+# 텍스트에서 검출된 카테고리 (정렬, 중복 없음). 빈 튜플이면 깨끗한 텍스트.
+Verdict = Tuple[str, ...]
+
+
+def verdict_key(text: str, categories: Iterable[str], strength: int) -> VerdictKey:
+    """공백/유니코드 표기만 다른 텍스트와 카테고리 순서 차이는 같은 키가 된다."""
+
+    digest = hashlib.sha256(canonicalize_text(text).encode("utf-8")).digest()
+    return digest, tuple(sorted(set(categories))), strength
+
+
+class _VerdictCache:
+    """
+    v1(LLM) 필터의 텍스트별 판정 LRU 캐시.
+    값은 검출된 카테고리 이름의 정렬된 튜플, 검출되지 않은(깨끗한) 텍스트는 빈 튜플.
+    """
+
+    def __init__(self, capacity: int, ttl_seconds: float) -> None:
+        self._capacity = max(0, capacity)
+        self._ttl = ttl_seconds
+        self._entries: "OrderedDict[VerdictKey, Tuple[Verdict, float]]" = (
+            OrderedDict()
+        )
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: List[VerdictKey]) -> Dict[VerdictKey, Verdict]:
+        """캐시에 있는 키만 담아 돌려준다 (값이 빈 튜플이면 '검출 없음' 판정)."""
+
+        found: Dict[VerdictKey, Verdict] = {}
+        if self._capacity == 0:
+            self.misses += len(keys)
+            return found
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                verdict, stored_at = entry
+                if now - stored_at > self._ttl:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = verdict
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, verdicts: Dict[VerdictKey, Verdict]) -> None:
+        if self._capacity == 0 or not verdicts:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for key, verdict in verdicts.items():
+                self._entries[key] = (verdict, now)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+verdict_cache = _VerdictCache(
+    capacity=settings.V1_VERDICT_CACHE_CAPACITY,
+    ttl_seconds=settings.V1_VERDICT_CACHE_TTL_SECONDS,
+)
+
+
+__all__ = ["Verdict", "VerdictKey", "verdict_cache", "verdict_key"]
@@ -1,39 +1,87 @@
 from typing import Optional
 
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import hash_password, verify_password
+from app.core.config import settings
+from app.core.security import hash_password, needs_rehash, verify_password
+from app.services.v2.inference import BoundedExecutor, ExecutorBusyError
 from app.v2.models import User
 
 
-def create_user(db: Session, username: str, password: str) -> User:
+class PasswordHashingBusyError(ExecutorBusyError):
+    """Raised when the password KDF queue is full and the request is rejected."""
+
+
+# Password KDF work (PBKDF2/scrypt) runs on its own small pool so a login storm
+# cannot occupy the threads used by filtering or the default endpoint pool.
+_password_pool = BoundedExecutor(
+    max_workers=settings.PASSWORD_KDF_MAX_WORKERS,
+    max_queue=settings.PASSWORD_KDF_MAX_QUEUE,
+    thread_name_prefix="password-kdf",
+    busy_error=PasswordHashingBusyError,
+    busy_message="Too many authentication requests. Please retry shortly.",
+)
+
+
+async def _get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
+
+
+async def _update_password_hash(db: AsyncSession, user: User, password_hash: str) -> None:
+    user_id = user.id
+    user.password_hash = password_hash
+    try:
+        await db.commit()
+    except SQLAlchemyError as exc:
+        # The old hash still verifies, so a failed upgrade must not fail the login.
+        await db.rollback()
+        print(f"Password hash upgrade failed for user {user_id}: {exc}")
+
+
+async def create_user(db: AsyncSession, username: str, password: str) -> User:
     """Create a new user with a salted password hash."""
-    existing = db.query(User).filter(User.username == username).first()
+    existing = await _get_user_by_username(db, username)
     if existing:
         raise ValueError("Username already exists.")
 
-    password_hash = hash_password(password)
+    password_hash = await _password_pool.run(hash_password, password)
     user = User(username=username, password_hash=password_hash)
     db.add(user)
 
     try:
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
     except SQLAlchemyError as exc:
-        db.rollback()
+        await db.rollback()
         raise RuntimeError(f"Failed to create user: {exc}") from exc
 
     return user
 
 
-def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
-    """Return a user if the credentials are valid."""
-    user = db.query(User).filter(User.username == username).first()
+async def authenticate_user(
+    db: AsyncSession, username: str, password: str
+) -> Optional[User]:
+    """
+    Return a user if the credentials are valid.
+    Hashes made with an older scheme or cost are upgraded transparently.
+    """
+    user = await _get_user_by_username(db, username)
     if not user:
         return None
 
-    if not verify_password(password, user.password_hash):
+    stored_hash = user.password_hash
+    if not await _password_pool.run(verify_password, password, stored_hash):
         return None
 
+    if needs_rehash(stored_hash):
+        new_hash = await _password_pool.run(hash_password, password)
+        await _update_password_hash(db, user, new_hash)
+
     return user
+
+
+def shutdown_password_executor() -> None:
+    _password_pool.shutdown()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import dataclass, field
+from queue import Empty, Queue
+from threading import Lock, Thread
+from typing import Callable, List, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.v2.embedding import get_embedding_model
+
+EncodeFn = Callable[[List[str]], np.ndarray]
+
+
+@dataclass
+class _PendingRequest:
+    texts: List[str]
+    future: "Future[np.ndarray]" = field(default_factory=Future)
+
+
+class EmbeddingBatcher:
+    """
+    동시에 들어온 여러 요청의 텍스트를 잠시 모아 한 번의 encode 호출로 처리한다.
+
+    첫 요청이 도착한 뒤 `max_wait_ms` 동안, 또는 누적 텍스트 수가 `max_batch_size`에
+    도달할 때까지 대기열을 비운 뒤 한 번에 인코딩하고, 각 요청에는 자기 몫의 행만 돌려준다.
+    """
+
+    def __init__(
+        self,
+        encode_fn: EncodeFn,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        self._encode_fn = encode_fn
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "Queue[_PendingRequest]" = Queue()
+        self._worker: Thread | None = None
+        self._worker_lock = Lock()
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """텍스트 목록을 배치 대기열에 넣고 결과 행렬이 나올 때까지 기다린다."""
+
+        return self.submit(texts).result()
+
+    def submit(self, texts: Sequence[str]) -> "Future[np.ndarray]":
+        request = _PendingRequest(texts=list(texts))
+        if not request.texts:
+            request.future.set_result(np.empty((0, 0), dtype=np.float32))
+            return request.future
+
+        self._ensure_worker()
+        self._queue.put(request)
+        return request.future
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = Thread(
+                target=self._run, name="embedding-batcher", daemon=True
+            )
+            self._worker.start()
+
+    def _collect(self, batch: List[_PendingRequest]) -> None:
+        """`batch`(첫 요청이 든 목록)에 대기 중인 요청을 이어 붙인다."""
+
+        total = sum(len(request.texts) for request in batch)
+        deadline = time.monotonic() + self._max_wait
+
+        while total < self._max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    request = self._queue.get_nowait()
+                else:
+                    request = self._queue.get(timeout=remaining)
+            except Empty:
+                break
+            batch.append(request)
+            total += len(request.texts)
+
+    def _run(self) -> None:
+        while True:
+            batch: List[_PendingRequest] = []
+            try:
+                batch.append(self._queue.get())
+                self._collect(batch)
+                self._dispatch(batch)
+            except BaseException as exc:
+                # 워커가 죽으면 이후 모든 요청이 영원히 기다리므로, 이 배치만 실패로 끝내고 계속 돈다.
+                print(f"임베딩 배치 워커 오류: {exc!r}")
+                _fail_unresolved(batch, exc)
+
+    def _dispatch(self, batch: List[_PendingRequest]) -> None:
+        texts: List[str] = []
+        for request in batch:
+            texts.extend(request.texts)
+
+        try:
+            encoded = np.asarray(self._encode_fn(texts), dtype=np.float32)
+            if encoded.ndim == 1:
+                encoded = encoded.reshape(1, -1)
+            if encoded.shape[0] != len(texts):
+                raise RuntimeError(
+                    f"encode 결과 행 수가 입력과 다릅니다: {encoded.shape[0]} != {len(texts)}"
+                )
+        except BaseException as exc:
+            # KeyboardInterrupt 같은 BaseException도 요청 쪽으로 전달해 .result()가 멈추지 않게 한다.
+            _fail_unresolved(batch, exc)
+            return
+
+        offset = 0
+        for request in batch:
+            count = len(request.texts)
+            try:
+                request.future.set_result(encoded[offset : offset + count])
+            except InvalidStateError:
+                pass  # 호출 측에서 이미 취소한 요청
+            offset += count
+
+
+def _fail_unresolved(batch: List[_PendingRequest], exc: BaseException) -> None:
+    """아직 결과가 없는 요청을 모두 실패로 끝낸다. Exception이 아니면 RuntimeError로 감싼다."""
+
+    error = exc
+    if not isinstance(exc, Exception):
+        error = RuntimeError(f"임베딩 배치 처리가 중단되었습니다: {exc!r}")
+        error.__cause__ = exc
+    for request in batch:
+        if request.future.done():
+            continue
+        try:
+            request.future.set_exception(error)
+        except InvalidStateError:
+            pass
+
+
+def _encode_with_loaded_model(texts: List[str]) -> np.ndarray:
+    # 모델은 첫 인코딩 시점(또는 서버 시작 시 백그라운드)에 로드된다.
+    return get_embedding_model().encode(texts)
+
+
+embedding_batcher = EmbeddingBatcher(
+    _encode_with_loaded_model,
+    max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+    max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS,
+)
+
+
+def encode_texts(texts: List[str]) -> np.ndarray:
+    """설정에 따라 마이크로배처를 거치거나 모델을 직접 호출해 임베딩 행렬을 만든다."""
+
+    if settings.EMBEDDING_BATCH_ENABLED:
+        return embedding_batcher.encode(texts)
+    return np.asarray(_encode_with_loaded_model(texts), dtype=np.float32)
+
+
+__all__ = ["EmbeddingBatcher", "embedding_batcher", "encode_texts"]
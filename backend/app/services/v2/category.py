@@ -1,10 +1,22 @@
 import numpy as np
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.services.v1.llm import generate_text  # Gemini 호출 함수
-from app.services.v2.embedding import sbert_model  # SBERT 모델 객체
-from app.services.v2.vector import serialize_normalized_vector
-from app.services.v2.category_cache import invalidate_category_cache
+from app.services.v2.embedding import get_embedding_model  # SBERT 모델 접근자
+from app.services.v2.embedding_service import embed_texts
+from app.services.v2.example_cache import load_example_set, save_example_set
+from app.core.config import settings
+from app.services.v2.vector import (
+    serialize_matrix,
+    serialize_normalized_vector,
+)
+from app.services.v2.category_cache import (
+    bump_category_version,
+    bump_category_version_async,
+    invalidate_category_cache,
+)
 from app.v2.models import Category, FeedbackLog  # SQLAlchemy 모델
 from app.schemas.v2.category import CategoryResponse  # 반환 타입용 스키마
 
@@ -14,17 +26,14 @@ class ExampleGenerationError(Exception):
     pass
 
 
-def create_category(
-    db: Session,
-    user_id: int,
-    name: str,
-    keywords: list[str],
-    description: str | None = None,
-) -> Category:
-    """사용자 키워드 기반으로 LLM을 이용해 대표 벡터를 생성하고 DB에 저장"""
+def generate_example_sentences(name: str, keywords: list[str]) -> list[str]:
+    """
+    LLM으로 카테고리 예시 문장을 생성/선별한다.
+    CATEGORY_LLM_BACKEND=stub이면 네트워크 없이 키워드로 만든 고정 문장을 돌려준다 (로컬 테스트용).
+    """
 
-    if not sbert_model:
-        raise RuntimeError("SBERT model is not loaded.")
+    if settings.CATEGORY_LLM_BACKEND == "stub":
+        return _stub_example_sentences(name, keywords)
 
     # --- 1단계 & 2단계: LLM으로 예시 문장 생성 및 자체 선별 ---
     prompt_for_examples_and_selection = f"""
@@ -49,18 +58,45 @@ def create_category(
             )
 
         # 빈 줄 제거
-        final_sentences = [s for s in final_sentences if s.strip()]
+        return [s for s in final_sentences if s.strip()]
 
     except Exception as e:
         # LLM 호출 관련 에러 처리
         print(f"LLM 호출 중 에러 발생: {e}")
         raise ExampleGenerationError(f"LLM 예시 생성 실패: {e}") from e
 
-    # --- 3단계: 대표 벡터 생성 ---
+
+def _stub_example_sentences(name: str, keywords: list[str]) -> list[str]:
+    terms = [keyword for keyword in keywords if keyword.strip()] or [name]
+    templates = [
+        "{term} 관련 소식 정리했습니다.",
+        "오늘 {name} 이야기 보셨나요? {term} 얘기가 많네요.",
+        "{term} 때문에 {name} 글을 더 보고 싶지 않아요.",
+        "{name}에 대한 의견: {term}",
+        "요즘 커뮤니티에 {term} 내용이 자주 올라옵니다.",
+    ]
+    return [
+        template.format(name=name, term=terms[idx % len(terms)])
+        for idx, template in enumerate(templates)
+    ]
+
+
+def store_category(
+    db: Session,
+    user_id: int,
+    name: str,
+    description: str | None,
+    embeddings: np.ndarray,
+) -> Category:
+    """예시 문장 임베딩(정규화된 행렬)으로 대표 벡터와 프로토타입을 만들어 카테고리를 저장한다."""
+
+    # --- 3단계: 대표 벡터 및 프로토타입 생성 ---
     try:
-        embeddings = sbert_model.encode(final_sentences)
         representative_vector = np.mean(embeddings, axis=0)
         serialized_embedding = serialize_normalized_vector(representative_vector)
+        # 예시 문장 각각을 프로토타입으로 보관해 넓은 주제가 하나의 중심으로 뭉개지지 않게 함
+        prototypes = embeddings[: settings.CATEGORY_MAX_PROTOTYPES]
+        serialized_prototypes = serialize_matrix(prototypes)
     except Exception as e:
         # SBERT 인코딩 에러 처리
         print(f"SBERT 인코딩 중 에러 발생: {e}")
@@ -73,8 +109,10 @@ def create_category(
             name=name,
             description=description,
             embedding=serialized_embedding,
+            prototypes=serialized_prototypes,
         )
         db.add(new_category)
+        bump_category_version(db, user_id)
         db.commit()
         db.refresh(new_category)
         invalidate_category_cache(user_id)
@@ -88,43 +126,76 @@ def create_category(
         raise RuntimeError(f"카테고리 DB 저장 실패: {e}") from e
 
 
-def list_user_categories(db: Session, user_id: int) -> list[Category]:
+def create_category(
+    db: Session,
+    user_id: int,
+    name: str,
+    keywords: list[str],
+    description: str | None = None,
+) -> Category:
+    """사용자 키워드 기반으로 LLM을 이용해 대표 벡터를 생성하고 DB에 저장"""
+
+    # 같은 이름·키워드로 만든 적이 있으면 LLM과 모델 호출 없이 저장된 예시 임베딩 재사용
+    cached = load_example_set(db, name, keywords)
+    if cached is not None:
+        return store_category(db, user_id, name, description, cached.embeddings)
+
+    # 모델 로드에 실패했다면 LLM을 호출하기 전에 중단
+    get_embedding_model()
+
+    final_sentences = generate_example_sentences(name, keywords)
+
+    try:
+        # 공유 임베딩 서비스(캐시 + 마이크로배처)를 거쳐 정규화된 벡터를 얻음
+        embeddings = embed_texts(final_sentences)
+    except Exception as e:
+        print(f"SBERT 인코딩 중 에러 발생: {e}")
+        raise RuntimeError(f"대표 벡터 생성 실패: {e}") from e
+
+    new_category = store_category(db, user_id, name, description, embeddings)
+    save_example_set(db, name, keywords, final_sentences, embeddings)
+    return new_category
+
+
+async def list_user_categories(db: AsyncSession, user_id: int) -> list[Category]:
     """특정 사용자의 카테고리 목록 반환"""
-    return (
-        db.query(Category)
-        .filter(Category.user_id == user_id)
+    result = await db.execute(
+        select(Category)
+        .where(Category.user_id == user_id)
         .order_by(Category.created_at.desc())
-        .all()
     )
+    return list(result.scalars().all())
 
 
-def delete_category(db: Session, user_id: int, category_id: int) -> int:
+async def delete_category(db: AsyncSession, user_id: int, category_id: int) -> int:
     """사용자 카테고리와 관련 로그를 삭제하고 캐시를 무효화한다."""
 
-    category = (
-        db.query(Category)
-        .filter(Category.id == category_id, Category.user_id == user_id)
-        .first()
+    result = await db.execute(
+        select(Category.id).where(
+            Category.id == category_id, Category.user_id == user_id
+        )
     )
-
-    if category is None:
+    if result.scalar_one_or_none() is None:
         raise ValueError("카테고리를 찾을 수 없거나 접근 권한이 없습니다.")
 
     try:
         # 카테고리를 참조하는 피드백 로그 삭제 (외래키 제약 충돌 방지)
-        (
-            db.query(FeedbackLog)
-            .filter(
+        await db.execute(
+            delete(FeedbackLog).where(
                 FeedbackLog.category_id == category_id,
                 FeedbackLog.user_id == user_id,
             )
-            .delete(synchronize_session=False)
         )
 
-        db.delete(category)
-        db.commit()
+        await db.execute(
+            delete(Category).where(
+                Category.id == category_id, Category.user_id == user_id
+            )
+        )
+        await bump_category_version_async(db, user_id)
+        await db.commit()
     except Exception as exc:  # pragma: no cover - 예외 메시지 전달용
-        db.rollback()
+        await db.rollback()
         raise RuntimeError(f"카테고리 삭제 실패: {exc}") from exc
 
     invalidate_category_cache(user_id)
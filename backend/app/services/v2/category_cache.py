@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import sys
 import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from dataclasses import dataclass
-from threading import RLock
-from typing import Dict, List, Optional, Tuple
+from threading import Event, RLock, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
+from sqlalchemy import text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-# 캐시 만료 시간 (초)
-_CACHE_TTL_SECONDS = 120.0
+from app.core.config import settings
+from app.db import engine
+from app.services.v2.vector import QuantizedMatrix, quantize_rows
+from app.v2.models import User
 
 
 @dataclass(frozen=True)
@@ -18,55 +26,468 @@ class CategoryVectorMeta:
 
 
 @dataclass(frozen=True)
-class _CacheEntry:
-    matrix: np.ndarray
+class CategoryVectors:
+    """
+    사용자 카테고리 전체의 프로토타입을 하나로 묶은 행렬과 카테고리별 구간 인덱스.
+    카테고리 i의 프로토타입은 matrix 행 offsets[i] 부터 다음 카테고리의 offset 직전까지다.
+    """
+
+    matrix: QuantizedMatrix  # (전체 프로토타입 수, dim)
+    offsets: np.ndarray  # (카테고리 수,)
     meta: List[CategoryVectorMeta]
+
+    @property
+    def nbytes(self) -> int:
+        """캐시 예산 계산용 대략적인 메모리 크기 (행렬 + 인덱스 + 메타 문자열)."""
+
+        meta_bytes = sum(
+            sys.getsizeof(item) + sys.getsizeof(item.name) for item in self.meta
+        )
+        return self.matrix.nbytes + self.offsets.nbytes + meta_bytes
+
+
+# 로더 반환값: (프로토타입 행렬, 카테고리별 시작 행 offsets, 메타). 카테고리가 없으면 모두 None.
+CategoryLoadResult = Tuple[
+    Optional[np.ndarray], Optional[np.ndarray], Optional[List[CategoryVectorMeta]]
+]
+
+
+@dataclass
+class _CacheEntry:
+    vectors: CategoryVectors
+    version: int  # 캐시를 채울 때 읽은 users.category_version
     stored_at: float
+    checked_at: float  # 마지막으로 DB 버전과 대조한 시각
+    nbytes: int
+
+
+@dataclass
+class _CacheStats:
+    hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    coalesced_loads: int = 0
+    evictions: int = 0
+    patches: int = 0
 
 
-_cache: Dict[int, _CacheEntry] = {}
+# 사용자별 항목을 최근 사용 순으로 보관 (맨 뒤가 가장 최근). 전체 크기는 CATEGORY_CACHE_MAX_BYTES 이하.
+_cache: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+_cache_bytes = 0
 _cache_lock = RLock()
+_stats = _CacheStats()
+# 사용자별 진행 중인 적재 작업: 동시에 미스난 요청은 같은 결과를 기다린다.
+_inflight: Dict[int, "Future[Optional[CategoryVectors]]"] = {}
+# 적재 중(_inflight)인 사용자에 한해 무효화 알림으로 전달받은 최신 카테고리 버전.
+# 적재가 끝나면 지우므로 크기는 동시에 적재 중인 사용자 수를 넘지 않는다.
+# 그 밖의 사용자는 캐시 항목의 version과 비교해 무효화하면 충분하다.
+_latest_versions: Dict[int, int] = {}
+
+
+def get_category_version(db: Session, user_id: int) -> int:
+    """사용자 카테고리 버전(users.category_version)을 읽는다. 인덱스 한 번 조회로 끝나는 가벼운 쿼리."""
+
+    version = db.query(User.category_version).filter(User.id == user_id).scalar()
+    return int(version or 0)
+
+
+def _bump_version_statement(user_id: int):
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(category_version=User.category_version + 1)
+        .returning(User.category_version)
+    )
+
+
+def _notify_params(user_id: int, version: int) -> Dict[str, str]:
+    return {
+        "channel": settings.CATEGORY_INVALIDATION_CHANNEL,
+        "payload": f"{user_id}:{version}",
+    }
+
+
+_NOTIFY_SQL = text("SELECT pg_notify(:channel, :payload)")
+
+
+def bump_category_version(db: Session, user_id: int) -> int:
+    """
+    사용자 카테고리 버전을 1 올리고 모든 워커에 무효화 알림을 보낸다.
+    카테고리를 바꾸는 트랜잭션 안에서 commit 전에 호출한다.
+    Postgres NOTIFY는 commit 시점에 전달되므로 롤백되면 알림도 나가지 않는다.
+    """
+
+    version = db.execute(_bump_version_statement(user_id)).scalar_one()
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(_NOTIFY_SQL, _notify_params(user_id, version))
+    return int(version)
+
+
+async def bump_category_version_async(db: AsyncSession, user_id: int) -> int:
+    """bump_category_version의 AsyncSession 버전."""
+
+    version = (await db.execute(_bump_version_statement(user_id))).scalar_one()
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(_NOTIFY_SQL, _notify_params(user_id, version))
+    return int(version)
 
 
 def get_cached_category_vectors(
-    user_id: int,
-) -> Optional[Tuple[np.ndarray, List[CategoryVectorMeta]]]:
-    """TTL 내 사용자 카테고리 벡터 캐시를 반환한다."""
+    db: Session, user_id: int
+) -> Optional[CategoryVectors]:
+    """
+    사용자 카테고리 벡터 캐시를 반환한다.
+    무효화 리스너가 연결되어 있으면 알림을 믿고 DB를 조회하지 않는다.
+    연결되어 있지 않으면 CATEGORY_CACHE_REVALIDATE_SECONDS마다 버전만 조회해 재검증한다.
+    """
 
+    now = time.monotonic()
     with _cache_lock:
         entry = _cache.get(user_id)
         if entry is None:
             return None
-        if time.time() - entry.stored_at > _CACHE_TTL_SECONDS:
-            _cache.pop(user_id, None)
+        if now - entry.stored_at > settings.CATEGORY_CACHE_TTL_SECONDS:
+            _remove_entry(user_id)
+            return None
+        if _listener.connected or (
+            now - entry.checked_at < settings.CATEGORY_CACHE_REVALIDATE_SECONDS
+        ):
+            _cache.move_to_end(user_id)
+            return entry.vectors
+
+    current_version = get_category_version(db, user_id)
+    with _cache_lock:
+        if _cache.get(user_id) is not entry:
+            return None
+        if current_version != entry.version:
+            _remove_entry(user_id)
             return None
-        return entry.matrix, entry.meta
+        entry.checked_at = now
+        _cache.move_to_end(user_id)
+        return entry.vectors
+
+
+def load_category_vectors(
+    db: Session, user_id: int, loader: Callable[[Session, int], CategoryLoadResult]
+) -> Optional[CategoryVectors]:
+    """
+    캐시에서 사용자 카테고리 벡터를 찾고, 없으면 `loader`로 DB에서 읽어 캐시에 넣는다.
+    같은 사용자에 대한 동시 미스는 하나의 적재(single-flight)만 실행하고 나머지는 그 결과를 기다린다.
+    카테고리가 없으면 None을 반환한다.
+    """
+
+    vectors = get_cached_category_vectors(db, user_id)
+    if vectors is not None:
+        with _cache_lock:
+            _stats.hits += 1
+        return vectors
+
+    with _cache_lock:
+        _stats.misses += 1
+        pending = _inflight.get(user_id)
+        leader = pending is None
+        if leader:
+            pending = Future()
+            _inflight[user_id] = pending
+        else:
+            _stats.coalesced_loads += 1
+
+    if not leader:
+        return pending.result()
+
+    try:
+        # 버전을 먼저 읽어 두면, 적재 중 다른 워커가 카테고리를 바꿔도 그 알림이 이 캐시를 무효화한다.
+        version = get_category_version(db, user_id)
+        prototypes, offsets, meta = loader(db, user_id)
+        if prototypes is None or offsets is None or meta is None:
+            vectors = None
+        else:
+            # 캐시와 같은 (양자화된) 표현을 돌려줘 첫 요청과 이후 요청의 판정을 일치시킴
+            vectors = set_cached_category_vectors(
+                user_id, version, prototypes, offsets, meta
+            )
+    except BaseException as exc:
+        pending.set_exception(exc)
+        raise
+    else:
+        pending.set_result(vectors)
+        return vectors
+    finally:
+        with _cache_lock:
+            _stats.loads += 1
+            _inflight.pop(user_id, None)
+            _latest_versions.pop(user_id, None)
 
 
 def set_cached_category_vectors(
     user_id: int,
+    version: int,
     matrix: np.ndarray,
+    offsets: np.ndarray,
     meta: List[CategoryVectorMeta],
-) -> None:
-    """사용자 카테고리 벡터 캐시를 갱신한다."""
+) -> CategoryVectors:
+    """
+    사용자 카테고리 벡터 캐시를 갱신한다.
+    EMBEDDING_QUANTIZATION 설정에 따라 float16/int8로 줄여 저장하고, 저장된 값을 반환한다.
+    `version`은 카테고리를 읽기 전에 조회한 버전이며, 그 사이 더 새 버전의 알림을 받았다면 캐시하지 않는다.
+    """
 
+    vectors = CategoryVectors(
+        matrix=quantize_rows(matrix, settings.EMBEDDING_QUANTIZATION),
+        offsets=np.asarray(offsets, dtype=np.intp),
+        meta=list(meta),
+    )
+    now = time.monotonic()
     with _cache_lock:
-        _cache[user_id] = _CacheEntry(
-            matrix=matrix,
-            meta=list(meta),
-            stored_at=time.time(),
+        if _latest_versions.get(user_id, version) <= version:
+            _store_entry(user_id, vectors, version, stored_at=now, checked_at=now)
+    return vectors
+
+
+def patch_category_vectors(
+    user_id: int, version: int, updates: Dict[int, np.ndarray]
+) -> bool:
+    """
+    피드백으로 바뀐 카테고리의 프로토타입만 캐시 행렬에 반영한다 (copy-on-write).
+    `version`은 이 변경으로 올라간 새 버전이며, 캐시가 바로 직전 버전(version - 1)일 때만 적용한다.
+    새 행렬/offsets를 따로 만든 뒤 항목을 통째로 교체하므로, 읽는 쪽은 이전 또는 새 행렬 중
+    하나만 보고 절반만 바뀐 행렬을 보지 않는다. 적용하지 못하면 항목을 버리고 False를 반환한다.
+    """
+
+    with _cache_lock:
+        entry = _cache.get(user_id)
+        if entry is None:
+            return False
+        if entry.version != version - 1:
+            _remove_entry(user_id)
+            return False
+
+    try:
+        vectors = _patched_vectors(entry.vectors, updates)
+    except KeyError:
+        # 캐시에 없는 카테고리(다른 워커에서 방금 생성 등): 다음 요청에서 다시 적재
+        invalidate_category_cache(user_id)
+        return False
+
+    with _cache_lock:
+        if _cache.get(user_id) is not entry:
+            # 그 사이 다른 갱신/무효화가 일어났으면 그쪽을 따른다.
+            return False
+        if _latest_versions.get(user_id, version) > version:
+            _remove_entry(user_id)
+            return False
+        _store_entry(
+            user_id,
+            vectors,
+            version,
+            stored_at=entry.stored_at,
+            checked_at=time.monotonic(),
         )
+        _stats.patches += 1
+    return True
+
+
+def _patched_vectors(
+    vectors: CategoryVectors, updates: Dict[int, np.ndarray]
+) -> CategoryVectors:
+    """바뀐 카테고리 구간만 새로 양자화해 끼워 넣은 새 CategoryVectors를 만든다 (원본은 그대로)."""
+
+    positions = {meta.id: idx for idx, meta in enumerate(vectors.meta)}
+    changed = {positions[category_id]: rows for category_id, rows in updates.items()}
+
+    matrix = vectors.matrix
+    ends = np.append(vectors.offsets[1:], matrix.data.shape[0])
+    data_blocks: List[np.ndarray] = []
+    scale_blocks: List[np.ndarray] = []
+    offsets: List[int] = []
+    total_rows = 0
+    for idx, (start, end) in enumerate(zip(vectors.offsets, ends)):
+        if idx in changed:
+            block = quantize_rows(changed[idx], settings.EMBEDDING_QUANTIZATION)
+            data, scale = block.data, block.scale
+        else:
+            data = matrix.data[start:end]
+            scale = None if matrix.scale is None else matrix.scale[start:end]
+        data_blocks.append(data)
+        if scale is not None:
+            scale_blocks.append(scale)
+        offsets.append(total_rows)
+        total_rows += data.shape[0]
+
+    return CategoryVectors(
+        matrix=QuantizedMatrix(
+            data=np.concatenate(data_blocks, axis=0),
+            scale=np.concatenate(scale_blocks) if matrix.scale is not None else None,
+        ),
+        offsets=np.asarray(offsets, dtype=np.intp),
+        meta=vectors.meta,
+    )
+
+
+def _store_entry(
+    user_id: int,
+    vectors: CategoryVectors,
+    version: int,
+    stored_at: float,
+    checked_at: float,
+) -> None:
+    """
+    _cache_lock을 잡은 상태에서 호출한다.
+    바이트 예산(CATEGORY_CACHE_MAX_BYTES)을 넘으면 가장 오래 쓰이지 않은 사용자부터 내보낸다.
+    """
+
+    global _cache_bytes
+
+    nbytes = vectors.nbytes
+    budget = settings.CATEGORY_CACHE_MAX_BYTES
+    _remove_entry(user_id)
+    if nbytes > budget:
+        return
+    while _cache and _cache_bytes + nbytes > budget:
+        _remove_entry(next(iter(_cache)))
+        _stats.evictions += 1
+    _cache[user_id] = _CacheEntry(
+        vectors=vectors,
+        version=version,
+        stored_at=stored_at,
+        checked_at=checked_at,
+        nbytes=nbytes,
+    )
+    _cache_bytes += nbytes
+
+
+def _remove_entry(user_id: int) -> None:
+    """_cache_lock을 잡은 상태에서 호출한다."""
+
+    global _cache_bytes
+    entry = _cache.pop(user_id, None)
+    if entry is not None:
+        _cache_bytes -= entry.nbytes
 
 
 def invalidate_category_cache(user_id: int) -> None:
-    """특정 사용자의 벡터 캐시를 무효화한다."""
+    """특정 사용자의 벡터 캐시를 무효화한다 (현재 워커). 다른 워커는 NOTIFY 알림으로 무효화된다."""
 
     with _cache_lock:
-        _cache.pop(user_id, None)
+        _remove_entry(user_id)
 
 
 def clear_category_cache() -> None:
     """테스트나 유지보수용 전체 캐시 삭제."""
 
+    global _cache_bytes
     with _cache_lock:
         _cache.clear()
+        _cache_bytes = 0
+
+
+def _apply_invalidation(payload: str) -> None:
+    """'<user_id>:<version>' 형식의 알림을 받아 더 오래된 캐시 항목을 버린다."""
+
+    try:
+        user_part, version_part = payload.split(":", 1)
+        user_id, version = int(user_part), int(version_part)
+    except ValueError:
+        print(f"잘못된 카테고리 무효화 알림: {payload!r}")
+        return
+
+    with _cache_lock:
+        # 적재 중이면 읽어 둔 버전보다 새 알림을 기록해, 적재 결과가 낡은 버전으로 캐시되지 않게 한다.
+        if user_id in _inflight and version > _latest_versions.get(user_id, -1):
+            _latest_versions[user_id] = version
+        entry = _cache.get(user_id)
+        if entry is not None and entry.version < version:
+            _remove_entry(user_id)
+
+
+class _InvalidationListener:
+    """
+    Postgres LISTEN으로 다른 워커의 카테고리 변경 알림을 받아 캐시를 무효화하는 백그라운드 스레드.
+    연결이 끊긴 동안 놓친 알림이 있을 수 있으므로 (재)연결할 때마다 캐시를 비우고,
+    끊겨 있는 동안에는 get_cached_category_vectors가 버전 재검증으로 대신한다.
+    """
+
+    _RECONNECT_DELAY_SECONDS = 5.0
+    _POLL_TIMEOUT_SECONDS = 1.0
+
+    def __init__(self) -> None:
+        self._stop = Event()
+        self._thread: Thread | None = None
+        self.connected = False
+        self._last_error: str | None = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if engine.dialect.name != "postgresql":
+            return
+        self._stop.clear()
+        self._thread = Thread(
+            target=self._run, name="category-invalidation", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        import psycopg
+        from psycopg import sql
+
+        conninfo = engine.url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        channel = settings.CATEGORY_INVALIDATION_CHANNEL
+
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(conninfo, autocommit=True) as conn:
+                    conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+                    clear_category_cache()
+                    self.connected = True
+                    self._last_error = None
+                    while not self._stop.is_set():
+                        for notify in conn.notifies(timeout=self._POLL_TIMEOUT_SECONDS):
+                            _apply_invalidation(notify.payload)
+            except Exception as e:
+                self._last_error = str(e)
+                print(f"카테고리 무효화 리스너 연결 오류: {e}")
+            finally:
+                self.connected = False
+            self._stop.wait(self._RECONNECT_DELAY_SECONDS)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "listening": self.connected,
+            "channel": settings.CATEGORY_INVALIDATION_CHANNEL,
+            "error": self._last_error,
+        }
+
+
+_listener = _InvalidationListener()
+
+
+def start_category_invalidation_listener() -> None:
+    """서버 시작 시 카테고리 무효화 알림 수신을 시작한다 (Postgres에서만 동작)."""
+
+    _listener.start()
+
+
+def stop_category_invalidation_listener() -> None:
+    _listener.stop()
+
+
+def category_cache_status() -> Dict[str, Any]:
+    with _cache_lock:
+        return {
+            "entries": len(_cache),
+            "bytes": _cache_bytes,
+            "max_bytes": settings.CATEGORY_CACHE_MAX_BYTES,
+            "hits": _stats.hits,
+            "misses": _stats.misses,
+            "loads": _stats.loads,
+            "coalesced_loads": _stats.coalesced_loads,
+            "evictions": _stats.evictions,
+            "patches": _stats.patches,
+            "invalidation": _listener.status(),
+        }
@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+import datetime
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from queue import Empty, Queue
+from threading import Event, Lock, Thread
+from typing import Any, List, Set
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import SessionLocal
+from app.services.v2.category import generate_example_sentences, store_category
+from app.services.v2.embedding_service import embed_texts
+from app.services.v2.example_cache import load_example_set, save_example_set
+from app.v2.models import CategoryJob
+
+_UNFINISHED_STATUSES = ("pending", "generating", "embedding")
+_SHUTDOWN_ERROR = "서버 종료로 작업이 중단되었습니다."
+_STALE_ERROR = "작업을 처리하던 서버가 응답하지 않아 중단되었습니다."
+
+
+@dataclass(frozen=True)
+class _JobSpec:
+    job_id: str
+    user_id: int
+    name: str
+    keywords: List[str]
+    description: str | None
+
+
+@dataclass(frozen=True)
+class _GeneratedJob:
+    spec: _JobSpec
+    sentences: List[str]
+
+
+def _update_job(job_id: str, **fields: Any) -> None:
+    # 이미 끝난(succeeded/failed) 작업은 바꾸지 않는다 (종료 시 실패 처리된 작업이 뒤늦게 덮어써지지 않도록)
+    with SessionLocal() as db:
+        db.query(CategoryJob).filter(
+            CategoryJob.id == job_id, CategoryJob.status.in_(_UNFINISHED_STATUSES)
+        ).update(
+            {**fields, CategoryJob.updated_at: datetime.datetime.utcnow()},
+            synchronize_session=False,
+        )
+        db.commit()
+
+
+def _fail_job(job_id: str, error: str) -> None:
+    print(f"카테고리 생성 작업 {job_id} 실패: {error}")
+    _update_job(job_id, status="failed", error=error)
+
+
+def _store_job(
+    spec: _JobSpec, embeddings: np.ndarray, sentences: List[str] | None = None
+) -> None:
+    """카테고리를 저장하고 작업을 완료 처리한다. 새로 생성한 예시 문장이면 캐시에도 저장."""
+
+    try:
+        with SessionLocal() as db:
+            category = store_category(
+                db, spec.user_id, spec.name, spec.description, embeddings
+            )
+            category_id = category.id
+            if sentences is not None:
+                save_example_set(db, spec.name, spec.keywords, sentences, embeddings)
+        _update_job(spec.job_id, status="succeeded", category_id=category_id)
+    except Exception as e:
+        _fail_job(spec.job_id, str(e))
+
+
+class CategoryJobRunner:
+    """
+    카테고리 생성 작업을 백그라운드에서 두 단계로 처리한다.
+    1) LLM 단계: 최대 `llm_concurrency`개의 예시 문장 생성을 동시에 실행한다.
+    2) 임베딩 단계: LLM이 끝난 작업을 `embed_wait_ms` 동안 모아 모든 예시 문장을 한 번에 임베딩한 뒤
+       작업별로 카테고리를 저장한다.
+    처리 중인 작업은 `heartbeat_seconds`마다 updated_at을 갱신하고, 같은 주기로 `stale_seconds` 넘게
+    갱신되지 않은(처리하던 프로세스가 사라진) 작업을 실패로 정리한다.
+    """
+
+    def __init__(
+        self,
+        llm_concurrency: int = 4,
+        embed_wait_ms: float = 50.0,
+        heartbeat_seconds: float = 30.0,
+        stale_seconds: float = 120.0,
+    ) -> None:
+        self._llm_executor = ThreadPoolExecutor(
+            max_workers=max(1, llm_concurrency),
+            thread_name_prefix="category-llm",
+        )
+        self._embed_wait = max(0.0, embed_wait_ms) / 1000.0
+        self._ready: "Queue[_GeneratedJob]" = Queue()
+        self._embed_worker: Thread | None = None
+        self._worker_lock = Lock()
+        self._heartbeat = max(1.0, heartbeat_seconds)
+        self.stale_seconds = max(self._heartbeat * 2, stale_seconds)
+        self._heartbeat_worker: Thread | None = None
+        self._stop = Event()
+        # 이 프로세스가 맡아 아직 끝나지 않은 작업 ID
+        self._active: Set[str] = set()
+        self._active_lock = Lock()
+        self.closed = False
+
+    def enqueue(self, spec: _JobSpec) -> None:
+        with self._active_lock:
+            self._active.add(spec.job_id)
+        try:
+            self._llm_executor.submit(self._generate, spec)
+        except RuntimeError:
+            # 종료 중이라 더 이상 작업을 받을 수 없음
+            self._finish(spec.job_id)
+            _fail_job(spec.job_id, _SHUTDOWN_ERROR)
+
+    def start(self) -> None:
+        """하트비트/정리 스레드를 시작한다. 시작 시 한 번 정리하고 이후 주기적으로 반복한다."""
+
+        with self._worker_lock:
+            if self._heartbeat_worker is not None and self._heartbeat_worker.is_alive():
+                return
+            self._stop.clear()
+            self._heartbeat_worker = Thread(
+                target=self._heartbeat_loop, name="category-job-heartbeat", daemon=True
+            )
+            self._heartbeat_worker.start()
+
+    def shutdown(self) -> None:
+        """대기 중인 작업을 취소하고, 끝내지 못한 작업(대기·진행 중 모두)을 실패로 표시한다."""
+
+        self.closed = True
+        self._stop.set()
+        self._llm_executor.shutdown(wait=False, cancel_futures=True)
+        with self._active_lock:
+            unfinished = list(self._active)
+            self._active.clear()
+        if unfinished:
+            _fail_jobs(unfinished, _SHUTDOWN_ERROR)
+
+    def active_job_ids(self) -> List[str]:
+        with self._active_lock:
+            return list(self._active)
+
+    def _finish(self, job_id: str) -> None:
+        with self._active_lock:
+            self._active.discard(job_id)
+
+    def _heartbeat_loop(self) -> None:
+        fail_interrupted_category_jobs()
+        while not self._stop.wait(self._heartbeat):
+            touch_category_jobs(self.active_job_ids())
+            fail_interrupted_category_jobs()
+
+    def _store(
+        self, spec: _JobSpec, embeddings: np.ndarray, sentences: List[str] | None = None
+    ) -> None:
+        if self.closed:
+            # 종료 시 이미 실패로 표시된 작업이므로 카테고리를 만들지 않는다
+            _fail_job(spec.job_id, _SHUTDOWN_ERROR)
+        else:
+            _store_job(spec, embeddings, sentences)
+        self._finish(spec.job_id)
+
+    def _generate(self, spec: _JobSpec) -> None:
+        try:
+            with SessionLocal() as db:
+                cached = load_example_set(db, spec.name, spec.keywords)
+            if cached is not None:
+                # LLM·임베딩 단계를 모두 건너뜀
+                self._store(spec, cached.embeddings)
+                return
+            _update_job(spec.job_id, status="generating")
+            sentences = generate_example_sentences(spec.name, spec.keywords)
+            _update_job(spec.job_id, status="embedding")
+        except Exception as e:
+            self._finish(spec.job_id)
+            _fail_job(spec.job_id, str(e))
+            return
+
+        if self.closed:
+            self._finish(spec.job_id)
+            return
+        self._ensure_embed_worker()
+        self._ready.put(_GeneratedJob(spec=spec, sentences=sentences))
+
+    def _ensure_embed_worker(self) -> None:
+        if self._embed_worker is not None and self._embed_worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._embed_worker is not None and self._embed_worker.is_alive():
+                return
+            self._embed_worker = Thread(
+                target=self._embed_loop, name="category-embed", daemon=True
+            )
+            self._embed_worker.start()
+
+    def _embed_loop(self) -> None:
+        while True:
+            batch = [self._ready.get()]
+            deadline = time.monotonic() + self._embed_wait
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        batch.append(self._ready.get_nowait())
+                    else:
+                        batch.append(self._ready.get(timeout=remaining))
+                except Empty:
+                    break
+            self._embed_and_store(batch)
+
+    def _embed_and_store(self, batch: List[_GeneratedJob]) -> None:
+        texts = [sentence for job in batch for sentence in job.sentences]
+        try:
+            # 여러 작업의 예시 문장을 한 번의 임베딩 호출로 처리
+            embeddings = embed_texts(texts)
+        except Exception as e:
+            for job in batch:
+                self._finish(job.spec.job_id)
+                _fail_job(job.spec.job_id, f"대표 벡터 생성 실패: {e}")
+            return
+
+        offset = 0
+        for job in batch:
+            rows = embeddings[offset : offset + len(job.sentences)]
+            offset += len(job.sentences)
+            self._store(job.spec, rows, job.sentences)
+
+
+category_job_runner = CategoryJobRunner(
+    llm_concurrency=settings.CATEGORY_JOB_LLM_CONCURRENCY,
+    embed_wait_ms=settings.CATEGORY_JOB_EMBED_WAIT_MS,
+    heartbeat_seconds=settings.CATEGORY_JOB_HEARTBEAT_SECONDS,
+    stale_seconds=settings.CATEGORY_JOB_STALE_SECONDS,
+)
+
+
+def submit_category_job(
+    db: Session,
+    user_id: int,
+    name: str,
+    keywords: list[str],
+    description: str | None = None,
+) -> CategoryJob:
+    """카테고리 생성 작업을 기록하고 백그라운드 처리를 시작한다. 작업 ID를 바로 돌려준다."""
+
+    job = CategoryJob(
+        id=uuid.uuid4().hex,
+        user_id=user_id,
+        name=name,
+        description=description,
+        keywords=json.dumps(keywords, ensure_ascii=False),
+        status="pending",
+    )
+    db.add(job)
+    try:
+        db.commit()
+        db.refresh(job)
+    except Exception as e:
+        db.rollback()
+        raise RuntimeError(f"카테고리 생성 작업 저장 실패: {e}") from e
+
+    category_job_runner.enqueue(
+        _JobSpec(
+            job_id=job.id,
+            user_id=user_id,
+            name=name,
+            keywords=list(keywords),
+            description=description,
+        )
+    )
+    return job
+
+
+async def get_category_job(
+    db: AsyncSession, user_id: int, job_id: str
+) -> CategoryJob | None:
+    """사용자 본인의 작업만 조회한다."""
+
+    result = await db.execute(
+        select(CategoryJob).where(
+            CategoryJob.id == job_id, CategoryJob.user_id == user_id
+        )
+    )
+    return result.scalars().first()
+
+
+def _fail_jobs(job_ids: List[str], error: str) -> None:
+    print(f"카테고리 생성 작업 {len(job_ids)}건 실패 처리: {error}")
+    try:
+        with SessionLocal() as db:
+            db.query(CategoryJob).filter(
+                CategoryJob.id.in_(job_ids),
+                CategoryJob.status.in_(_UNFINISHED_STATUSES),
+            ).update(
+                {
+                    "status": "failed",
+                    "error": error,
+                    CategoryJob.updated_at: datetime.datetime.utcnow(),
+                },
+                synchronize_session=False,
+            )
+            db.commit()
+    except Exception as e:
+        print(f"카테고리 생성 작업 실패 처리 오류: {e}")
+
+
+def touch_category_jobs(job_ids: List[str]) -> None:
+    """이 프로세스가 처리 중인 작업의 updated_at을 갱신한다 (하트비트)."""
+
+    if not job_ids:
+        return
+    try:
+        with SessionLocal() as db:
+            db.query(CategoryJob).filter(
+                CategoryJob.id.in_(job_ids),
+                CategoryJob.status.in_(_UNFINISHED_STATUSES),
+            ).update(
+                {CategoryJob.updated_at: datetime.datetime.utcnow()},
+                synchronize_session=False,
+            )
+            db.commit()
+    except Exception as e:
+        print(f"카테고리 생성 작업 하트비트 실패: {e}")
+
+
+def fail_interrupted_category_jobs() -> None:
+    """
+    하트비트가 끊긴 지 `CATEGORY_JOB_STALE_SECONDS`가 지난 미완료 작업을 실패로 표시한다.
+    처리하던 프로세스가 비정상 종료되어 더 이상 진행되지 않는 작업이다.
+    """
+
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(
+        seconds=category_job_runner.stale_seconds
+    )
+    try:
+        with SessionLocal() as db:
+            db.query(CategoryJob).filter(
+                CategoryJob.status.in_(_UNFINISHED_STATUSES),
+                CategoryJob.updated_at < cutoff,
+            ).update(
+                {"status": "failed", "error": _STALE_ERROR},
+                synchronize_session=False,
+            )
+            db.commit()
+    except Exception as e:
+        print(f"중단된 카테고리 생성 작업 정리 실패: {e}")
+
+
+def start_category_jobs() -> None:
+    category_job_runner.start()
+
+
+def shutdown_category_jobs() -> None:
+    category_job_runner.shutdown()
+
+
+__all__ = [
+    "CategoryJobRunner",
+    "category_job_runner",
+    "fail_interrupted_category_jobs",
+    "get_category_job",
+    "shutdown_category_jobs",
+    "start_category_jobs",
+    "submit_category_job",
+    "touch_category_jobs",
+]
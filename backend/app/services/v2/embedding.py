@@ -1,17 +1,268 @@
-from sentence_transformers import SentenceTransformer
+import time
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import TYPE_CHECKING, Any, Dict, List, Protocol, Sequence
+
+import numpy as np
+
 from app.core.config import settings
 
+if TYPE_CHECKING:  # torch 임포트 비용을 실제 로드 시점까지 미룬다
+    from sentence_transformers import SentenceTransformer
+
 # 사용할 모델 이름
 MODEL_NAME = settings.SBERT_MODEL_NAME
 
-# FastAPI 서버 시작 시 모델 로드 (시간이 걸릴 수 있음)
-print(f"Loading Embedding model: {MODEL_NAME}...")
-try:
-    sbert_model = SentenceTransformer(MODEL_NAME, trust_remote_code=True)
-    print("SBERT model loaded successfully.")
-except Exception as e:
-    print(f"Error loading SBERT model: {e}")
-    # 에러 처리 로직 추가 필요
-    sbert_model = None
-
-# 다른 서비스에서 이 sbert_model 변수를 import 하여 사용
+# 길이 버킷 경계: 배치 안의 최장 입력이 최단 입력의 2배(또는 +16 토큰)를 넘으면 배치를 나눈다
+_BUCKET_MAX_LENGTH_RATIO = 2.0
+_BUCKET_MIN_LENGTH_SLACK = 16
+
+# 워밍업에 사용할 대표 길이의 텍스트 (버튼 라벨 ~ 긴 댓글/본문)
+_WARMUP_TEXTS = [
+    "답글",
+    "오늘의 주요 뉴스 헤드라인",
+    "이 댓글은 특정 인물의 외모를 비하하고 있어 불쾌감을 줄 수 있습니다. " * 3,
+    "긴 본문 문단입니다. 여러 문장이 이어지며 주제가 조금씩 바뀝니다. " * 40,
+]
+
+
+class EmbeddingBackend(Protocol):
+    """모든 임베딩 백엔드가 따르는 공통 계약: 텍스트 목록 → (텍스트 수, 차원) float32 행렬."""
+
+    name: str
+
+    def encode(self, texts: List[str]) -> np.ndarray: ...
+
+
+def length_buckets(sorted_lengths: Sequence[int], batch_size: int) -> List[slice]:
+    """
+    길이순으로 정렬된 입력을 길이가 비슷한 마이크로배치로 나눈다.
+    배치 크기가 `batch_size`에 도달하거나, 가장 긴 입력이 첫 입력보다 크게 길어지면 새 배치를 시작해
+    짧은 텍스트가 긴 텍스트 길이만큼 패딩되는 낭비를 제한한다.
+    """
+
+    buckets: List[slice] = []
+    start = 0
+    for idx, length in enumerate(sorted_lengths):
+        if idx == start:
+            continue
+        shortest = sorted_lengths[start]
+        too_long = length > max(
+            shortest * _BUCKET_MAX_LENGTH_RATIO, shortest + _BUCKET_MIN_LENGTH_SLACK
+        )
+        if idx - start >= batch_size or too_long:
+            buckets.append(slice(start, idx))
+            start = idx
+    if start < len(sorted_lengths):
+        buckets.append(slice(start, len(sorted_lengths)))
+    return buckets
+
+
+class SentenceTransformerBackend:
+    """
+    sentence-transformers 모델을 감싼 백엔드 (PyTorch 또는 ONNX Runtime 실행).
+
+    입력을 토큰 길이순으로 정렬해 길이가 비슷한 마이크로배치로 인코딩한 뒤 원래 순서로 되돌린다.
+    최대 시퀀스 길이와 잘라낼 방향은 EMBEDDING_MAX_SEQ_LENGTH / EMBEDDING_TRUNCATION_SIDE 설정을 따른다
+    (길이를 지정하지 않으면 모델의 max_seq_length를 그대로 쓴다).
+    """
+
+    def __init__(self, name: str, model: "SentenceTransformer") -> None:
+        self.name = name
+        self.model = model
+        if settings.EMBEDDING_MAX_SEQ_LENGTH is not None:
+            self.model.max_seq_length = settings.EMBEDDING_MAX_SEQ_LENGTH
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is not None:
+            tokenizer.truncation_side = settings.EMBEDDING_TRUNCATION_SIDE
+
+    def _token_lengths(self, texts: List[str]) -> np.ndarray:
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is None:
+            # 토크나이저를 쓸 수 없으면 문자 수로 근사
+            return np.fromiter((len(text) for text in texts), dtype=np.int64)
+        encoded = tokenizer(
+            texts,
+            truncation=True,
+            max_length=self.model.max_seq_length,
+            return_length=True,
+            return_attention_mask=False,
+        )
+        return np.asarray(encoded["length"], dtype=np.int64)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        texts = list(texts)
+        dim = self.model.get_sentence_embedding_dimension()
+        result = np.empty((len(texts), dim), dtype=np.float32)
+        if not texts:
+            return result
+
+        lengths = self._token_lengths(texts)
+        order = np.argsort(lengths, kind="stable")
+        sorted_lengths = lengths[order].tolist()
+
+        for bucket in length_buckets(sorted_lengths, settings.EMBEDDING_ENCODE_BATCH_SIZE):
+            indices = order[bucket]
+            encoded = self.model.encode(
+                [texts[i] for i in indices],
+                batch_size=len(indices),
+                convert_to_numpy=True,
+            )
+            result[indices] = np.asarray(encoded, dtype=np.float32)
+        return result
+
+
+def _onnx_export_dir(model_name: str) -> Path:
+    return Path(settings.EMBEDDING_ONNX_DIR) / model_name.replace("/", "__")
+
+
+def _load_onnx_int8_model(model_name: str) -> "SentenceTransformer":
+    """동적 int8 양자화 ONNX 모델을 불러온다. 없으면 한 번 변환해 EMBEDDING_ONNX_DIR에 저장한다."""
+
+    from sentence_transformers import SentenceTransformer
+
+    config = settings.EMBEDDING_ONNX_QUANTIZATION
+    export_dir = _onnx_export_dir(model_name)
+    file_name = f"onnx/model_qint8_{config}.onnx"
+
+    if not (export_dir / file_name).exists():
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        print(f"Exporting dynamic int8 ONNX model to {export_dir}...")
+        base = SentenceTransformer(model_name, backend="onnx", trust_remote_code=True)
+        base.save(str(export_dir))
+        export_dynamic_quantized_onnx_model(
+            base, quantization_config=config, model_name_or_path=str(export_dir)
+        )
+
+    return SentenceTransformer(
+        str(export_dir),
+        backend="onnx",
+        trust_remote_code=True,
+        model_kwargs={"file_name": file_name},
+    )
+
+
+def load_embedding_backend(
+    backend: str = settings.EMBEDDING_BACKEND, model_name: str = MODEL_NAME
+) -> EmbeddingBackend:
+    """설정(EMBEDDING_BACKEND)에 맞는 임베딩 백엔드를 생성한다."""
+
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        model = SentenceTransformer(model_name, trust_remote_code=True)
+    elif backend == "onnx":
+        # 저장소에 ONNX 파일이 없으면 sentence-transformers가 자동으로 변환한다.
+        model = SentenceTransformer(model_name, backend="onnx", trust_remote_code=True)
+    elif backend == "onnx-int8":
+        model = _load_onnx_int8_model(model_name)
+    else:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+    return SentenceTransformerBackend(backend, model)
+
+
+def warmup_embedding_backend(backend: EmbeddingBackend) -> None:
+    """대표 길이의 텍스트를 여러 배치 크기로 인코딩해 첫 요청의 콜드 forward pass를 없앤다."""
+
+    for batch_size in (1, 8, 32):
+        texts = [_WARMUP_TEXTS[i % len(_WARMUP_TEXTS)] for i in range(batch_size)]
+        backend.encode(texts)
+
+
+class _EmbeddingModelHolder:
+    """
+    임베딩 모델을 첫 사용 시(또는 백그라운드에서) 한 번만 불러오고 준비 상태를 기록한다.
+    모듈 import만으로는 모델을 불러오지 않으므로 alembic, /docs 등은 로드 비용을 치르지 않는다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._done = Event()
+        self._backend: EmbeddingBackend | None = None
+        self._state = "idle"  # idle → loading → ready | failed
+        self._error: str | None = None
+        self._load_seconds: float | None = None
+        self._warmup_seconds: float | None = None
+
+    def get(self) -> EmbeddingBackend:
+        if not self._done.is_set():
+            self._load()
+        if self._backend is None:
+            raise RuntimeError(f"SBERT model is not loaded. ({self._error})")
+        return self._backend
+
+    def start_background_load(self) -> None:
+        if self._done.is_set() or self._state == "loading":
+            return
+        Thread(target=self._load, name="embedding-loader", daemon=True).start()
+
+    def _load(self) -> None:
+        with self._lock:
+            if self._done.is_set():
+                return
+            self._state = "loading"
+            print(f"Loading Embedding model: {MODEL_NAME} ({settings.EMBEDDING_BACKEND})...")
+            try:
+                started = time.perf_counter()
+                backend = load_embedding_backend()
+                self._load_seconds = time.perf_counter() - started
+                if settings.EMBEDDING_WARMUP:
+                    started = time.perf_counter()
+                    warmup_embedding_backend(backend)
+                    self._warmup_seconds = time.perf_counter() - started
+                self._backend = backend
+                self._state = "ready"
+                print(
+                    f"SBERT model loaded successfully. "
+                    f"(load {self._load_seconds:.1f}s, warmup {self._warmup_seconds or 0:.1f}s)"
+                )
+            except Exception as e:
+                print(f"Error loading SBERT model: {e}")
+                self._state = "failed"
+                self._error = str(e)
+            finally:
+                self._done.set()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "state": self._state,
+            "model": MODEL_NAME,
+            "backend": settings.EMBEDDING_BACKEND,
+            "load_seconds": self._load_seconds,
+            "warmup_seconds": self._warmup_seconds,
+            "error": self._error,
+        }
+
+
+_model_holder = _EmbeddingModelHolder()
+
+
+def get_embedding_model() -> EmbeddingBackend:
+    """
+    임베딩 백엔드를 반환한다. 아직 로드되지 않았다면 로드가 끝날 때까지 기다린다.
+    로드에 실패했다면 RuntimeError를 발생시킨다.
+    """
+
+    return _model_holder.get()
+
+
+def start_embedding_model_loading() -> None:
+    """서버 시작 시 모델 로드와 워밍업을 백그라운드로 시작한다."""
+
+    _model_holder.start_background_load()
+
+
+def embedding_model_status() -> Dict[str, Any]:
+    return _model_holder.status()
+
+
+__all__ = [
+    "EmbeddingBackend",
+    "length_buckets",
+    "embedding_model_status",
+    "get_embedding_model",
+    "load_embedding_backend",
+    "start_embedding_model_loading",
+    "warmup_embedding_backend",
+]
@@ -1,41 +1,419 @@
 from __future__ import annotations
 
-from collections import OrderedDict
-from threading import RLock
-from typing import Dict, Tuple
+import hashlib
+import sqlite3
+import time
+from dataclasses import dataclass
+from threading import RLock, local
+from typing import Dict, List, Sequence, Tuple
 
 import numpy as np
 
+from app.core.config import settings
+from app.services.v2.vector import QuantizationMode, dequantize_rows, quantize_rows
 
-class _LRUEmbeddingCache:
-    """Simple thread-safe LRU cache for sentence embeddings."""
+_ARENA_DTYPES = {"none": np.float32, "float16": np.float16, "int8": np.int8}
 
-    def __init__(self, max_items: int = 1024) -> None:
-        self._max_items = max_items
-        self._store: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+@dataclass
+class _CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class _ArenaEmbeddingCache:
+    """
+    미리 할당한 하나의 행렬(arena)에 임베딩을 모아 두는 프로세스 내 캐시 (L1).
+
+    키는 텍스트 전체 대신 64비트 해시만 보관하고(hash → slot 인덱스), 벡터는 arena의
+    행으로 저장해 항목마다 ndarray 객체를 만들지 않는다. 교체는 슬롯 단위 CLOCK 알고리즘.
+    `quantization`이 float16/int8이면 arena를 해당 자료형으로 두고(int8은 행별 스케일 포함)
+    조회 시 float32로 복원한다.
+    크기는 바이트 예산(`max_bytes`)으로 정하며, 슬롯 수는 첫 저장 시 임베딩 차원과 저장 자료형으로
+    계산한다. 같은 메모리에서 float16은 약 2배, int8은 약 4배의 항목을 담는다.
+    """
+
+    # 슬롯마다 arena 행 외에 드는 대략적인 비용: 해시 키(8) + 참조 비트(1) + 인덱스 dict 항목
+    _SLOT_OVERHEAD_BYTES = 8 + 1 + 100
+
+    def __init__(
+        self, max_bytes: int = 8 * 1024 * 1024, quantization: QuantizationMode = "none"
+    ) -> None:
+        self._max_bytes = max(0, max_bytes)
+        self._quantization = quantization
+        self._capacity = 0  # 첫 저장 시 차원을 알고 나서 결정
+        self._arena: np.ndarray | None = None  # 첫 저장 시 (capacity, dim)으로 할당
+        self._scales: np.ndarray | None = None  # int8 모드의 행별 스케일
+        self._slot_keys = np.zeros(0, dtype=np.uint64)
+        self._referenced = np.zeros(0, dtype=bool)
+        self._index: Dict[int, int] = {}
+        self._size = 0
+        self._hand = 0
         self._lock = RLock()
+        self._stats = _CacheStats()
+
+    def _slots_for(self, dim: int) -> int:
+        dtype = np.dtype(_ARENA_DTYPES[self._quantization])
+        slot_bytes = dim * dtype.itemsize + self._SLOT_OVERHEAD_BYTES
+        if self._quantization == "int8":
+            slot_bytes += np.dtype(np.float32).itemsize  # 행별 스케일
+        return max(1, self._max_bytes // slot_bytes)
+
+    @staticmethod
+    def _key(text: str) -> int:
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
 
     def get(self, key: str) -> np.ndarray | None:
+        """
+        float32 모드에서는 읽기 전용 view를 반환한다. 슬롯이 교체되면 내용이 바뀔 수 있으므로
+        오래 보관해야 한다면 호출 측에서 복사해야 한다. 양자화 모드에서는 복원한 사본을 반환한다.
+        """
+
         with self._lock:
-            value = self._store.get(key)
-            if value is None:
+            slot = self._index.get(self._key(key))
+            if slot is None or self._arena is None:
+                self._stats.misses += 1
                 return None
-            # Move to MRU position and return a copy to avoid accidental mutation
-            self._store.move_to_end(key)
-            return value.copy()
+            self._stats.hits += 1
+            self._referenced[slot] = True
+            if self._quantization != "none":
+                return self._dequantize([slot])[0]
+            view = self._arena[slot]
+            view.flags.writeable = False
+            return view
+
+    def gather_into(self, keys: Sequence[str], out: np.ndarray) -> List[int]:
+        """적중한 벡터를 `out`의 같은 행 위치에 바로 복사하고, 미스 인덱스를 반환한다."""
+
+        hashes = [self._key(key) for key in keys]
+        missing: List[int] = []
+        with self._lock:
+            if self._arena is None:
+                self._stats.misses += len(keys)
+                return list(range(len(keys)))
+
+            hit_rows: List[int] = []
+            hit_slots: List[int] = []
+            for row, hashed in enumerate(hashes):
+                slot = self._index.get(hashed)
+                if slot is None:
+                    missing.append(row)
+                else:
+                    hit_rows.append(row)
+                    hit_slots.append(slot)
+
+            if hit_slots:
+                out[hit_rows] = self._dequantize(hit_slots)
+                self._referenced[hit_slots] = True
+            self._stats.hits += len(hit_slots)
+            self._stats.misses += len(missing)
+        return missing
+
+    def _dequantize(self, slots: List[int]) -> np.ndarray:
+        assert self._arena is not None
+        scales = None if self._scales is None else self._scales[slots]
+        return dequantize_rows(self._arena[slots], scales)
 
     def set(self, key: str, value: np.ndarray) -> None:
+        vec = np.asarray(value, dtype=np.float32).reshape(-1)
+        quantized = quantize_rows(vec, self._quantization)
+        hashed = self._key(key)
+        with self._lock:
+            if self._arena is None:
+                self._capacity = self._slots_for(vec.size)
+                self._slot_keys = np.zeros(self._capacity, dtype=np.uint64)
+                self._referenced = np.zeros(self._capacity, dtype=bool)
+                self._arena = np.zeros(
+                    (self._capacity, vec.size), dtype=_ARENA_DTYPES[self._quantization]
+                )
+                if quantized.scale is not None:
+                    self._scales = np.ones(self._capacity, dtype=np.float32)
+            if vec.size != self._arena.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension mismatch: expected {self._arena.shape[1]}, got {vec.size}."
+                )
+
+            slot = self._index.get(hashed)
+            if slot is None:
+                slot = self._allocate_slot()
+                self._index[hashed] = slot
+                self._slot_keys[slot] = hashed
+            self._arena[slot] = quantized.data[0]
+            if self._scales is not None and quantized.scale is not None:
+                self._scales[slot] = quantized.scale[0]
+            self._referenced[slot] = True
+
+    def _allocate_slot(self) -> int:
+        if self._size < self._capacity:
+            slot = self._size
+            self._size += 1
+            return slot
+
+        # CLOCK: 최근 참조된 슬롯은 한 번 기회를 주고 지나간다.
+        while True:
+            slot = self._hand
+            self._hand = (self._hand + 1) % self._capacity
+            if self._referenced[slot]:
+                self._referenced[slot] = False
+                continue
+            self._index.pop(int(self._slot_keys[slot]), None)
+            self._stats.evictions += 1
+            return slot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index.clear()
+            self._referenced[:] = False
+            self._size = 0
+            self._hand = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            arena_bytes = 0 if self._arena is None else self._arena.nbytes
+            if self._scales is not None:
+                arena_bytes += self._scales.nbytes
+            return {
+                **self._stats.as_dict(),
+                "entries": len(self._index),
+                "capacity": self._capacity,
+                "bytes": arena_bytes,
+                "max_bytes": self._max_bytes,
+            }
+
+
+class _DiskEmbeddingCache:
+    """
+    SQLite(WAL) 파일에 임베딩을 저장하는 호스트 공유 캐시 (L2).
+
+    같은 호스트의 모든 uvicorn 워커가 하나의 파일을 읽고 쓰며, 프로세스 재시작 후에도 유지된다.
+    키는 `모델 이름 + 백엔드 + 텍스트`의 해시이므로 모델을 바꾸면 이전 벡터는 자연히 무시된다.
+    디스크 오류는 캐시 미스로 취급해 필터링 자체는 계속 동작하게 한다.
+    """
+
+    # 개수 확인(COUNT) 비용을 줄이기 위해 일정 횟수 쓰기마다 한 번씩만 용량을 점검
+    _EVICT_CHECK_INTERVAL = 512
+    _SQL_PARAM_CHUNK = 500
+
+    def __init__(self, path: str, namespace: str, max_items: int) -> None:
+        self._path = path
+        self._namespace = namespace
+        self._max_items = max_items
+        self._local = local()
+        self._lock = RLock()
+        self._stats = _CacheStats()
+        self._writes_since_check = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key BLOB PRIMARY KEY,"
+                " vector BLOB NOT NULL,"
+                " stored_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_embeddings_stored_at"
+                " ON embeddings (stored_at)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def _key(self, text: str) -> bytes:
+        payload = f"{self._namespace}\0{text}".encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def get_many(self, texts: Sequence[str]) -> List[np.ndarray | None]:
+        keys = [self._key(text) for text in texts]
+        found: Dict[bytes, np.ndarray] = {}
+
+        try:
+            conn = self._connection()
+            for start in range(0, len(keys), self._SQL_PARAM_CHUNK):
+                chunk = keys[start : start + self._SQL_PARAM_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).copy()
+        except sqlite3.Error as exc:
+            print(f"임베딩 디스크 캐시 조회 실패: {exc}")
+
+        results = [found.get(key) for key in keys]
+        hits = sum(1 for vec in results if vec is not None)
+        with self._lock:
+            self._stats.hits += hits
+            self._stats.misses += len(results) - hits
+        return results
+
+    def set_many(self, items: Sequence[Tuple[str, np.ndarray]]) -> None:
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (self._key(text), np.asarray(vec, dtype=np.float32).tobytes(), now)
+            for text, vec in items
+        ]
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, stored_at)"
+                    " VALUES (?, ?, ?)",
+                    rows,
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as exc:
+            print(f"임베딩 디스크 캐시 저장 실패: {exc}")
+            return
+
         with self._lock:
-            self._store[key] = value.astype(np.float32, copy=True)
-            self._store.move_to_end(key)
-            if len(self._store) > self._max_items:
-                self._store.popitem(last=False)
+            self._writes_since_check += len(rows)
+            if self._writes_since_check < self._EVICT_CHECK_INTERVAL:
+                return
+            self._writes_since_check = 0
+        self._evict_overflow()
+
+    def _evict_overflow(self) -> None:
+        """최대 개수를 넘으면 가장 오래 저장된 항목부터 지운다."""
+
+        try:
+            conn = self._connection()
+            (count,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            excess = count - self._max_items
+            if excess <= 0:
+                return
+            cursor = conn.execute(
+                "DELETE FROM embeddings WHERE key IN ("
+                " SELECT key FROM embeddings ORDER BY stored_at LIMIT ?)",
+                (excess,),
+            )
+            removed = max(cursor.rowcount, 0)
+        except sqlite3.Error as exc:
+            print(f"임베딩 디스크 캐시 정리 실패: {exc}")
+            return
+
+        with self._lock:
+            self._stats.evictions += removed
 
     def clear(self) -> None:
+        try:
+            self._connection().execute("DELETE FROM embeddings")
+        except sqlite3.Error as exc:
+            print(f"임베딩 디스크 캐시 삭제 실패: {exc}")
+
+    def stats(self) -> Dict[str, int]:
         with self._lock:
-            self._store.clear()
+            return self._stats.as_dict()
+
+
+class _TieredEmbeddingCache:
+    """프로세스 내 arena 캐시(L1) 뒤에 호스트 공유 디스크 캐시(L2)를 둔 2단 캐시."""
+
+    def __init__(
+        self, l1: _ArenaEmbeddingCache, l2: _DiskEmbeddingCache | None = None
+    ) -> None:
+        self._l1 = l1
+        self._l2 = l2
+
+    def get(self, key: str) -> np.ndarray | None:
+        value = self._l1.get(key)
+        if value is not None or self._l2 is None:
+            return value
+        value = self._l2.get_many([key])[0]
+        if value is not None:
+            self._l1.set(key, value)
+        return value
+
+    def set(self, key: str, value: np.ndarray) -> None:
+        self.set_many([(key, value)])
+
+    def gather_into(self, keys: Sequence[str], out: np.ndarray) -> List[int]:
+        """
+        캐시된 벡터를 `out[i]`에 채우고, 어느 계층에도 없는 행 인덱스를 반환한다.
+        L2 적중은 L1으로 승격한다.
+        """
+
+        missing = self._l1.gather_into(keys, out)
+        if self._l2 is None or not missing:
+            return missing
+
+        l2_values = self._l2.get_many([keys[idx] for idx in missing])
+        still_missing: List[int] = []
+        for idx, vec in zip(missing, l2_values):
+            if vec is None:
+                still_missing.append(idx)
+                continue
+            out[idx] = vec
+            self._l1.set(keys[idx], vec)
+        return still_missing
+
+    def set_many(self, items: Sequence[Tuple[str, np.ndarray]]) -> None:
+        for key, value in items:
+            self._l1.set(key, value)
+        if self._l2 is not None:
+            self._l2.set_many(items)
+
+    def clear(self) -> None:
+        self._l1.clear()
+        if self._l2 is not None:
+            self._l2.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        result = {"l1": self._l1.stats()}
+        if self._l2 is not None:
+            result["l2"] = self._l2.stats()
+        return result
+
+
+def _disk_cache_namespace() -> str:
+    """
+    디스크 캐시 키 공간. 같은 텍스트라도 벡터를 바꾸는 설정은 모두 포함한다:
+    백엔드(int8 등은 벡터가 미세하게 다름), 최대 토큰 길이와 잘라내는 방향(긴 텍스트의 벡터가 달라짐).
+    """
+
+    max_seq_length = settings.EMBEDDING_MAX_SEQ_LENGTH
+    return ":".join(
+        [
+            settings.SBERT_MODEL_NAME,
+            settings.EMBEDDING_BACKEND,
+            f"seq={'model' if max_seq_length is None else max_seq_length}",
+            f"trunc={settings.EMBEDDING_TRUNCATION_SIDE}",
+        ]
+    )
+
+
+def _build_disk_cache() -> _DiskEmbeddingCache | None:
+    if not settings.EMBEDDING_DISK_CACHE_PATH:
+        return None
+    return _DiskEmbeddingCache(
+        path=settings.EMBEDDING_DISK_CACHE_PATH,
+        namespace=_disk_cache_namespace(),
+        max_items=settings.EMBEDDING_DISK_CACHE_MAX_ITEMS,
+    )
 
 
-embedding_cache = _LRUEmbeddingCache(max_items=2048)
+embedding_cache = _TieredEmbeddingCache(
+    _ArenaEmbeddingCache(
+        max_bytes=settings.EMBEDDING_CACHE_MAX_BYTES,
+        quantization=settings.EMBEDDING_QUANTIZATION,
+    ),
+    _build_disk_cache(),
+)
 
 __all__ = ["embedding_cache"]
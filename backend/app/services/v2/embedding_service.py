@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.v2.batching import encode_texts
+from app.services.v2.embedding_cache import embedding_cache
+from app.services.v2.text import dedupe_canonical
+from app.services.v2.vector import dequantize_rows, quantize_rows
+from app.v2.models import EMBEDDING_DIM
+
+
+def embed_canonical_texts(texts: List[str]) -> np.ndarray:
+    """
+    이미 정규화·중복 제거된 텍스트의 임베딩을 캐시에서 조회하거나 필요한 부분만 새로 계산해
+    (텍스트 수, 임베딩 차원)의 정규화된 행렬로 반환한다.
+    모든 모델 호출(필터, 피드백, 카테고리 생성)이 이 함수를 거쳐 같은 캐시와 마이크로배처를 공유한다.
+    EMBEDDING_QUANTIZATION이 켜져 있으면 새로 인코딩한(또는 L2에서 읽은) 벡터도 L1에 저장되는 정밀도로
+    맞춰, 같은 텍스트의 첫 요청과 캐시 적중 요청의 점수가 같게 한다.
+    """
+
+    target = np.empty((len(texts), EMBEDDING_DIM), dtype=np.float32)
+
+    # L1(arena) → L2(호스트 공유 디스크) 순서로 적중 벡터를 target에 바로 채움
+    missing_indices = embedding_cache.gather_into(texts, target)
+
+    if missing_indices:
+        missing_texts = [texts[idx] for idx in missing_indices]
+        try:
+            # 동시 요청과 함께 묶어 한 번의 forward pass로 처리
+            encoded = np.asarray(encode_texts(missing_texts), dtype=np.float32)
+        except Exception as exc:
+            raise RuntimeError(f"SBERT 인코딩 실패: {exc}") from exc
+
+        if encoded.ndim == 1:
+            encoded = encoded.reshape(1, -1)
+        if encoded.shape != (len(missing_texts), EMBEDDING_DIM):
+            raise RuntimeError("임베딩 캐시 구성 중 누락된 벡터가 발생했습니다.")
+
+        target[missing_indices] = encoded
+        embedding_cache.set_many(list(zip(missing_texts, encoded)))
+
+    if settings.EMBEDDING_QUANTIZATION != "none":
+        # L1에서 읽은 행은 이미 양자화 격자 위에 있어 다시 거쳐도 값이 바뀌지 않는다.
+        quantized = quantize_rows(target, settings.EMBEDDING_QUANTIZATION)
+        target = dequantize_rows(quantized.data, quantized.scale)
+
+    norms = np.linalg.norm(target, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    target /= norms
+    return target
+
+
+def embed_texts(texts: Sequence[str]) -> np.ndarray:
+    """
+    임의의 텍스트 목록을 정규화(NFC, 공백 축약)·중복 제거한 뒤 임베딩해 입력 순서대로 돌려준다.
+    필터가 방금 임베딩한 텍스트라면 캐시에서 바로 가져오므로 추론 비용이 없다.
+    빈(공백뿐인) 텍스트는 ValueError.
+    """
+
+    unique_texts, positions = dedupe_canonical(texts)
+    if any(position is None for position in positions):
+        raise ValueError("빈 텍스트는 임베딩할 수 없습니다.")
+    if not positions:
+        return np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+    return embed_canonical_texts(unique_texts)[positions]
+
+
+__all__ = ["embed_canonical_texts", "embed_texts"]
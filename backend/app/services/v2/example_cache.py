@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.v2.text import canonicalize_text
+from app.services.v2.vector import deserialize_matrix, serialize_matrix
+from app.v2.models import CategoryExampleSet
+
+
+@dataclass(frozen=True)
+class CachedExampleSet:
+    sentences: List[str]
+    embeddings: np.ndarray  # 정규화된 (문장 수, EMBEDDING_DIM) 행렬
+
+
+def _enabled() -> bool:
+    return (
+        settings.CATEGORY_EXAMPLE_CACHE_TTL_SECONDS > 0
+        and settings.CATEGORY_EXAMPLE_CACHE_MAX_ENTRIES > 0
+    )
+
+
+def _normalized_keywords(keywords: List[str]) -> List[str]:
+    return sorted({canonicalize_text(k, casefold=True) for k in keywords} - {""})
+
+
+def example_set_key(name: str, keywords: List[str]) -> str:
+    """
+    대소문자·공백·유니코드 표기 차이와 키워드 순서/중복을 무시한 캐시 키.
+    임베딩 모델과 LLM 백엔드가 바뀌면 다른 키가 되어 이전 항목은 TTL/용량 제한으로 정리된다.
+    """
+
+    material = json.dumps(
+        [
+            f"{settings.SBERT_MODEL_NAME}:{settings.EMBEDDING_BACKEND}",
+            settings.CATEGORY_LLM_BACKEND,
+            canonicalize_text(name, casefold=True),
+            _normalized_keywords(keywords),
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def load_example_set(
+    db: Session, name: str, keywords: List[str]
+) -> CachedExampleSet | None:
+    """캐시에 있으면 예시 문장과 임베딩을 돌려준다 (LLM/모델 호출 생략). 실패는 캐시 미스로 처리."""
+
+    if not _enabled():
+        return None
+
+    key = example_set_key(name, keywords)
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(
+        seconds=settings.CATEGORY_EXAMPLE_CACHE_TTL_SECONDS
+    )
+    try:
+        entry = db.execute(
+            select(CategoryExampleSet).where(
+                CategoryExampleSet.key == key,
+                CategoryExampleSet.created_at >= cutoff,
+            )
+        ).scalar_one_or_none()
+        if entry is None:
+            return None
+
+        cached = CachedExampleSet(
+            sentences=json.loads(entry.sentences),
+            embeddings=deserialize_matrix(entry.embeddings),
+        )
+        entry.hits = CategoryExampleSet.hits + 1
+        entry.last_used_at = datetime.datetime.utcnow()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"예시 문장 캐시 조회 실패: {e}")
+        return None
+
+    print(f"예시 문장 캐시 적중: '{name}' ({len(cached.sentences)}문장)")
+    return cached
+
+
+def save_example_set(
+    db: Session,
+    name: str,
+    keywords: List[str],
+    sentences: List[str],
+    embeddings: np.ndarray,
+) -> None:
+    """새로 만든 예시 문장과 임베딩을 저장하고, 용량을 넘으면 가장 오래 쓰이지 않은 항목부터 지운다."""
+
+    if not _enabled():
+        return
+
+    key = example_set_key(name, keywords)
+    now = datetime.datetime.utcnow()
+    try:
+        # 만료된 같은 키 항목이 남아 있으면 새 결과로 교체
+        db.execute(delete(CategoryExampleSet).where(CategoryExampleSet.key == key))
+        db.add(
+            CategoryExampleSet(
+                key=key,
+                name=canonicalize_text(name, casefold=True),
+                keywords=json.dumps(_normalized_keywords(keywords), ensure_ascii=False),
+                sentences=json.dumps(sentences, ensure_ascii=False),
+                embeddings=serialize_matrix(embeddings),
+                created_at=now,
+                last_used_at=now,
+            )
+        )
+        db.commit()
+    except IntegrityError:
+        # 동시에 같은 카테고리를 만든 다른 요청이 먼저 저장함
+        db.rollback()
+        return
+    except Exception as e:
+        db.rollback()
+        print(f"예시 문장 캐시 저장 실패: {e}")
+        return
+
+    _prune(db)
+
+
+def _prune(db: Session) -> None:
+    limit = settings.CATEGORY_EXAMPLE_CACHE_MAX_ENTRIES
+    try:
+        count = db.execute(select(func.count()).select_from(CategoryExampleSet)).scalar_one()
+        if count <= limit:
+            return
+        stale_keys = (
+            select(CategoryExampleSet.key)
+            .order_by(CategoryExampleSet.last_used_at.asc())
+            .limit(count - limit)
+        )
+        db.execute(
+            delete(CategoryExampleSet).where(
+                CategoryExampleSet.key.in_(stale_keys.scalar_subquery())
+            )
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"예시 문장 캐시 정리 실패: {e}")
+
+
+__all__ = [
+    "CachedExampleSet",
+    "example_set_key",
+    "load_example_set",
+    "save_example_set",
+]
@@ -1,96 +1,288 @@
+from typing import Any, Dict, List, Sequence
+
 import numpy as np
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from fastapi import HTTPException
 
+from app.core.config import settings
+from app.db import SessionLocal
 from app.v2.models import Category, FeedbackLog
-from app.services.v2.embedding import sbert_model
-from app.services.v2.category_cache import invalidate_category_cache
+from app.services.v2.embedding_service import embed_texts
+from app.services.v2.feedback_writer import FeedbackEvent, FeedbackWriteBehind
+from app.services.v2.category_cache import (
+    bump_category_version,
+    patch_category_vectors,
+)
 from app.services.v2.vector import (
+    deserialize_matrix,
     deserialize_vector,
     normalize_vector,
+    serialize_matrix,
     serialize_vector,
 )
-from app.schemas.v2.feedback import FeedbackRequest, FeedbackResponse
+from app.schemas.v2.feedback import (
+    FeedbackBatchResponse,
+    FeedbackRequest,
+    FeedbackResponse,
+)
 
 # 2. 벡터 조정 가중치 (학습률)
 # 1.0에 가까울수록 새 피드백을 크게 반영 (0.05 = 5%)
 LEARNING_RATE = 0.05
 
+# 강화 피드백이 기존 프로토타입과 이 이상 비슷하면 새로 추가하지 않고 기존 것을 조정
+DUPLICATE_PROTOTYPE_SIMILARITY = 0.95
+
+
+def _adjust_vector(
+    current_vector: np.ndarray, feedback_vector: np.ndarray, feedback_type: str
+) -> np.ndarray:
+    """정규화된 벡터 하나를 피드백 방향으로 당기거나(reinforce) 밀어낸다(weaken)."""
+
+    if feedback_type == "reinforce":
+        # "reinforce": 대표 벡터를 피드백 벡터 쪽으로 '가깝게' 이동
+        # (1 - 0.05) * 현재벡터 + 0.05 * 피드백벡터
+        new_vector = (
+            1 - LEARNING_RATE
+        ) * current_vector + LEARNING_RATE * feedback_vector
+
+    elif feedback_type == "weaken":
+        # "weaken": 대표 벡터를 피드백 벡터의 '반대' 방향으로 '멀게' 이동
+        new_vector = current_vector - LEARNING_RATE * (feedback_vector - current_vector)
+
+    else:
+        raise ValueError(f"Unknown feedback type: {feedback_type}")
+
+    # 정규화하여 저장 안정성 확보
+    try:
+        return normalize_vector(new_vector)
+    except ValueError:
+        return current_vector
+
+
+def _adjust_prototypes(
+    prototypes: np.ndarray, feedback_vector: np.ndarray, feedback_type: str
+) -> np.ndarray:
+    """
+    카테고리 프로토타입 집합에 피드백을 반영한 새 행렬을 반환한다.
+    - reinforce: 상한(CATEGORY_MAX_PROTOTYPES) 미만이고 기존 프로토타입과 충분히 다르면 새 프로토타입으로 추가,
+      그렇지 않으면 가장 가까운 프로토타입을 피드백 쪽으로 당긴다.
+    - weaken: 피드백 텍스트와 가장 가까운(= 매칭을 일으킨) 프로토타입을 밀어낸다.
+    """
+
+    similarities = prototypes @ feedback_vector
+    nearest = int(np.argmax(similarities))
+
+    if (
+        feedback_type == "reinforce"
+        and prototypes.shape[0] < settings.CATEGORY_MAX_PROTOTYPES
+        and similarities[nearest] < DUPLICATE_PROTOTYPE_SIMILARITY
+    ):
+        return np.vstack([prototypes, feedback_vector.reshape(1, -1)])
+
+    updated = prototypes.copy()
+    updated[nearest] = _adjust_vector(prototypes[nearest], feedback_vector, feedback_type)
+    return updated
+
 
 def process_feedback(
     db: Session, user_id: int, req: FeedbackRequest
 ) -> FeedbackResponse:
+    """피드백 하나를 처리한다 (process_feedback_batch의 단건 버전)."""
+
+    return process_feedback_batch(db, user_id, [req]).results[0]
 
-    if sbert_model is None:
-        raise RuntimeError("SBERT model is not loaded.")
+
+def process_feedback_batch(
+    db: Session, user_id: int, items: Sequence[FeedbackRequest]
+) -> FeedbackBatchResponse:
+    """
+    여러 피드백을 요청 순서대로 한 번에 처리한다.
+    텍스트는 한 번의 encode로 벡터화하고, 카테고리 조회/로그 삽입/커밋/캐시 무효화도 각각 한 번만 수행한다.
+    하나라도 내 카테고리가 아니면 아무것도 반영하지 않고 404를 반환한다.
+    FEEDBACK_WRITE_BEHIND가 켜져 있으면 로그만 저장하고 카테고리 갱신은 feedback_writer가 모아서 반영한다.
+    """
+
+    items = list(items)
+    if not items:
+        return FeedbackBatchResponse(message="No feedback to process.", results=[])
 
     # --- 1. 카테고리 조회 (DB에서) ---
     # 반드시 user_id와 category_id를 함께 조회하여 소유권 확인!
-    category = (
-        db.query(Category)
-        .filter(Category.id == req.category_id, Category.user_id == user_id)
-        .first()
-    )
+    category_ids = {item.category_id for item in items}
+    owned_ids = {
+        row.id
+        for row in db.query(Category.id).filter(
+            Category.id.in_(category_ids), Category.user_id == user_id
+        )
+    }
 
-    if not category:
+    if owned_ids != category_ids:
         # 내 카테고리가 아니거나 존재하지 않으면 404
         raise HTTPException(
             status_code=404, detail="Category not found or access denied."
         )
 
-    # --- 2. 피드백 텍스트 벡터화 ---
+    # --- 2. 피드백 텍스트 일괄 벡터화 ---
+    # 필터가 방금 임베딩한 텍스트는 공유 캐시에서 바로 가져온다 (추론 없음).
     try:
-        feedback_vector_raw = sbert_model.encode(req.text_content)
-        feedback_vector = normalize_vector(feedback_vector_raw)
+        feedback_vectors = embed_texts([item.text_content for item in items])
     except Exception as e:
         raise RuntimeError(f"SBERT encoding failed: {e}")
 
-    # --- 3. 벡터 미세 조정 (핵심 로직) ---
-    current_vector = deserialize_vector(category.embedding)
-
-    if req.feedback_type == "reinforce":
-        # "reinforce": 대표 벡터를 피드백 벡터 쪽으로 '가깝게' 이동
-        # (1 - 0.05) * 현재벡터 + 0.05 * 피드백벡터
-        new_vector = (
-            1 - LEARNING_RATE
-        ) * current_vector + LEARNING_RATE * feedback_vector
+    events = [
+        FeedbackEvent(
+            category_id=item.category_id,
+            vector=feedback_vector,
+            feedback_type=item.feedback_type,
+        )
+        for item, feedback_vector in zip(items, feedback_vectors)
+    ]
+    log_rows = [
+        {
+            "user_id": user_id,
+            "text_content": item.text_content,
+            "text_embedding": feedback_vector.tolist(),
+            "feedback_type": item.feedback_type,
+            "category_id": item.category_id,
+        }
+        for item, feedback_vector in zip(items, feedback_vectors)
+    ]
 
-    elif req.feedback_type == "weaken":
-        # "weaken": 대표 벡터를 피드백 벡터의 '반대' 방향으로 '멀게' 이동
-        new_vector = current_vector - LEARNING_RATE * (feedback_vector - current_vector)
+    if settings.FEEDBACK_WRITE_BEHIND:
+        # 로그만 바로 저장하고, 카테고리 벡터 갱신은 모아서 나중에 한 번에 반영
+        try:
+            log_ids = _insert_feedback_logs(db, log_rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise RuntimeError(f"Feedback DB update failed: {e}")
+        feedback_writer.submit(user_id, events)
+        item_message = "Feedback recorded; category update queued."
+    else:
+        # 로그 저장과 카테고리 업데이트를 하나의 트랜잭션으로 처리
+        log_ids = _commit_feedback(db, user_id, events, log_rows)
+        item_message = "Feedback processed and category updated."
 
-    # 정규화하여 저장 안정성 확보
-    try:
-        normalized_new_vector = normalize_vector(new_vector)
-    except ValueError:
-        normalized_new_vector = current_vector
-
-    # --- 4. 피드백 로그 기록 (DB에) ---
-    new_log = FeedbackLog(
-        user_id=user_id,
-        text_content=req.text_content,
-        text_embedding=np.asarray(feedback_vector_raw, dtype=np.float32).tolist(),
-        feedback_type=req.feedback_type,
-        category_id=req.category_id,
+    # --- 6. 결과 반환 ---
+    return FeedbackBatchResponse(
+        message=f"{len(items)} feedback item(s) processed.",
+        results=[
+            FeedbackResponse(
+                message=item_message,
+                category_id=item.category_id,
+                new_log_id=log_id,
+            )
+            for item, log_id in zip(items, log_ids)
+        ],
     )
-    db.add(new_log)
 
-    # --- 5. 카테고리 대표 벡터 업데이트 (DB에) ---
-    category.embedding = serialize_vector(normalized_new_vector)
 
-    try:
-        # 로그 저장과 카테고리 업데이트를 하나의 트랜잭션으로 처리
-        db.commit()
-        db.refresh(new_log)  # new_log.id 값을 가져오기 위해 refresh
-    except Exception as e:
-        db.rollback()
-        raise RuntimeError(f"Feedback DB update failed: {e}")
-    else:
-        invalidate_category_cache(user_id)
+def _insert_feedback_logs(db: Session, log_rows: List[Dict[str, Any]]) -> List[int]:
+    """피드백 로그를 한 번의 INSERT ... RETURNING으로 기록하고 ID를 입력 순서대로 반환한다."""
 
-    # --- 6. 결과 반환 ---
-    return FeedbackResponse(
-        message="Feedback processed and category updated.",
-        category_id=category.id,
-        new_log_id=new_log.id,
+    return list(
+        db.execute(
+            insert(FeedbackLog).returning(FeedbackLog.id, sort_by_parameter_order=True),
+            log_rows,
+        ).scalars()
     )
+
+
+def _apply_events(
+    categories: Dict[int, Category], events: Sequence[FeedbackEvent]
+) -> Dict[int, np.ndarray]:
+    """
+    카테고리별로 이벤트를 도착 순서대로 누적 적용해 ORM 객체의 대표 벡터/프로토타입을 바꾼다.
+    반환값: 카테고리별 새 프로토타입 행렬 (캐시 패치용)
+    """
+
+    centroids: Dict[int, np.ndarray] = {}
+    prototypes: Dict[int, np.ndarray] = {}
+    for event in events:
+        category_id = event.category_id
+        if category_id not in centroids:
+            category = categories[category_id]
+            centroids[category_id] = deserialize_vector(category.embedding)
+            prototypes[category_id] = (
+                deserialize_matrix(category.prototypes)
+                if category.prototypes is not None
+                else centroids[category_id].reshape(1, -1)
+            )
+        centroids[category_id] = _adjust_vector(
+            centroids[category_id], event.vector, event.feedback_type
+        )
+        prototypes[category_id] = _adjust_prototypes(
+            prototypes[category_id], event.vector, event.feedback_type
+        )
+
+    for category_id, centroid in centroids.items():
+        category = categories[category_id]
+        category.embedding = serialize_vector(centroid)
+        category.prototypes = serialize_matrix(prototypes[category_id])
+    return prototypes
+
+
+def _commit_feedback(
+    db: Session,
+    user_id: int,
+    events: Sequence[FeedbackEvent],
+    log_rows: List[Dict[str, Any]] | None = None,
+) -> List[int]:
+    """
+    카테고리를 읽어 피드백을 적용하고 (있으면) 로그와 함께 커밋한다.
+    categories.version 낙관적 동시성 검사(UPDATE ... WHERE version = 읽은 값)에 걸리면
+    다시 읽어서 FEEDBACK_OCC_RETRIES번까지 재시도하므로 동시 피드백이 서로를 덮어쓰지 않는다.
+    """
+
+    category_ids = {event.category_id for event in events}
+    for _ in range(max(1, settings.FEEDBACK_OCC_RETRIES)):
+        try:
+            categories: Dict[int, Category] = {
+                category.id: category
+                for category in db.query(Category)
+                .filter(Category.id.in_(category_ids), Category.user_id == user_id)
+                .populate_existing()
+            }
+            # write-behind 반영 전에 삭제된 카테고리의 이벤트는 버린다.
+            kept = [event for event in events if event.category_id in categories]
+
+            # --- 4. 피드백 로그 일괄 기록 (DB에) ---
+            log_ids = _insert_feedback_logs(db, log_rows) if log_rows else []
+            # --- 5. 카테고리 대표 벡터 및 프로토타입 업데이트 (DB에) ---
+            prototypes = _apply_events(categories, kept)
+            new_version = bump_category_version(db, user_id)
+            db.commit()
+        except StaleDataError:
+            # 다른 요청/워커가 먼저 카테고리를 갱신함: 최신 값으로 다시 적용
+            db.rollback()
+            continue
+        except Exception as e:
+            db.rollback()
+            raise RuntimeError(f"Feedback DB update failed: {e}")
+
+        # 캐시 전체를 버리지 않고 바뀐 카테고리 구간만 교체 (직전 버전 캐시일 때만; 아니면 무효화)
+        patch_category_vectors(user_id, new_version, prototypes)
+        return log_ids
+
+    raise RuntimeError("Feedback DB update failed: too many concurrent category updates.")
+
+
+def _flush_feedback_events(user_id: int, events: List[FeedbackEvent]) -> None:
+    with SessionLocal() as db:
+        _commit_feedback(db, user_id, events)
+
+
+feedback_writer = FeedbackWriteBehind(
+    _flush_feedback_events,
+    flush_interval_ms=settings.FEEDBACK_FLUSH_INTERVAL_MS,
+    max_events=settings.FEEDBACK_FLUSH_MAX_EVENTS,
+)
+
+
+def flush_feedback_writes() -> None:
+    """대기 중인 write-behind 갱신을 즉시 반영한다 (서버 종료 시)."""
+
+    feedback_writer.flush()
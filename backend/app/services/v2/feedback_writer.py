@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from threading import Condition, Lock, Thread
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class FeedbackEvent:
+    """카테고리 벡터에 적용할 피드백 하나 (정규화된 텍스트 벡터 + 유형)."""
+
+    category_id: int
+    vector: np.ndarray
+    feedback_type: str
+
+
+# (user_id, 해당 사용자의 이벤트 목록 — 도착 순서) → DB 반영
+FlushFn = Callable[[int, List[FeedbackEvent]], None]
+
+
+class FeedbackWriteBehind:
+    """
+    피드백에 따른 카테고리 벡터 갱신을 메모리에 모았다가 한꺼번에 DB에 쓴다 (write-behind).
+
+    첫 이벤트 이후 `flush_interval_ms`가 지나거나 대기 이벤트가 `max_events`에 도달하면,
+    사용자별로 이벤트를 도착 순서대로 묶어 `flush_fn`에 넘긴다. 같은 카테고리에 대한 여러 피드백이
+    하나의 UPDATE로 합쳐져 행 잠금 경합과 쓰기 횟수가 줄어든다.
+
+    반영에 실패한 사용자의 이벤트는 버리지 않고 그 사용자의 새 이벤트보다 앞에 되돌려 놓은 뒤
+    지수 백오프(`retry_base_ms` ~ `retry_max_ms`, jitter)로 다시 시도한다.
+    (삭제된 카테고리의 이벤트를 버리는 것은 `flush_fn`의 몫)
+    """
+
+    def __init__(
+        self,
+        flush_fn: FlushFn,
+        flush_interval_ms: float = 200.0,
+        max_events: int = 64,
+        retry_base_ms: float = 200.0,
+        retry_max_ms: float = 30_000.0,
+    ) -> None:
+        self._flush_fn = flush_fn
+        self._interval = max(0.0, flush_interval_ms) / 1000.0
+        self._max_events = max(1, max_events)
+        self._pending: Dict[int, List[FeedbackEvent]] = {}
+        self._pending_count = 0
+        self._first_pending_at: float | None = None
+        # 반영 실패 후 재시도 대기 중인 사용자: 다음 시도 시각, 연속 실패 횟수
+        self._retry_at: Dict[int, float] = {}
+        self._attempts: Dict[int, int] = {}
+        self._retry_base = max(0.0, retry_base_ms) / 1000.0
+        self._retry_max = max(self._retry_base, retry_max_ms / 1000.0)
+        self._condition = Condition()
+        self._flush_lock = Lock()  # 백그라운드 flush와 종료 시 flush가 겹치지 않도록
+        self._worker: Thread | None = None
+        self._stats = {
+            "events": 0,
+            "flushes": 0,
+            "category_updates": 0,
+            "flush_errors": 0,
+            "requeued_events": 0,
+        }
+
+    def submit(self, user_id: int, events: List[FeedbackEvent]) -> None:
+        if not events:
+            return
+        self._ensure_worker()
+        with self._condition:
+            self._pending.setdefault(user_id, []).extend(events)
+            self._pending_count += len(events)
+            self._stats["events"] += len(events)
+            if self._first_pending_at is None:
+                self._first_pending_at = time.monotonic()
+            if self._pending_count >= self._max_events:
+                self._condition.notify()
+
+    def flush(self, attempts: int = 3) -> None:
+        """
+        대기 중인 갱신을 지금 바로 DB에 쓴다 (서버 종료 시 호출).
+        재시도 대기 중인 이벤트도 포함하며, 실패하면 최대 `attempts`번까지 백오프 후 다시 시도한다.
+        """
+
+        for attempt in range(max(1, attempts)):
+            with self._condition:
+                batch = self._take_ready(force=True)
+            self._write(batch)
+            with self._condition:
+                if not self._pending:
+                    return
+                delay = min(self._retry_max, self._retry_base * (2**attempt))
+            time.sleep(delay)
+
+        with self._condition:
+            remaining = self._pending_count
+        print(f"피드백 write-behind: 종료 시 반영하지 못한 이벤트 {remaining}개")
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._condition:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = Thread(
+                target=self._run, name="feedback-write-behind", daemon=True
+            )
+            self._worker.start()
+
+    def _is_ready(self, user_id: int, now: float) -> bool:
+        return self._retry_at.get(user_id, 0.0) <= now
+
+    def _next_flush_at(self, now: float) -> float | None:
+        """다음에 반영을 시작할 시각 (대기 이벤트가 없으면 None). `_condition` 안에서 호출."""
+
+        ready_count = sum(
+            len(events)
+            for user_id, events in self._pending.items()
+            if self._is_ready(user_id, now)
+        )
+        if ready_count >= self._max_events:
+            return now
+        candidates = [
+            self._retry_at[user_id] for user_id in self._pending if user_id in self._retry_at
+        ]
+        if ready_count and self._first_pending_at is not None:
+            candidates.append(self._first_pending_at + self._interval)
+        return min(candidates) if candidates else None
+
+    def _take_ready(self, force: bool = False) -> Dict[int, List[FeedbackEvent]]:
+        """재시도 대기(백오프) 중이 아닌 사용자의 이벤트를 꺼낸다. `force`면 모두 꺼낸다."""
+
+        now = time.monotonic()
+        batch = {
+            user_id: events
+            for user_id, events in self._pending.items()
+            if force or self._is_ready(user_id, now)
+        }
+        for user_id in batch:
+            del self._pending[user_id]
+        self._pending_count -= sum(len(events) for events in batch.values())
+        self._first_pending_at = None
+        return batch
+
+    def _requeue(self, user_id: int, events: List[FeedbackEvent]) -> None:
+        """실패한 이벤트를 같은 사용자의 새 이벤트보다 앞에 되돌리고 백오프 후 재시도를 예약한다."""
+
+        with self._condition:
+            attempts = self._attempts.get(user_id, 0) + 1
+            self._attempts[user_id] = attempts
+            delay = min(self._retry_max, self._retry_base * (2 ** (attempts - 1)))
+            self._retry_at[user_id] = time.monotonic() + random.uniform(delay / 2, delay)
+            self._pending[user_id] = events + self._pending.get(user_id, [])
+            self._pending_count += len(events)
+            self._stats["requeued_events"] += len(events)
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    now = time.monotonic()
+                    flush_at = self._next_flush_at(now)
+                    if flush_at is None:
+                        self._condition.wait()
+                        continue
+                    if flush_at <= now:
+                        break
+                    self._condition.wait(timeout=flush_at - now)
+                batch = self._take_ready()
+            self._write(batch)
+
+    def _write(self, batch: Dict[int, List[FeedbackEvent]]) -> None:
+        if not batch:
+            return
+        with self._flush_lock:
+            for user_id, events in batch.items():
+                try:
+                    self._flush_fn(user_id, events)
+                except Exception as e:
+                    # 피드백 로그는 이미 저장되어 있으므로 벡터 갱신만 나중에 다시 시도한다.
+                    self._stats["flush_errors"] += 1
+                    print(f"피드백 write-behind 반영 실패, 재시도 예약 (user {user_id}): {e}")
+                    self._requeue(user_id, events)
+                    continue
+                with self._condition:
+                    self._retry_at.pop(user_id, None)
+                    self._attempts.pop(user_id, None)
+                self._stats["category_updates"] += len(
+                    {event.category_id for event in events}
+                )
+            self._stats["flushes"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            pending = self._pending_count
+            retrying_users = len(self._retry_at)
+        return {"pending": pending, "retrying_users": retrying_users, **self._stats}
+
+
+__all__ = ["FeedbackEvent", "FeedbackWriteBehind"]
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List, Set, Tuple
+
+from app.core.config import settings
+from app.db import SessionLocal
+from app.schemas.v1.filter import Content, Option
+from app.schemas.v1.filter import FilterRequest as LLMFilterRequest
+from app.schemas.v2.filter import (
+    FilterResponse,
+    HybridFilterRequest,
+    HybridFilterResponse,
+    HybridFilterResult,
+)
+from app.services.v1.filter import detectCategory
+from app.services.v2.inference import run_inference
+from app.services.v2.similarity import similarity
+
+
+def _score_with_lazy_session(
+    user_id: int, req: HybridFilterRequest, floor: float
+) -> FilterResponse:
+    with SessionLocal() as db:
+        return similarity(
+            db=db,
+            user_id=user_id,
+            texts_to_check=req.texts,
+            threshold=floor,
+            long_text_mode=req.long_text_mode,
+            pooling=req.pooling,
+        )
+
+
+async def cascade_filter(
+    user_id: int, req: HybridFilterRequest
+) -> HybridFilterResponse:
+    """
+    임베딩 점수로 먼저 판정하고, 최고 점수가 임계값 주변 여유 구간에 든 애매한 텍스트만
+    한 번의 v1(LLM) 호출로 넘긴다.
+    - 최고 점수 ≥ 임계값 + upper_margin: 필터링 (임베딩)
+    - 최고 점수 < 임계값 - lower_margin: 통과 (임베딩)
+    - 그 사이: LLM이 텍스트의 후보 카테고리(여유 구간 안의 카테고리) 중 하나 이상을 고르면 필터링 (고른 카테고리 모두 매칭)
+    후보 카테고리 조합이 같은 텍스트끼리 묶어 조합마다 v1 호출을 한 번씩 (병렬로) 보낸다.
+    텍스트마다 자기 후보만 물어보므로 판정 캐시 키도 텍스트와 후보 조합에만 의존한다.
+    """
+
+    upper = (
+        settings.HYBRID_UPPER_MARGIN if req.upper_margin is None else req.upper_margin
+    )
+    lower = (
+        settings.HYBRID_LOWER_MARGIN if req.lower_margin is None else req.lower_margin
+    )
+    floor = max(0.0, req.threshold - lower)
+    ceiling = req.threshold + upper
+
+    # 하한(floor)으로 점수를 계산해 여유 구간 안의 후보 카테고리까지 받아 온다.
+    scored = await run_inference(_score_with_lazy_session, user_id, req, floor)
+    results = scored.results
+
+    # matched_categories는 점수 내림차순이므로 첫 항목이 최고 점수
+    ambiguous = [
+        idx
+        for idx, result in enumerate(results)
+        if result.matched_categories
+        and result.matched_categories[0].similarity < ceiling
+    ]
+    if len(ambiguous) > settings.HYBRID_MAX_ESCALATIONS:
+        # 예산을 넘으면 임계값에 가장 가까운(판단이 가장 어려운) 텍스트부터 넘김
+        ambiguous.sort(
+            key=lambda idx: abs(
+                results[idx].matched_categories[0].similarity - req.threshold
+            )
+        )
+        ambiguous = sorted(ambiguous[: max(0, settings.HYBRID_MAX_ESCALATIONS)])
+
+    groups: Dict[Tuple[str, ...], List[int]] = {}
+    for idx in ambiguous:
+        candidates = tuple(sorted({m.name for m in results[idx].matched_categories}))
+        groups.setdefault(candidates, []).append(idx)
+
+    async def detect_group(candidates: Tuple[str, ...], indices: List[int]):
+        llm_req = LLMFilterRequest(
+            contents=[Content(idx=idx, text=results[idx].text) for idx in indices],
+            option=Option(categories=list(candidates), strength=req.strength),
+        )
+        # v1 경로(판정 캐시 + 요청 분할)를 그대로 사용
+        return await detectCategory(llm_req)
+
+    verdicts: Dict[int, Set[str]] = {}
+    llm_fallback = False
+    if groups:
+        responses = await asyncio.gather(
+            *(
+                detect_group(candidates, indices)
+                for candidates, indices in groups.items()
+            ),
+            return_exceptions=True,
+        )
+        for indices, llm_resp in zip(groups.values(), responses):
+            if isinstance(llm_resp, BaseException):
+                # 실패한 묶음의 텍스트만 임베딩 점수(임계값)로 판정
+                print(f"하이브리드 필터 LLM 판정 실패, 임베딩 점수로 대체: {llm_resp}")
+                llm_fallback = True
+                continue
+            verdicts.update({idx: set() for idx in indices})
+            for detected in llm_resp.detectedContents:
+                if detected.idx in verdicts:
+                    verdicts[detected.idx].add(detected.category)
+
+    hybrid_results: List[HybridFilterResult] = []
+    for idx, result in enumerate(results):
+        if idx in verdicts:
+            # 여유 구간 밖의 카테고리는 임베딩 단계에서 이미 아니라고 판정된 것으로 본다.
+            matched = [
+                match
+                for match in result.matched_categories
+                if match.name in verdicts[idx]
+            ]
+            escalated = True
+        else:
+            matched = [
+                match
+                for match in result.matched_categories
+                if match.similarity >= req.threshold
+            ]
+            escalated = False
+        hybrid_results.append(
+            HybridFilterResult(
+                text=result.text,
+                should_filter=bool(matched),
+                matched_categories=matched,
+                escalated=escalated,
+            )
+        )
+
+    return HybridFilterResponse(
+        results=hybrid_results, escalated=len(verdicts), llm_fallback=llm_fallback
+    )
+
+
+__all__ = ["cascade_filter"]
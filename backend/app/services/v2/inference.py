@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore
+from typing import Any, Callable, TypeVar
+
+from anyio import to_thread
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class ExecutorBusyError(RuntimeError):
+    """전용 스레드 풀의 대기열이 가득 차 요청을 즉시 거절할 때 사용하는 에러."""
+
+
+class InferenceBusyError(ExecutorBusyError):
+    """추론 대기열이 가득 차 요청을 즉시 거절할 때 사용하는 에러."""
+
+
+class BoundedExecutor:
+    """
+    실행 중 + 대기 중 작업 수에 상한이 있는 전용 스레드 풀.
+    상한을 넘으면 큐에 쌓지 않고 `busy_error`를 바로 발생시켜 호출 측이 503으로 돌려줄 수 있게 한다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int,
+        thread_name_prefix: str,
+        busy_error: type[ExecutorBusyError],
+        busy_message: str,
+    ) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=thread_name_prefix,
+        )
+        self._slots = BoundedSemaphore(max_workers + max_queue)
+        self._busy_error = busy_error
+        self._busy_message = busy_message
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """동기 함수를 이 풀에서 실행하고 결과를 기다린다."""
+
+        if not self._slots.acquire(blocking=False):
+            raise self._busy_error(self._busy_message)
+
+        try:
+            future = self._executor.submit(functools.partial(func, *args, **kwargs))
+        except Exception:
+            self._slots.release()
+            raise
+
+        # 클라이언트가 연결을 끊어도 스레드 작업은 계속되므로, 작업이 끝날 때 슬롯을 반환한다.
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 필터링(임베딩 + 점수 계산) 전용 스레드 풀.
+# Starlette 기본 스레드 풀과 분리해, 필터 요청이 몰려도 auth/category 엔드포인트가
+# 스레드를 기다리지 않도록 한다. 실제 모델 호출은 마이크로배처 스레드에서 직렬로 수행되므로
+# 이 풀의 워커는 주로 캐시 조회, 배치 대기, 점수 계산을 담당한다.
+_inference_pool = BoundedExecutor(
+    max_workers=settings.INFERENCE_MAX_WORKERS,
+    max_queue=settings.INFERENCE_MAX_QUEUE,
+    thread_name_prefix="inference",
+    busy_error=InferenceBusyError,
+    busy_message="추론 요청이 너무 많습니다. 잠시 후 다시 시도해 주세요.",
+)
+
+
+async def run_inference(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """동기 추론 함수를 전용 스레드 풀에서 실행하고 결과를 기다린다."""
+
+    return await _inference_pool.run(func, *args, **kwargs)
+
+
+def configure_io_threadpool() -> None:
+    """동기 엔드포인트가 사용하는 기본 스레드 풀 크기를 설정한다 (이벤트 루프 안에서 호출)."""
+
+    to_thread.current_default_thread_limiter().total_tokens = (
+        settings.IO_THREADPOOL_SIZE
+    )
+
+
+def shutdown_inference_executor() -> None:
+    _inference_pool.shutdown()
+
+
+__all__ = [
+    "BoundedExecutor",
+    "ExecutorBusyError",
+    "InferenceBusyError",
+    "configure_io_threadpool",
+    "run_inference",
+    "shutdown_inference_executor",
+]
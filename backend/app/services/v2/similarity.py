@@ -1,20 +1,26 @@
 import numpy as np
 from sqlalchemy.orm import Session
-from typing import List, Sequence, Tuple
+from typing import Dict, List, Sequence, Tuple
 
-from app.services.v2.embedding import sbert_model  # 로드된 SBERT 모델
-from app.services.v2.embedding_cache import embedding_cache
+from app.core.config import settings
+from app.services.v2.embedding_service import embed_canonical_texts
 from app.services.v2.category_cache import (
+    CategoryLoadResult,
     CategoryVectorMeta,
-    get_cached_category_vectors,
-    set_cached_category_vectors,
+    load_category_vectors,
+)
+from app.services.v2.text import dedupe_canonical, split_into_windows
+from app.services.v2.vector import (
+    QuantizedMatrix,
+    deserialize_matrix,
+    deserialize_vector,
 )
-from app.services.v2.vector import deserialize_vector
 from app.v2.models import Category  # SQLAlchemy Category 모델
 from app.schemas.v2.filter import (
     FilterResponse,
     FilterResult,
     MatchedCategoryInfo,
+    MatchedSpan,
 )
 
 
@@ -23,73 +29,65 @@ def similarity(
     user_id: int,
     texts_to_check: Sequence[str],
     threshold: float,
+    long_text_mode: bool = False,
+    pooling: str = "max",
 ) -> FilterResponse:
     """
     SBERT로 텍스트를 임베딩한 뒤, 사용자 카테고리 벡터와의 코사인 유사도를
     NumPy 연산으로 계산해 필터 여부를 판단한다.
     한 요청에서 사용자 카테고리를 한 번만 읽고, 메모리 내에서 일괄 계산해
     DB 왕복과 pgvector 함수 호출 횟수를 크게 줄인다.
-    """
 
-    if sbert_model is None:
-        raise RuntimeError("SBERT model is not loaded.")
+    long_text_mode에서는 각 텍스트를 문장 단위 구간으로 나눠 모든 구간을 한 번에 임베딩하고,
+    구간 점수를 `pooling`(max/mean)으로 합친 뒤 가장 높은 점수를 낸 구간을 함께 돌려준다.
+    """
 
     texts: List[str] = list(texts_to_check)
     if not texts:
         return FilterResponse(results=[])
 
-    texts_to_encode: List[str] = [text for text in texts if text]
-    if not texts_to_encode:
-        return FilterResponse(
-            results=[
-                FilterResult(
-                    text=text or "",
-                    should_filter=False,
-                    matched_categories=[],
-                )
-                for text in texts
-            ]
-        )
+    # 각 텍스트를 하나 이상의 구간으로 나눈다 (일반 모드에서는 텍스트 전체가 한 구간).
+    spans_per_text = [_text_windows(text or "", long_text_mode) for text in texts]
+    window_texts = [
+        (text or "")[start:end]
+        for text, spans in zip(texts, spans_per_text)
+        for start, end in spans
+    ]
 
-    # --- 1. 입력 텍스트 벡터화 ---
-    vector_list = _get_cached_embeddings(texts_to_encode)
+    # 정규화(NFC, 공백 축약, 선택적 case folding) 후 요청 내 중복 제거:
+    # 고유 구간마다 한 번만 임베딩/점수 계산하고 원래 위치로 펼친다.
+    unique_texts, unique_positions = dedupe_canonical(window_texts)
+    if not unique_texts:
+        return _pass_all(texts)
+
+    # --- 1. 입력 텍스트(구간) 벡터화 ---
+    target_matrix = embed_canonical_texts(unique_texts)
 
     # --- 2. 사용자 카테고리 벡터 선로드 ---
-    cached = get_cached_category_vectors(user_id)
-    if cached is not None:
-        category_vectors, category_meta = cached
-    else:
-        category_vectors, category_meta = _load_user_category_vectors(db, user_id)
-        if category_vectors is None or category_meta is None:
-            # 카테고리가 없으면 모두 통과
-            return FilterResponse(
-                results=[
-                    FilterResult(
-                        text=text,
-                        should_filter=False,
-                        matched_categories=[],
-                    )
-                    for text in texts
-                ]
-            )
-        set_cached_category_vectors(user_id, category_vectors, category_meta)
+    # 동시 미스는 한 번의 DB 적재를 공유한다 (single-flight)
+    category_vectors = load_category_vectors(db, user_id, _load_user_category_vectors)
+    if category_vectors is None:
+        # 카테고리가 없으면 모두 통과
+        return _pass_all(texts)
+    category_meta = category_vectors.meta
 
     # --- 3. 벡터 연산을 일괄 수행 ---
-    target_matrix = np.stack(vector_list)  # shape: (텍스트 수, 임베딩 차원)
-    score_matrix = _compute_batch_cosine_scores(category_vectors, target_matrix)
-
-    vector_index_map: List[int | None] = []
-    encode_idx = 0
-    for text in texts:
-        if text:
-            vector_index_map.append(encode_idx)
-            encode_idx += 1
-        else:
-            vector_index_map.append(None)
+    # 모든 프로토타입과 한 번의 GEMM: (고유 구간 수, 프로토타입 수)
+    prototype_scores = _compute_batch_cosine_scores(category_vectors.matrix, target_matrix)
+    # 카테고리별 최댓값: (고유 구간 수, 카테고리 수)
+    score_matrix, prototype_matrix = _max_pool_by_category(
+        prototype_scores, category_vectors.offsets
+    )
 
+    matches_cache: Dict[Tuple, List[MatchedCategoryInfo]] = {}
     results: List[FilterResult] = []
-    for text, vector_idx in zip(texts, vector_index_map):
-        if vector_idx is None:
+    offset = 0
+    for text, spans in zip(texts, spans_per_text):
+        positions = unique_positions[offset : offset + len(spans)]
+        offset += len(spans)
+
+        kept = [(span, idx) for span, idx in zip(spans, positions) if idx is not None]
+        if not kept:
             results.append(
                 FilterResult(
                     text=text or "",
@@ -99,8 +97,21 @@ def similarity(
             )
             continue
 
-        scores = score_matrix[vector_idx]
-        matched = _build_matches(category_meta, scores, threshold)
+        # 같은 구간 구성(중복 텍스트)이면 매칭 결과를 재사용.
+        # long_text_mode의 결과에는 구간 위치(span)가 들어가므로 위치까지 같아야 재사용한다.
+        rows = [idx for _, idx in kept]
+        key = (tuple(rows), tuple(span for span, _ in kept) if long_text_mode else None)
+        matched = matches_cache.get(key)
+        if matched is None:
+            matched = _build_matches(
+                category_meta,
+                score_matrix[rows],
+                threshold,
+                pooling=pooling,
+                spans=[span for span, _ in kept] if long_text_mode else None,
+                window_prototypes=prototype_matrix[rows],
+            )
+            matches_cache[key] = matched
 
         results.append(
             FilterResult(
@@ -113,59 +124,33 @@ def similarity(
     return FilterResponse(results=results)
 
 
-def _get_cached_embeddings(texts: List[str]) -> List[np.ndarray]:
-    """SBERT 임베딩을 캐시에서 조회하거나 필요한 부분만 새로 계산한다."""
-
-    cached_entries: List[Tuple[int, np.ndarray]] = []
-    missing_indices: List[int] = []
-    missing_texts: List[str] = []
-
-    for idx, text in enumerate(texts):
-        cached = embedding_cache.get(text)
-        if cached is not None:
-            cached_entries.append((idx, cached))
-        else:
-            missing_indices.append(idx)
-            missing_texts.append(text)
-
-    vectors: List[np.ndarray | None] = [None] * len(texts)
-    for idx, vec in cached_entries:
-        vectors[idx] = vec
-
-    if missing_texts:
-        try:
-            encoded = sbert_model.encode(missing_texts)
-        except Exception as exc:
-            raise RuntimeError(f"SBERT 인코딩 실패: {exc}") from exc
-
-        encoded_list: List[np.ndarray]
-        if isinstance(encoded, np.ndarray):
-            if encoded.ndim == 1:
-                encoded_list = [encoded]
-            else:
-                encoded_list = [row for row in encoded]
-        else:
-            encoded_list = [np.asarray(vec) for vec in encoded]  # type: ignore[arg-type]
+def _text_windows(text: str, long_text_mode: bool) -> List[Tuple[int, int]]:
+    if not long_text_mode:
+        return [(0, len(text))]
+    return split_into_windows(text, settings.LONG_TEXT_WINDOW_CHARS)
 
-        for position, vec in zip(missing_indices, encoded_list):
-            arr = np.asarray(vec, dtype=np.float32)
-            vectors[position] = arr
-            embedding_cache.set(texts[position], arr)
 
-    normalized: List[np.ndarray] = []
-    for vec in vectors:
-        if vec is None:
-            raise RuntimeError("임베딩 캐시 구성 중 누락된 벡터가 발생했습니다.")
-        norm = np.linalg.norm(vec)
-        normalized.append(vec if norm == 0 else vec / norm)
+def _pass_all(texts: List[str]) -> FilterResponse:
+    """모든 텍스트를 필터링하지 않는 응답을 만든다."""
 
-    return normalized
+    return FilterResponse(
+        results=[
+            FilterResult(
+                text=text or "",
+                should_filter=False,
+                matched_categories=[],
+            )
+            for text in texts
+        ]
+    )
 
 
-def _load_user_category_vectors(
-    db: Session, user_id: int
-) -> Tuple[np.ndarray | None, List[CategoryVectorMeta] | None]:
-    """사용자 카테고리를 한 번에 불러와 정규화된 행렬로 반환한다."""
+def _load_user_category_vectors(db: Session, user_id: int) -> CategoryLoadResult:
+    """
+    사용자 카테고리의 프로토타입을 한 번에 불러와 하나의 정규화된 행렬로 묶는다.
+    반환값: (프로토타입 행렬, 카테고리별 시작 행 offsets, 카테고리 메타)
+    프로토타입이 없는 카테고리는 대표 벡터 하나를 프로토타입으로 사용한다.
+    """
 
     categories: List[Category] = (
         db.query(Category)
@@ -174,19 +159,26 @@ def _load_user_category_vectors(
     )
 
     if not categories:
-        return None, None
+        return None, None, None
 
-    vectors: List[np.ndarray] = []
+    blocks: List[np.ndarray] = []
+    offsets: List[int] = []
     kept_meta: List[CategoryVectorMeta] = []
+    total_rows = 0
 
     for category in categories:
-        if category.embedding is None:
-            continue
         try:
-            vec = deserialize_vector(category.embedding)
+            if category.prototypes is not None:
+                block = deserialize_matrix(category.prototypes)
+            elif category.embedding is not None:
+                block = deserialize_vector(category.embedding).reshape(1, -1)
+            else:
+                continue
         except ValueError:
             continue
-        vectors.append(vec)
+        blocks.append(block)
+        offsets.append(total_rows)
+        total_rows += block.shape[0]
         kept_meta.append(
             CategoryVectorMeta(
                 id=category.id,
@@ -194,42 +186,100 @@ def _load_user_category_vectors(
             )
         )
 
-    if not vectors:
-        return None, None
+    if not blocks:
+        return None, None, None
 
-    return np.stack(vectors), kept_meta
+    return np.concatenate(blocks, axis=0), np.asarray(offsets, dtype=np.intp), kept_meta
 
 
 def _compute_batch_cosine_scores(
-    category_matrix: np.ndarray, targets: np.ndarray
+    category_matrix: QuantizedMatrix, targets: np.ndarray
 ) -> np.ndarray:
-    """여러 텍스트와 사용자 카테고리 벡터 간 코사인 유사도 행렬을 구한다."""
+    """
+    여러 텍스트와 사용자 카테고리 벡터 간 코사인 유사도 행렬을 구한다.
+    float16/int8 카테고리 행렬은 float32로 올려 GEMM을 수행하고, int8은 열마다 스케일을 곱한다.
+    """
 
-    # category_matrix: (카테고리 수, dim)
+    # category_matrix.data: (프로토타입 수, dim)
     # targets: (텍스트 수, dim)
     if targets.ndim == 1:
         targets = targets.reshape(1, -1)
 
-    return targets @ category_matrix.T
+    data = category_matrix.data
+    if data.dtype != np.float32:
+        data = data.astype(np.float32)
+    scores = targets @ data.T
+    if category_matrix.scale is not None:
+        scores *= category_matrix.scale
+    return scores
+
+
+def _max_pool_by_category(
+    prototype_scores: np.ndarray, offsets: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (텍스트 수, 프로토타입 수) 점수를 카테고리 구간별 최댓값으로 줄인다.
+    반환값: (텍스트 수, 카테고리 수) 점수와, 각 최댓값을 낸 카테고리 내 프로토타입 번호
+    """
+
+    category_scores = np.maximum.reduceat(prototype_scores, offsets, axis=1)
+
+    # 구간 최댓값과 같은 첫 프로토타입 위치를 구간별 최솟값 reduce로 찾는다.
+    segment_ids = np.repeat(
+        np.arange(len(offsets)), np.diff(np.append(offsets, prototype_scores.shape[1]))
+    )
+    is_best = prototype_scores >= category_scores[:, segment_ids]
+    columns = np.where(is_best, np.arange(prototype_scores.shape[1]), np.iinfo(np.intp).max)
+    best_prototypes = np.minimum.reduceat(columns, offsets, axis=1) - offsets
+    return category_scores, best_prototypes
 
 
 def _build_matches(
     categories: List[CategoryVectorMeta],
-    scores: np.ndarray,
+    window_scores: np.ndarray,
     threshold: float,
+    pooling: str = "max",
+    spans: List[Tuple[int, int]] | None = None,
+    window_prototypes: np.ndarray | None = None,
 ) -> List[MatchedCategoryInfo]:
-    """임계값 이상인 카테고리만 추려 정렬된 매칭 결과를 만든다."""
+    """
+    구간별 점수 (구간 수, 카테고리 수)를 텍스트 점수로 합친 뒤
+    임계값 이상인 카테고리만 추려 정렬된 매칭 결과를 만든다.
+    `window_prototypes`가 있으면 가장 높은 구간에서 매칭된 프로토타입 번호를 함께 보고한다.
+    """
+
+    if window_scores.ndim == 1:
+        window_scores = window_scores.reshape(1, -1)
+    if window_prototypes is not None and window_prototypes.ndim == 1:
+        window_prototypes = window_prototypes.reshape(1, -1)
+
+    if pooling == "mean":
+        scores = window_scores.mean(axis=0)
+    else:
+        scores = window_scores.max(axis=0)
+    best_windows = window_scores.argmax(axis=0)
 
     matched: List[MatchedCategoryInfo] = []
-    for category, score in zip(categories, scores):
+    for category_idx, (category, score, best_window) in enumerate(
+        zip(categories, scores, best_windows)
+    ):
         similarity_score = float(score)
         if similarity_score < threshold:
             continue
+        prototype_index = None
+        if window_prototypes is not None:
+            prototype_index = int(window_prototypes[best_window, category_idx])
+        span = None
+        if spans is not None:
+            start, end = spans[int(best_window)]
+            span = MatchedSpan(start=start, end=end)
         matched.append(
             MatchedCategoryInfo(
                 id=category.id,
                 name=category.name,
                 similarity=similarity_score,
+                span=span,
+                prototype_index=prototype_index,
             )
         )
 
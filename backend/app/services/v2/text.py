@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+import zlib
+from typing import Dict, List, Sequence, Tuple
+
+from app.core.config import settings
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# 문장 = 종결 부호/줄바꿈이 아닌 문자열 + 뒤따르는 종결 부호
+_SENTENCE_RE = re.compile(r"[^.!?。！？\n]+[.!?。！？]*")
+# 내용 기반 구간 경계: 문장 해시가 이 값으로 나누어떨어지면 그 문장에서 구간을 끝낸다 (평균 4문장)
+_BOUNDARY_MODULUS = 4
+
+
+def canonicalize_text(text: str, casefold: bool | None = None) -> str:
+    """
+    임베딩/캐시 키로 사용할 정규형 텍스트를 만든다.
+    Unicode NFC 정규화 → 연속 공백을 한 칸으로 축약 → 앞뒤 공백 제거 → (선택) case folding
+    """
+
+    if casefold is None:
+        casefold = settings.EMBEDDING_CASEFOLD
+
+    normalized = unicodedata.normalize("NFC", text)
+    normalized = _WHITESPACE_RE.sub(" ", normalized).strip()
+    return normalized.casefold() if casefold else normalized
+
+
+def dedupe_canonical(texts: Sequence[str | None]) -> Tuple[List[str], List[int | None]]:
+    """
+    텍스트를 정규화한 뒤 중복을 제거한다.
+    반환값: (고유 정규형 텍스트 목록, 원래 위치별 고유 텍스트 인덱스 — 빈 텍스트는 None)
+    """
+
+    unique_index: Dict[str, int] = {}
+    positions: List[int | None] = []
+    for text in texts:
+        canonical = canonicalize_text(text) if text else ""
+        if not canonical:
+            positions.append(None)
+            continue
+        positions.append(unique_index.setdefault(canonical, len(unique_index)))
+    return list(unique_index), positions
+
+
+def split_into_windows(text: str, max_chars: int) -> List[Tuple[int, int]]:
+    """
+    긴 텍스트를 문장 경계 기준으로 최대 `max_chars` 글자의 구간 (start, end) 목록으로 나눈다.
+    연속된 문장을 한 구간에 모으고, 한 문장이 `max_chars`보다 길면 글자 수 기준으로 자른다.
+
+    구간은 앞에서부터 꽉 채우지 않고 문장 내용의 해시로 정한 경계에서 끝낸다 (content-defined chunking).
+    그래서 앞부분에 문장이 추가/삭제되어도 다음 경계 이후의 구간은 그대로여서 임베딩 캐시에 적중한다.
+    """
+
+    if len(text) <= max_chars:
+        return [(0, len(text))]
+
+    windows: List[Tuple[int, int]] = []
+    window_start: int | None = None
+    window_end = 0
+    for match in _SENTENCE_RE.finditer(text):
+        for piece_start in range(match.start(), match.end(), max_chars):
+            piece_end = min(piece_start + max_chars, match.end())
+            if window_start is not None and piece_end - window_start > max_chars:
+                windows.append((window_start, window_end))
+                window_start = None
+            if window_start is None:
+                window_start = piece_start
+            window_end = piece_end
+        if window_start is not None and _is_boundary(text[match.start() : match.end()]):
+            windows.append((window_start, window_end))
+            window_start = None
+
+    if window_start is not None:
+        windows.append((window_start, window_end))
+
+    # 구간 앞뒤 공백은 보고용 offset에서 제외
+    trimmed = []
+    for start, end in windows:
+        segment = text[start:end]
+        stripped = segment.strip()
+        if not stripped:
+            continue
+        start += len(segment) - len(segment.lstrip())
+        trimmed.append((start, start + len(stripped)))
+    return trimmed or [(0, len(text))]
+
+
+def _is_boundary(sentence: str) -> bool:
+    # 프로세스마다 달라지는 hash() 대신 crc32로 워커/재시작 간에도 같은 경계를 만든다.
+    digest = zlib.crc32(canonicalize_text(sentence).encode("utf-8"))
+    return digest % _BOUNDARY_MODULUS == 0
+
+
+__all__ = ["canonicalize_text", "dedupe_canonical", "split_into_windows"]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Iterable
+from dataclasses import dataclass
+from typing import Iterable, Literal
 
 import numpy as np
 
@@ -48,3 +49,77 @@ def deserialize_vector(blob: bytes | bytearray | memoryview) -> np.ndarray:
             f"Embedding blob size mismatch: expected {EMBEDDING_DIM}, got {arr.size}."
         )
     return np.array(arr, copy=True)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    arr = np.asarray(matrix, dtype=np.float32)
+    if arr.ndim == 1:
+        arr = arr.reshape(1, -1)
+    norms = np.linalg.norm(arr, axis=1, keepdims=True)
+    if np.any(norms == 0):
+        raise ValueError("Cannot normalize zero vector.")
+    return arr / norms
+
+
+def serialize_matrix(matrix: np.ndarray) -> bytes:
+    """(행 수, EMBEDDING_DIM) 행렬을 float32 바이트열로 직렬화한다."""
+
+    arr = np.asarray(matrix, dtype=np.float32)
+    if arr.ndim != 2 or arr.shape[1] != EMBEDDING_DIM:
+        raise ValueError(
+            f"Embedding matrix shape mismatch: expected (n, {EMBEDDING_DIM}), got {arr.shape}."
+        )
+    return np.ascontiguousarray(arr).tobytes()
+
+
+def deserialize_matrix(blob: bytes | bytearray | memoryview) -> np.ndarray:
+    if blob is None:
+        raise ValueError("Embedding blob is None.")
+    arr = np.frombuffer(memoryview(blob), dtype=np.float32)
+    if arr.size == 0 or arr.size % EMBEDDING_DIM != 0:
+        raise ValueError(
+            f"Embedding matrix blob size mismatch: {arr.size} is not a multiple of {EMBEDDING_DIM}."
+        )
+    return arr.reshape(-1, EMBEDDING_DIM).copy()
+
+
+QuantizationMode = Literal["none", "float16", "int8"]
+
+_INT8_MAX = 127.0
+
+
+@dataclass(frozen=True)
+class QuantizedMatrix:
+    """행 단위로 양자화된 벡터 행렬. int8이면 행마다 float32 스케일을 함께 보관한다."""
+
+    data: np.ndarray
+    scale: np.ndarray | None = None
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + (0 if self.scale is None else self.scale.nbytes)
+
+
+def quantize_rows(matrix: np.ndarray, mode: QuantizationMode) -> QuantizedMatrix:
+    arr = np.asarray(matrix, dtype=np.float32)
+    if arr.ndim == 1:
+        arr = arr.reshape(1, -1)
+
+    if mode == "none":
+        return QuantizedMatrix(data=arr)
+    if mode == "float16":
+        return QuantizedMatrix(data=arr.astype(np.float16))
+    if mode == "int8":
+        # 대칭 양자화: 행별 최대 절댓값을 127에 맞춘다.
+        scale = np.abs(arr).max(axis=1) / _INT8_MAX
+        scale[scale == 0] = 1.0
+        data = np.clip(np.rint(arr / scale[:, None]), -_INT8_MAX, _INT8_MAX)
+        return QuantizedMatrix(data=data.astype(np.int8), scale=scale.astype(np.float32))
+    raise ValueError(f"Unknown quantization mode: {mode}")
+
+
+def dequantize_rows(data: np.ndarray, scale: np.ndarray | None = None) -> np.ndarray:
+    arr = np.asarray(data, dtype=np.float32)
+    if scale is None:
+        return arr
+    return arr * np.asarray(scale, dtype=np.float32).reshape(-1, 1)
@@ -21,6 +21,8 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50), unique=True, nullable=False)
     password_hash = Column(String(128), nullable=False)
+    # 카테고리가 바뀔 때마다 증가하는 버전 (워커 간 카테고리 캐시 무효화/재검증용)
+    category_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(TIMESTAMP(timezone=True), default=datetime.datetime.utcnow)
 
     categories = relationship("Category", back_populates="owner")
@@ -35,11 +37,17 @@ class Category(Base):
     name = Column(String(100), nullable=False)
     description = Column(Text)
     embedding = Column(LargeBinary)  # 정규화된 float32 벡터를 직렬화하여 저장
+    # 프로토타입 벡터들 (예시 문장 + 강화 피드백): 정규화된 (k, EMBEDDING_DIM) float32 행렬 직렬화
+    prototypes = Column(LargeBinary)
+    # 낙관적 동시성 제어용 버전: ORM UPDATE마다 WHERE version = 읽은 값 검사 후 1 증가
+    version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(TIMESTAMP(timezone=True), default=datetime.datetime.utcnow)
 
     owner = relationship("User", back_populates="categories")
     feedback_logs = relationship("FeedbackLog", back_populates="category")
 
+    __mapper_args__ = {"version_id_col": version}
+
 
 class Whitelist(Base):
     __tablename__ = "whitelists"
@@ -66,3 +74,41 @@ class FeedbackLog(Base):
 
     owner = relationship("User", back_populates="feedback_logs")
     category = relationship("Category", back_populates="feedback_logs")
+
+
+class CategoryJob(Base):
+    """비동기 카테고리 생성 작업 (POST /api/v2/category/jobs)."""
+
+    __tablename__ = "category_jobs"
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    name = Column(String(100), nullable=False)
+    description = Column(Text)
+    keywords = Column(Text, nullable=False)  # JSON 배열 문자열
+    # pending → generating → embedding → succeeded | failed
+    status = Column(String(16), nullable=False, default="pending")
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="SET NULL"))
+    error = Column(Text)
+    created_at = Column(TIMESTAMP(timezone=True), default=datetime.datetime.utcnow)
+    updated_at = Column(
+        TIMESTAMP(timezone=True),
+        default=datetime.datetime.utcnow,
+        onupdate=datetime.datetime.utcnow,
+    )
+
+
+class CategoryExampleSet(Base):
+    """LLM이 만든 카테고리 예시 문장과 그 임베딩 캐시 (사용자 간 공유)."""
+
+    __tablename__ = "category_example_sets"
+    # sha256(임베딩 모델, LLM 백엔드, 정규화된 이름, 정렬된 키워드)
+    key = Column(String(64), primary_key=True)
+    name = Column(String(100), nullable=False)
+    keywords = Column(Text, nullable=False)  # 정규화·정렬된 키워드 JSON 배열 문자열
+    sentences = Column(Text, nullable=False)  # 예시 문장 JSON 배열 문자열
+    embeddings = Column(LargeBinary, nullable=False)  # 정규화된 (문장 수, EMBEDDING_DIM) float32 행렬
+    hits = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(TIMESTAMP(timezone=True), default=datetime.datetime.utcnow)
+    last_used_at = Column(
+        TIMESTAMP(timezone=True), default=datetime.datetime.utcnow, index=True
+    )
@@ -0,0 +1,91 @@
+"""
+임베딩 백엔드 정합성(parity) 검사 및 처리량 비교.
+
+torch 백엔드를 기준으로 각 백엔드의 임베딩 코사인 유사도가 기준값(기본 0.99) 이상인지 확인하고
+텍스트/초 처리량을 비교한다. 정합성 기준을 만족하지 못하면 종료 코드 1을 반환한다.
+
+    uv sync --extra onnx
+    uv run python -m benchmarks.bench_embedding_backends --backends onnx onnx-int8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://bench@localhost/bench")
+os.environ.setdefault("SBERT_MODEL_NAME", "dragonkue/BGE-m3-ko")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+SAMPLE_TEXTS = [
+    "답글",
+    "더보기",
+    "로그인",
+    "오늘의 주요 뉴스",
+    "결승전 결과 스포일러 주의: 마지막 세트에서 역전패",
+    "이 후보는 이번 선거에서 반드시 떨어져야 합니다.",
+    "외모로 사람을 평가하는 댓글은 삼가 주세요.",
+    "새로 나온 노트북 리뷰: 배터리는 오래가지만 발열이 아쉽다.",
+    "Click here to subscribe to our newsletter.",
+    "The quarterly earnings report exceeded analyst expectations by a wide margin.",
+    " ".join(["긴 본문 문단입니다. 여러 문장이 이어지며 주제가 점점 바뀝니다."] * 20),
+]
+
+
+def _corpus(repeat: int) -> List[str]:
+    return [f"{text} ({i})" for i in range(repeat) for text in SAMPLE_TEXTS]
+
+
+def _throughput(backend, texts: List[str]) -> float:
+    backend.encode(texts[:8])  # warmup
+    start = time.perf_counter()
+    backend.encode(texts)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def _cosine_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--backends", nargs="+", default=["onnx", "onnx-int8"],
+        choices=["torch", "onnx", "onnx-int8"],
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--min-cosine", type=float, default=0.99)
+    args = parser.parse_args()
+
+    from app.services.v2.embedding import load_embedding_backend
+
+    texts = _corpus(args.repeat)
+    reference_backend = load_embedding_backend("torch")
+    reference = reference_backend.encode(texts)
+    print(f"{'torch':>10}: {_throughput(reference_backend, texts):8.1f} texts/s (reference)")
+
+    failed = False
+    for name in args.backends:
+        backend = load_embedding_backend(name)
+        cosine = _cosine_rows(reference, backend.encode(texts))
+        ok = float(cosine.min()) >= args.min_cosine
+        failed |= not ok
+        print(
+            f"{name:>10}: {_throughput(backend, texts):8.1f} texts/s | "
+            f"cosine min {cosine.min():.4f} mean {cosine.mean():.4f} | "
+            f"{'OK' if ok else 'FAIL'}"
+        )
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
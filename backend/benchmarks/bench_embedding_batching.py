@@ -0,0 +1,125 @@
+"""
+임베딩 마이크로배칭 벤치마크.
+
+동시에 여러 클라이언트(브라우저 탭)가 50개씩 텍스트를 보내는 상황을 흉내 내고,
+배처 사용 여부에 따른 처리량과 p50/p99 지연 시간을 비교한다.
+
+    uv run python -m benchmarks.bench_embedding_batching --clients 40 --requests 5
+    uv run python -m benchmarks.bench_embedding_batching --real   # 실제 SBERT 모델 사용
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+import numpy as np
+
+# 설정 로딩에 필요한 필수 값 (실제 서비스 연결은 하지 않음)
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://bench@localhost/bench")
+os.environ.setdefault("SBERT_MODEL_NAME", "dragonkue/BGE-m3-ko")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+
+def _synthetic_encoder(
+    call_overhead_ms: float, per_text_ms: float, dim: int
+) -> Callable[[List[str]], np.ndarray]:
+    """
+    CPU를 모두 쓰는 forward pass를 흉내 낸다.
+    호출마다 고정 비용이 있고, 동시에 하나의 forward pass만 코어를 점유할 수 있다.
+    """
+
+    device_lock = threading.Lock()
+
+    def encode(texts: List[str]) -> np.ndarray:
+        with device_lock:
+            time.sleep((call_overhead_ms + per_text_ms * len(texts)) / 1000.0)
+        return np.ones((len(texts), dim), dtype=np.float32)
+
+    return encode
+
+
+def _real_encoder() -> Callable[[List[str]], np.ndarray]:
+    from app.services.v2.embedding import get_embedding_model
+
+    model = get_embedding_model()
+    return lambda texts: model.encode(texts)
+
+
+def _run(
+    encode: Callable[[List[str]], np.ndarray],
+    clients: int,
+    requests_per_client: int,
+    texts_per_request: int,
+) -> dict:
+    latencies: List[float] = []
+    latency_lock = threading.Lock()
+
+    def client(client_id: int) -> None:
+        for req_id in range(requests_per_client):
+            texts = [
+                f"client {client_id} request {req_id} text {i}"
+                for i in range(texts_per_request)
+            ]
+            start = time.perf_counter()
+            encode(texts)
+            elapsed = time.perf_counter() - start
+            with latency_lock:
+                latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(client, range(clients)))
+    wall = time.perf_counter() - started
+
+    total_texts = clients * requests_per_client * texts_per_request
+    latencies.sort()
+    p99_index = min(len(latencies) - 1, int(len(latencies) * 0.99))
+    return {
+        "throughput": total_texts / wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[p99_index] * 1000,
+        "wall_s": wall,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=40)
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--texts", type=int, default=50)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--call-overhead-ms", type=float, default=15.0)
+    parser.add_argument("--per-text-ms", type=float, default=0.4)
+    parser.add_argument("--real", action="store_true", help="실제 SBERT 모델 사용")
+    args = parser.parse_args()
+
+    from app.services.v2.batching import EmbeddingBatcher
+
+    if args.real:
+        encoder = _real_encoder()
+    else:
+        encoder = _synthetic_encoder(args.call_overhead_ms, args.per_text_ms, 1024)
+
+    batcher = EmbeddingBatcher(
+        encoder, max_batch_size=args.max_batch, max_wait_ms=args.max_wait_ms
+    )
+
+    for label, encode in (("direct", encoder), ("batched", batcher.encode)):
+        result = _run(encode, args.clients, args.requests, args.texts)
+        print(
+            f"{label:>8}: {result['throughput']:9.1f} texts/s | "
+            f"p50 {result['p50_ms']:8.1f} ms | p99 {result['p99_ms']:8.1f} ms | "
+            f"wall {result['wall_s']:.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
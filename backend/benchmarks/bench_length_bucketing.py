@@ -0,0 +1,116 @@
+"""
+길이 버킷 인코딩 벤치마크 (웹 페이지 혼합 길이 코퍼스).
+
+버튼 라벨, 헤드라인, 댓글, 본문 문단이 섞인 코퍼스를 만들어
+도착 순서대로 배치를 나누는 방식과 토큰 길이순 버킷 방식을 비교한다.
+
+기본 모드는 모델 없이 패딩 토큰 수(= forward pass 비용 근사)를 비교하고,
+--real 옵션은 실제 임베딩 백엔드로 처리량을 측정한다.
+
+    uv run python -m benchmarks.bench_length_bucketing
+    uv run python -m benchmarks.bench_length_bucketing --real --texts 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import List
+
+import numpy as np
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://bench@localhost/bench")
+os.environ.setdefault("SBERT_MODEL_NAME", "dragonkue/BGE-m3-ko")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+_WORDS = (
+    "오늘 뉴스 경기 결과 선수 정치 후보 선거 댓글 사진 영상 리뷰 제품 가격 배송 "
+    "정말 너무 진짜 완전 별로 최고 추천 구독 좋아요 공유 더보기 답글 신고 로그인"
+).split()
+
+# (비율, 최소 단어 수, 최대 단어 수): 라벨 / 헤드라인 / 댓글 / 본문 문단
+_MIX = [(0.40, 1, 2), (0.30, 4, 10), (0.25, 15, 60), (0.05, 200, 400)]
+
+
+def web_page_corpus(n_texts: int, seed: int = 0) -> List[str]:
+    rng = np.random.default_rng(seed)
+    weights = np.array([ratio for ratio, _, _ in _MIX])
+    kinds = rng.choice(len(_MIX), size=n_texts, p=weights / weights.sum())
+    texts = []
+    for idx, kind in enumerate(kinds):
+        _, low, high = _MIX[kind]
+        words = rng.choice(_WORDS, size=int(rng.integers(low, high + 1)))
+        texts.append(" ".join(words) + f" {idx}")
+    return texts
+
+
+def _padded_tokens(lengths: np.ndarray, batches: List[np.ndarray]) -> int:
+    return int(sum(len(batch) * lengths[batch].max() for batch in batches))
+
+
+def _synthetic(texts: List[str], batch_size: int, max_seq_length: int) -> None:
+    from app.services.v2.embedding import length_buckets
+
+    # 한국어 단어당 약 2토큰으로 근사 + 특수 토큰 2개
+    lengths = np.array(
+        [min(max_seq_length, 2 * len(t.split()) + 2) for t in texts], dtype=np.int64
+    )
+    useful = int(lengths.sum())
+
+    arrival = [
+        np.arange(start, min(start + batch_size, len(texts)))
+        for start in range(0, len(texts), batch_size)
+    ]
+    order = np.argsort(lengths, kind="stable")
+    bucketed = [
+        order[bucket] for bucket in length_buckets(lengths[order].tolist(), batch_size)
+    ]
+
+    for label, batches in (("arrival", arrival), ("bucketed", bucketed)):
+        padded = _padded_tokens(lengths, batches)
+        print(
+            f"{label:>9}: {len(batches):5d} batches | padded tokens {padded:9d} | "
+            f"efficiency {useful / padded:.1%}"
+        )
+
+
+def _real(texts: List[str], batch_size: int) -> None:
+    from app.services.v2.embedding import load_embedding_backend
+
+    backend = load_embedding_backend()
+    backend.encode(texts[:32])  # warmup
+
+    start = time.perf_counter()
+    for offset in range(0, len(texts), batch_size):
+        chunk = texts[offset : offset + batch_size]
+        backend.model.encode(chunk, batch_size=len(chunk), convert_to_numpy=True)
+    arrival = time.perf_counter() - start
+
+    start = time.perf_counter()
+    backend.encode(texts)
+    bucketed = time.perf_counter() - start
+
+    for label, elapsed in (("arrival", arrival), ("bucketed", bucketed)):
+        print(f"{label:>9}: {len(texts) / elapsed:8.1f} texts/s ({elapsed:.2f}s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-seq-length", type=int, default=512)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--real", action="store_true", help="실제 임베딩 백엔드로 처리량 측정")
+    args = parser.parse_args()
+
+    texts = web_page_corpus(args.texts, args.seed)
+    if args.real:
+        _real(texts, args.batch_size)
+    else:
+        _synthetic(texts, args.batch_size, args.max_seq_length)
+
+
+if __name__ == "__main__":
+    main()
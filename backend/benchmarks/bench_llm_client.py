@@ -0,0 +1,145 @@
+"""
+Gemini 클라이언트 부하 테스트 (로컬 스텁 서버 사용, 네트워크/API 키 불필요).
+
+동시 요청을 보내 처리량, p50/p99 지연, 재시도·요청 한도 대기 수와
+스텁 서버가 관측한 최대 동시 연결 수(= LLM_MAX_CONCURRENCY 이하여야 함)를 출력한다.
+요청마다 텍스트를 다르게 만들어 v1 판정 캐시/single-flight 없이 모든 요청이 LLM까지 가도록 한다.
+
+    uv run python -m benchmarks.bench_llm_client --requests 200 --concurrency 50
+    uv run python -m benchmarks.bench_llm_client --error-rate 0.1 --rate 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+import urllib.request
+
+# 설정 로딩에 필요한 필수 값 (실제 서비스 연결은 하지 않음)
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://bench@localhost/bench")
+os.environ.setdefault("SBERT_MODEL_NAME", "dragonkue/BGE-m3-ko")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+
+async def _run(requests: int, concurrency: int, structured: bool) -> dict:
+    from app.schemas.v1.filter import FilterRequest, FilterResponse
+    from app.services.v1.filter import detectCategory
+    from app.services.v1.llm import agenerate_text
+
+    gate = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failures = 0
+
+    def make_request(seq: int) -> FilterRequest:
+        return FilterRequest.model_validate(
+            {
+                "contents": [
+                    {"idx": 0, "text": f"오늘 날씨가 좋네요. (#{seq})"},
+                    {"idx": 1, "text": f"정치 이야기는 그만했으면 합니다. (#{seq})"},
+                ],
+                "option": {"categories": ["정치", "외모"], "strength": 3},
+            }
+        )
+
+    async def one(seq: int) -> None:
+        nonlocal failures
+        async with gate:
+            started = time.perf_counter()
+            try:
+                if structured:
+                    result = await detectCategory(make_request(seq))
+                    assert isinstance(result, FilterResponse)
+                else:
+                    await agenerate_text(
+                        content="", prompt="예시 문장 생성\n정치 관련 문장"
+                    )
+            except Exception:
+                failures += 1
+                return
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(seq) for seq in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "elapsed": elapsed,
+        "ok": len(latencies),
+        "failures": failures,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--concurrency", type=int, default=50, help="클라이언트 쪽 동시 요청 수"
+    )
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--rate", type=float, default=None, help="LLM_RATE_PER_SECOND 덮어쓰기"
+    )
+    parser.add_argument(
+        "--max-concurrency", type=int, default=None, help="LLM_MAX_CONCURRENCY 덮어쓰기"
+    )
+    parser.add_argument(
+        "--text", action="store_true", help="구조화 출력(v1 필터) 대신 일반 텍스트 생성"
+    )
+    args = parser.parse_args()
+
+    # 설정은 import 시점에 읽으므로 app 모듈보다 먼저 지정
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{args.port}"
+    if args.rate is not None:
+        os.environ["LLM_RATE_PER_SECOND"] = str(args.rate)
+        os.environ["LLM_RATE_BURST"] = str(max(1, int(args.rate)))
+    if args.max_concurrency is not None:
+        os.environ["LLM_MAX_CONCURRENCY"] = str(args.max_concurrency)
+
+    from benchmarks.llm_stub_server import make_server
+
+    server = make_server(
+        port=args.port, latency_ms=args.latency_ms, error_rate=args.error_rate
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    from app.core.config import settings
+    from app.services.v1.llm import llm_client_status, shutdown_llm_client
+
+    try:
+        result = asyncio.run(_run(args.requests, args.concurrency, not args.text))
+        client_stats = llm_client_status()
+    finally:
+        shutdown_llm_client()
+    with urllib.request.urlopen(f"http://127.0.0.1:{args.port}/") as resp:
+        stub_stats = json.load(resp)
+    server.shutdown()
+
+    print(
+        f"LLM_MAX_CONCURRENCY={settings.LLM_MAX_CONCURRENCY} "
+        f"LLM_RATE_PER_SECOND={settings.LLM_RATE_PER_SECOND} "
+        f"stub latency={args.latency_ms:.0f}ms error_rate={args.error_rate}"
+    )
+    print(
+        f"{result['ok']}/{args.requests} ok, {result['failures']} failed in {result['elapsed']:.2f}s "
+        f"({result['ok'] / result['elapsed']:.1f} req/s), "
+        f"p50={result['p50'] * 1000:.0f}ms p99={result['p99'] * 1000:.0f}ms"
+    )
+    print(f"client: {client_stats}")
+    print(f"stub:   {stub_stats}")
+
+
+if __name__ == "__main__":
+    main()
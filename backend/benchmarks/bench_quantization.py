@@ -0,0 +1,118 @@
+"""
+양자화(float16 / int8) 점수 계산 정확도 벤치마크.
+
+float32 경로와 비교해 유사도 오차, 최상위 카테고리 일치율, 그리고 일반적인 임계값에서
+필터 판정(should_filter)이 뒤집히는 비율을 보고한다.
+
+    uv run python -m benchmarks.bench_quantization
+    uv run python -m benchmarks.bench_quantization --corpus texts.txt --category-texts cats.txt
+      (--corpus / --category-texts 를 주면 실제 SBERT 모델로 한 줄씩 임베딩한다)
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://bench@localhost/bench")
+os.environ.setdefault("SBERT_MODEL_NAME", "dragonkue/BGE-m3-ko")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+THRESHOLDS = (0.5, 0.6, 0.7)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def _synthetic(
+    n_texts: int, n_categories: int, dim: int, seed: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """카테고리 중심 주변에 코사인 유사도가 0~1 사이로 고르게 퍼진 텍스트 벡터를 만든다."""
+
+    rng = np.random.default_rng(seed)
+    categories = _normalize(rng.standard_normal((n_categories, dim)))
+    owners = rng.integers(0, n_categories, size=n_texts)
+    alpha = rng.uniform(0.0, 1.0, size=(n_texts, 1))
+    noise = _normalize(rng.standard_normal((n_texts, dim)))
+    texts = alpha * categories[owners] + np.sqrt(1 - alpha**2) * noise
+    return _normalize(texts), categories
+
+
+def _real(corpus_path: str, categories_path: str) -> Tuple[np.ndarray, np.ndarray]:
+    from app.services.v2.embedding import get_embedding_model
+
+    model = get_embedding_model()
+
+    def read_lines(path: str) -> List[str]:
+        with open(path, encoding="utf-8") as fp:
+            return [line.strip() for line in fp if line.strip()]
+
+    texts = model.encode(read_lines(corpus_path))
+    categories = model.encode(read_lines(categories_path))
+    return _normalize(np.asarray(texts)), _normalize(np.asarray(categories))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=20000)
+    parser.add_argument("--categories", type=int, default=8)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", help="텍스트 파일 (한 줄에 하나)")
+    parser.add_argument("--category-texts", help="카테고리 대표 문장 파일 (한 줄에 하나)")
+    args = parser.parse_args()
+
+    from app.services.v2.similarity import _compute_batch_cosine_scores
+    from app.services.v2.vector import dequantize_rows, quantize_rows
+
+    if args.corpus and args.category_texts:
+        texts, categories = _real(args.corpus, args.category_texts)
+    else:
+        texts, categories = _synthetic(
+            args.texts, args.categories, args.dim, args.seed
+        )
+
+    baseline = _compute_batch_cosine_scores(quantize_rows(categories, "none"), texts)
+    baseline_top = baseline.argmax(axis=1)
+
+    print(f"texts={texts.shape[0]} categories={categories.shape[0]} dim={texts.shape[1]}")
+    for mode in ("none", "float16", "int8"):
+        # 실제 경로와 동일하게 텍스트 캐시와 카테고리 캐시를 모두 양자화
+        q_texts = quantize_rows(texts, mode)
+        restored = _normalize(dequantize_rows(q_texts.data, q_texts.scale))
+        q_categories = quantize_rows(categories, mode)
+
+        start = time.perf_counter()
+        scores = _compute_batch_cosine_scores(q_categories, restored)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        error = np.abs(scores - baseline)
+        top_agreement = float((scores.argmax(axis=1) == baseline_top).mean())
+        flips = []
+        for threshold in THRESHOLDS:
+            base_decision = (baseline >= threshold).any(axis=1)
+            decision = (scores >= threshold).any(axis=1)
+            flips.append(int((base_decision != decision).sum()))
+
+        bytes_per_vector = q_texts.nbytes / texts.shape[0]
+        flip_report = ", ".join(
+            f"@{t:.1f}: {f} ({f / texts.shape[0]:.3%})" for t, f in zip(THRESHOLDS, flips)
+        )
+        print(
+            f"{mode:>8}: {bytes_per_vector:7.0f} B/vec | "
+            f"max err {error.max():.5f} | mean err {error.mean():.6f} | "
+            f"top-1 agree {top_agreement:.4%} | score {elapsed_ms:6.1f} ms | "
+            f"decision flips {flip_report}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Gemini generateContent API를 흉내 내는 로컬 HTTP 스텁 서버.
+
+네트워크/API 키 없이 v1 필터와 카테고리 생성을 부하 테스트할 때 사용한다.
+지연 시간과 429/503 오류 비율을 지정해 재시도·요청 한도 동작도 확인할 수 있다.
+
+    uv run python -m benchmarks.llm_stub_server --port 8089 --latency-ms 300 --error-rate 0.05
+    GEMINI_BASE_URL=http://127.0.0.1:8089 uv run uvicorn main:app
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+
+def _parts_text(value: Any) -> str:
+    if isinstance(value, dict):
+        value = [value]
+    texts: List[str] = []
+    for item in value or []:
+        for part in item.get("parts", []) if isinstance(item, dict) else []:
+            if isinstance(part, dict) and "text" in part:
+                texts.append(part["text"])
+    return "\n".join(texts)
+
+
+def _filter_response(content: str) -> Dict[str, Any]:
+    """v1 필터 요청(FilterRequest JSON): 카테고리 이름이 들어 있는 텍스트를 검출한 것으로 응답."""
+
+    try:
+        request = json.loads(content)
+        categories = request["option"]["categories"]
+        contents = request["contents"]
+    except (ValueError, KeyError, TypeError):
+        return {"detectedContents": []}
+    detected = []
+    for item in contents:
+        for category in categories:
+            if category and category in item.get("text", ""):
+                detected.append({"idx": item.get("idx"), "category": category})
+                break
+    return {"detectedContents": detected}
+
+
+def _example_sentences(instruction: str) -> str:
+    """카테고리 예시 문장 생성 요청: 한 줄에 하나씩 5문장."""
+
+    topic = (
+        instruction.strip().splitlines()[1].strip()
+        if "\n" in instruction.strip()
+        else ""
+    )
+    return "\n".join(f"스텁 예시 문장 {idx + 1}: {topic[:60]}" for idx in range(5))
+
+
+class _StubState:
+    def __init__(self, latency_ms: float, jitter_ms: float, error_rate: float) -> None:
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 8089,
+    latency_ms: float = 200.0,
+    jitter_ms: float = 50.0,
+    error_rate: float = 0.0,
+) -> ThreadingHTTPServer:
+    state = _StubState(latency_ms, jitter_ms, error_rate)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive: 클라이언트 연결 풀 재사용 확인용
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _send(
+            self,
+            code: int,
+            payload: Dict[str, Any],
+            headers: Dict[str, str] | None = None,
+        ) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            with state.lock:
+                stats = {
+                    "requests": state.requests,
+                    "errors": state.errors,
+                    "in_flight": state.in_flight,
+                    "max_in_flight": state.max_in_flight,
+                }
+            self._send(200, stats)
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not self.path.endswith(":generateContent"):
+                self._send(
+                    404,
+                    {
+                        "error": {
+                            "code": 404,
+                            "message": "not found",
+                            "status": "NOT_FOUND",
+                        }
+                    },
+                )
+                return
+
+            with state.lock:
+                state.requests += 1
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            try:
+                time.sleep(
+                    max(
+                        0.0, state.latency + random.uniform(-state.jitter, state.jitter)
+                    )
+                )
+                if random.random() < state.error_rate:
+                    with state.lock:
+                        state.errors += 1
+                    code, status = random.choice(
+                        [(429, "RESOURCE_EXHAUSTED"), (503, "UNAVAILABLE")]
+                    )
+                    self._send(
+                        code,
+                        {
+                            "error": {
+                                "code": code,
+                                "message": "stub error",
+                                "status": status,
+                            }
+                        },
+                    )
+                    return
+
+                content = _parts_text(request.get("contents"))
+                config = request.get("generationConfig") or {}
+                if config.get("responseMimeType") == "application/json":
+                    text = json.dumps(_filter_response(content), ensure_ascii=False)
+                else:
+                    text = _example_sentences(
+                        _parts_text(request.get("systemInstruction"))
+                    )
+                self._send(
+                    200,
+                    {
+                        "candidates": [
+                            {
+                                "content": {"role": "model", "parts": [{"text": text}]},
+                                "finishReason": "STOP",
+                                "index": 0,
+                            }
+                        ],
+                        "modelVersion": "stub",
+                    },
+                )
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="429/503 응답 비율 (0~1)"
+    )
+    args = parser.parse_args()
+
+    server = make_server(
+        args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate
+    )
+    print(f"Gemini 스텁 서버: http://{args.host}:{args.port} (GET / 로 통계 확인)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
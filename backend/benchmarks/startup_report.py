@@ -0,0 +1,101 @@
+"""
+서버 시작 비용 리포트.
+
+`python -X importtime -c "import main"` 결과를 모아 누적/자체 import 시간이 큰 모듈을 보여 주고,
+임베딩 모델 로드와 워밍업에 걸린 시간을 따로 측정한다.
+
+    uv run python -m benchmarks.startup_report --top 25
+    uv run python -m benchmarks.startup_report --skip-model   # import 시간만
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://bench@localhost/bench")
+os.environ.setdefault("SBERT_MODEL_NAME", "dragonkue/BGE-m3-ko")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _import_times(module: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """(전체 wall 시간, [(모듈, self_us, cumulative_us)]) 을 반환한다."""
+
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise SystemExit(f"import {module} 실패:\n{proc.stderr[-2000:]}")
+
+    rows: List[Tuple[str, int, int]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        # 이름 앞 공백 수가 import 중첩 깊이를 나타낸다 (최상위는 공백 1칸)
+        rows.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return wall, rows
+
+
+def _depth(name: str) -> int:
+    return (len(name) - len(name.lstrip(" "))) // 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=2, help="누적 시간 표에 포함할 import 깊이")
+    parser.add_argument("--skip-model", action="store_true")
+    args = parser.parse_args()
+
+    wall, rows = _import_times(args.module)
+    total_us = sum(self_us for _, self_us, _ in rows)
+    print(f"import {args.module}: wall {wall:.2f}s (모듈 import 합계 {total_us / 1e6:.2f}s)")
+
+    print(f"\n누적 시간 상위 {args.top}개 ({args.module}에서 깊이 {args.depth}까지)")
+    nested = sorted(
+        (row for row in rows if 1 <= _depth(row[0]) <= args.depth),
+        key=lambda r: r[2],
+        reverse=True,
+    )
+    for name, _, cumulative_us in nested[: args.top]:
+        print(f"  {cumulative_us / 1000:9.1f} ms  {name.strip()}")
+
+    print(f"\n자체 시간 상위 {args.top}개")
+    for name, self_us, _ in sorted(rows, key=lambda r: r[1], reverse=True)[: args.top]:
+        print(f"  {self_us / 1000:9.1f} ms  {name.strip()}")
+
+    if args.skip_model:
+        return
+
+    from app.services.v2.embedding import (
+        load_embedding_backend,
+        warmup_embedding_backend,
+    )
+
+    started = time.perf_counter()
+    backend = load_embedding_backend()
+    load_s = time.perf_counter() - started
+    started = time.perf_counter()
+    warmup_embedding_backend(backend)
+    warmup_s = time.perf_counter() - started
+    print(f"\n임베딩 모델 ({backend.name}): load {load_s:.2f}s, warmup {warmup_s:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,27 @@ from fastapi.responses import RedirectResponse
 from app.core.config import settings
 from app.api.v1.routers import router as api_v1_router
 from app.api.v2.routers import router as api_v2_router
+from app.api.health import router as health_router
 from contextlib import asynccontextmanager
 from app.db import Base
 from app.db import engine
 from app.v2 import models
+from app.services.v1.llm import shutdown_llm_client
+from app.services.v2.auth import shutdown_password_executor
+from app.services.v2.category_cache import (
+    start_category_invalidation_listener,
+    stop_category_invalidation_listener,
+)
+from app.services.v2.category_jobs import (
+    shutdown_category_jobs,
+    start_category_jobs,
+)
+from app.services.v2.embedding import start_embedding_model_loading
+from app.services.v2.feedback import flush_feedback_writes
+from app.services.v2.inference import (
+    configure_io_threadpool,
+    shutdown_inference_executor,
+)
 
 from mangum import Mangum
 
@@ -16,8 +33,24 @@ from mangum import Mangum
 async def lifespan(app: FastAPI):
     # 애플리케이션 시작 시 db 테이블 생성
     Base.metadata.create_all(bind=engine)
+    # 일반 엔드포인트용 스레드 풀 크기 설정 (필터 추론은 별도 풀 사용)
+    configure_io_threadpool()
+    # 임베딩 모델 로드/워밍업을 백그라운드로 시작 (/health/ready 로 상태 확인)
+    if settings.EMBEDDING_PRELOAD:
+        start_embedding_model_loading()
+    # 다른 워커의 카테고리 변경 알림 수신 (Postgres LISTEN/NOTIFY)
+    if settings.CATEGORY_INVALIDATION_LISTEN:
+        start_category_invalidation_listener()
+    # 카테고리 생성 작업 하트비트 + 중단된(처리하던 프로세스가 사라진) 작업 주기적 정리
+    start_category_jobs()
     yield
     # 종료 시 수행할 작업이 있으면 여기에 추가
+    flush_feedback_writes()
+    shutdown_category_jobs()
+    shutdown_llm_client()
+    stop_category_invalidation_listener()
+    shutdown_inference_executor()
+    shutdown_password_executor()
 
 
 app = FastAPI(
@@ -42,6 +75,7 @@ if origins:
 
 app.include_router(api_v1_router, prefix="/api/v1")
 app.include_router(api_v2_router, prefix="/api/v2")
+app.include_router(health_router, prefix="/health", tags=["Health"])
 
 
 @app.get("/")
@@ -0,0 +1,8 @@
+import os
+
+# 설정 로딩에 필요한 필수 값 (테스트는 실제 서비스에 연결하지 않음)
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://test@localhost/test")
+os.environ.setdefault("SBERT_MODEL_NAME", "dragonkue/BGE-m3-ko")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("CATEGORY_INVALIDATION_LISTEN", "false")
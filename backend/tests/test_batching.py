@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from app.services.v2.batching import EmbeddingBatcher
+
+
+class _Interrupted(BaseException):
+    pass
+
+
+def test_rows_are_scattered_back_to_each_caller():
+    calls = []
+
+    def encode(texts):
+        calls.append(list(texts))
+        return np.array([[float(text)] for text in texts], dtype=np.float32)
+
+    batcher = EmbeddingBatcher(encode, max_batch_size=64, max_wait_ms=50.0)
+    futures = [
+        batcher.submit(["1", "2"]),
+        batcher.submit(["3"]),
+        batcher.submit(["4", "5", "6"]),
+    ]
+
+    results = [future.result(timeout=5) for future in futures]
+
+    assert len(calls) == 1
+    assert [r.ravel().tolist() for r in results] == [[1, 2], [3], [4, 5, 6]]
+
+
+def test_encoder_error_is_propagated_to_every_caller():
+    def encode(texts):
+        raise ValueError("model failed")
+
+    batcher = EmbeddingBatcher(encode, max_batch_size=64, max_wait_ms=50.0)
+    futures = [batcher.submit(["a"]), batcher.submit(["b"])]
+
+    for future in futures:
+        with pytest.raises(ValueError, match="model failed"):
+            future.result(timeout=5)
+
+
+def test_base_exception_fails_batch_and_worker_keeps_serving():
+    state = {"interrupt": True}
+
+    def encode(texts):
+        if state.pop("interrupt", False):
+            raise _Interrupted()
+        return np.ones((len(texts), 2), dtype=np.float32)
+
+    batcher = EmbeddingBatcher(encode, max_batch_size=64, max_wait_ms=10.0)
+    failed = batcher.submit(["a"])
+
+    with pytest.raises(RuntimeError) as excinfo:
+        failed.result(timeout=5)
+    assert isinstance(excinfo.value.__cause__, _Interrupted)
+
+    # 같은 워커가 이후 요청도 처리한다
+    assert batcher.submit(["b", "c"]).result(timeout=5).shape == (2, 2)
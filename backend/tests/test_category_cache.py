@@ -0,0 +1,136 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.services.v2 import category_cache
+from app.services.v2.category_cache import CategoryVectorMeta
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache(monkeypatch):
+    category_cache.clear_category_cache()
+    monkeypatch.setattr(category_cache, "get_category_version", lambda db, user_id: 1)
+    yield
+    category_cache.clear_category_cache()
+
+
+def _loaded(db, user_id):
+    prototypes = np.eye(2, 8, dtype=np.float32)
+    return prototypes, np.array([0, 1]), [
+        CategoryVectorMeta(id=1, name="정치"),
+        CategoryVectorMeta(id=2, name="외모"),
+    ]
+
+
+def test_notifications_for_idle_users_are_not_retained():
+    for user_id in range(1000):
+        category_cache._apply_invalidation(f"{user_id}:5")
+    assert category_cache._latest_versions == {}
+
+
+def test_notification_during_load_prevents_stale_entry():
+    def racing_loader(db, user_id):
+        # 버전(1)을 읽은 뒤 적재하는 동안 다른 워커가 카테고리를 바꿈
+        category_cache._apply_invalidation(f"{user_id}:2")
+        return _loaded(db, user_id)
+
+    vectors = category_cache.load_category_vectors(None, 7, racing_loader)
+
+    assert vectors is not None
+    assert 7 not in category_cache._cache
+    assert category_cache._latest_versions == {}
+
+    category_cache.load_category_vectors(None, 7, _loaded)
+    assert category_cache._cache[7].version == 1
+
+
+def _concurrent_loads(user_id: int, loader, count: int = 8):
+    """`count`개 스레드가 동시에 미스를 내고, 모두 합류한 뒤에야 loader가 끝나도록 한다."""
+
+    started = category_cache._stats.coalesced_loads
+    release = threading.Event()
+    calls = []
+
+    def gated_loader(db, uid):
+        calls.append(uid)
+        deadline = time.monotonic() + 5
+        while category_cache._stats.coalesced_loads - started < count - 1:
+            assert time.monotonic() < deadline, "waiters never joined the load"
+            time.sleep(0.001)
+        release.set()
+        return loader(db, uid)
+
+    outcomes = [None] * count
+
+    def worker(idx):
+        try:
+            outcomes[idx] = category_cache.load_category_vectors(
+                None, user_id, gated_loader
+            )
+        except Exception as exc:
+            outcomes[idx] = exc
+
+    threads = [threading.Thread(target=worker, args=(idx,)) for idx in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert release.is_set()
+    return calls, outcomes
+
+
+def test_concurrent_misses_share_one_load():
+    calls, outcomes = _concurrent_loads(11, _loaded)
+
+    assert calls == [11]
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+    assert category_cache._cache[11].vectors is outcomes[0]
+    assert category_cache._inflight == {}
+
+
+def test_failed_load_wakes_every_waiter_with_the_error():
+    def failing_loader(db, user_id):
+        raise RuntimeError("db down")
+
+    calls, outcomes = _concurrent_loads(12, failing_loader)
+
+    assert calls == [12]
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert 12 not in category_cache._cache
+    assert category_cache._inflight == {}
+
+
+def test_patch_replaces_matrix_without_touching_readers_copy():
+    old = category_cache.load_category_vectors(None, 21, _loaded)
+    old_data = old.matrix.data.copy()
+    new_rows = np.full((2, 8), 0.5, dtype=np.float32)
+
+    # 캐시가 버전 1이므로 이 변경으로 올라간 버전 2만 적용된다
+    assert category_cache.patch_category_vectors(21, 2, {1: new_rows})
+
+    patched = category_cache._cache[21]
+    assert patched.version == 2
+    assert patched.vectors is not old
+    np.testing.assert_array_equal(patched.vectors.matrix.data[:2], new_rows)
+    np.testing.assert_array_equal(patched.vectors.matrix.data[2], old_data[1])
+    assert patched.vectors.offsets.tolist() == [0, 2]
+    # 이전 행렬을 들고 있던 요청은 변경 전 값을 그대로 본다
+    np.testing.assert_array_equal(old.matrix.data, old_data)
+    assert old.offsets.tolist() == [0, 1]
+
+
+@pytest.mark.parametrize("version", [1, 3])
+def test_patch_with_stale_version_is_not_applied(version):
+    old = category_cache.load_category_vectors(None, 22, _loaded)
+    old_data = old.matrix.data.copy()
+
+    applied = category_cache.patch_category_vectors(
+        22, version, {1: np.full((1, 8), 0.5, dtype=np.float32)}
+    )
+
+    # 캐시(버전 1)의 바로 다음 버전이 아니면 적용하지 않고 항목을 버린다
+    assert not applied
+    assert 22 not in category_cache._cache
+    np.testing.assert_array_equal(old.matrix.data, old_data)
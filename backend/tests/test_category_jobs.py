@@ -0,0 +1,97 @@
+import datetime
+import json
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base
+from app.services.v2 import category_jobs
+from app.services.v2.category_jobs import CategoryJobRunner, _JobSpec
+from app.v2.models import CategoryJob, User
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    monkeypatch.setattr(category_jobs, "SessionLocal", factory)
+    monkeypatch.setattr(category_jobs, "load_example_set", lambda *args: None)
+    with factory() as db:
+        db.add(User(id=1, username="user", password_hash="x"))
+        db.commit()
+    yield factory
+    engine.dispose()
+
+
+def _add_job(factory, job_id: str, updated_at: datetime.datetime | None = None) -> None:
+    now = updated_at or datetime.datetime.utcnow()
+    with factory() as db:
+        db.add(
+            CategoryJob(
+                id=job_id,
+                user_id=1,
+                name="정치",
+                keywords=json.dumps(["선거"]),
+                status="pending",
+                created_at=now,
+                updated_at=now,
+            )
+        )
+        db.commit()
+
+
+def _status(factory, job_id: str) -> tuple[str, str | None]:
+    with factory() as db:
+        job = db.get(CategoryJob, job_id)
+        return job.status, job.error
+
+
+def test_shutdown_fails_in_flight_and_cancelled_jobs(session_factory, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_generate(name, keywords):
+        started.set()
+        release.wait(5)
+        return ["예시 문장"]
+
+    monkeypatch.setattr(category_jobs, "generate_example_sentences", slow_generate)
+    stored = []
+    monkeypatch.setattr(category_jobs, "_store_job", lambda *args: stored.append(args))
+
+    runner = CategoryJobRunner(llm_concurrency=1)
+    for job_id in ("running", "queued"):
+        _add_job(session_factory, job_id)
+        runner.enqueue(_JobSpec(job_id, 1, "정치", ["선거"], None))
+    assert started.wait(5)
+
+    runner.shutdown()
+    release.set()
+
+    # 실행 중이던 작업도, 취소되어 실행되지 못한 작업도 실패로 남는다
+    assert _status(session_factory, "running")[0] == "failed"
+    assert _status(session_factory, "queued")[0] == "failed"
+    assert runner.active_job_ids() == []
+
+
+def test_sweep_fails_only_jobs_without_heartbeat(session_factory, monkeypatch):
+    runner = CategoryJobRunner(heartbeat_seconds=1, stale_seconds=60)
+    monkeypatch.setattr(category_jobs, "category_job_runner", runner)
+    long_ago = datetime.datetime.utcnow() - datetime.timedelta(minutes=10)
+    _add_job(session_factory, "orphaned", updated_at=long_ago)
+    _add_job(session_factory, "alive", updated_at=long_ago)
+
+    # 이 프로세스가 처리 중인 작업은 하트비트로 갱신되어 정리 대상에서 빠진다
+    category_jobs.touch_category_jobs(["alive"])
+    category_jobs.fail_interrupted_category_jobs()
+
+    assert _status(session_factory, "orphaned")[0] == "failed"
+    assert _status(session_factory, "alive")[0] == "pending"
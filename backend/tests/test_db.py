@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_sqlite_database_url_imports_without_async_driver(tmp_path):
+    # 비동기 엔진은 처음 사용할 때 만들어지므로 sqlite URL로도 import와 동기 쿼리가 동작해야 한다
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'app.db'}"}
+    script = (
+        "from sqlalchemy import text\n"
+        "from app.db import SessionLocal, database_pool_status\n"
+        "with SessionLocal() as db:\n"
+        "    assert db.execute(text('select 1')).scalar_one() == 1\n"
+        "assert database_pool_status()['async']['pool'] == 'not initialized'\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
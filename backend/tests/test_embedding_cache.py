@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from app.services.v2.embedding_cache import _ArenaEmbeddingCache
+
+DIM = 1024
+BUDGET = 8 * 1024 * 1024
+
+
+@pytest.mark.parametrize("quantization", ["none", "float16", "int8"])
+def test_arena_stays_within_byte_budget(quantization):
+    cache = _ArenaEmbeddingCache(max_bytes=BUDGET, quantization=quantization)
+    cache.set("a", np.ones(DIM, dtype=np.float32))
+
+    stats = cache.stats()
+    assert stats["bytes"] <= BUDGET
+    np.testing.assert_allclose(cache.get("a"), np.ones(DIM), atol=1e-2)
+
+
+def test_reduced_precision_holds_more_entries_in_same_budget():
+    capacities = {}
+    for quantization in ("none", "float16", "int8"):
+        cache = _ArenaEmbeddingCache(max_bytes=BUDGET, quantization=quantization)
+        cache.set("a", np.ones(DIM, dtype=np.float32))
+        capacities[quantization] = cache.stats()["capacity"]
+
+    assert capacities["float16"] > 1.8 * capacities["none"]
+    assert capacities["int8"] > 3.4 * capacities["none"]
+
+
+def test_eviction_keeps_entry_count_at_capacity():
+    cache = _ArenaEmbeddingCache(max_bytes=20 * (DIM * 4 + 200))
+    for idx in range(100):
+        cache.set(str(idx), np.full(DIM, idx, dtype=np.float32))
+
+    stats = cache.stats()
+    assert stats["entries"] == stats["capacity"] < 100
+    assert stats["evictions"] == 100 - stats["capacity"]
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services.v2 import embedding_service
+from app.services.v2.embedding_cache import _ArenaEmbeddingCache, _TieredEmbeddingCache
+from app.v2.models import EMBEDDING_DIM
+
+
+@pytest.mark.parametrize("quantization", ["float16", "int8"])
+def test_first_and_cached_requests_score_identically(monkeypatch, quantization):
+    monkeypatch.setattr(settings, "EMBEDDING_QUANTIZATION", quantization)
+    monkeypatch.setattr(
+        embedding_service,
+        "embedding_cache",
+        _TieredEmbeddingCache(_ArenaEmbeddingCache(quantization=quantization)),
+    )
+    rng = np.random.default_rng(0)
+    raw = rng.standard_normal((3, EMBEDDING_DIM)).astype(np.float32)
+    calls = []
+
+    def fake_encode(texts):
+        calls.append(list(texts))
+        return raw[: len(texts)]
+
+    monkeypatch.setattr(embedding_service, "encode_texts", fake_encode)
+    texts = ["가", "나", "다"]
+
+    first = embedding_service.embed_canonical_texts(texts)
+    second = embedding_service.embed_canonical_texts(texts)
+
+    assert len(calls) == 1
+    np.testing.assert_array_equal(first, second)
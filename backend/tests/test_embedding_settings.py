@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.services.v2.embedding import SentenceTransformerBackend
+from app.services.v2.embedding_cache import _disk_cache_namespace
+
+
+def _fake_model(max_seq_length: int):
+    return SimpleNamespace(
+        max_seq_length=max_seq_length,
+        tokenizer=SimpleNamespace(truncation_side="right"),
+    )
+
+
+def test_model_max_seq_length_is_kept_by_default(monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_MAX_SEQ_LENGTH", None)
+    backend = SentenceTransformerBackend("bge-m3", _fake_model(8192))
+    assert backend.model.max_seq_length == 8192
+
+    monkeypatch.setattr(settings, "EMBEDDING_MAX_SEQ_LENGTH", 512)
+    backend = SentenceTransformerBackend("bge-m3", _fake_model(8192))
+    assert backend.model.max_seq_length == 512
+
+
+def test_disk_cache_namespace_changes_with_truncation_settings(monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_MAX_SEQ_LENGTH", None)
+    monkeypatch.setattr(settings, "EMBEDDING_TRUNCATION_SIDE", "right")
+    default = _disk_cache_namespace()
+
+    monkeypatch.setattr(settings, "EMBEDDING_MAX_SEQ_LENGTH", 512)
+    shorter = _disk_cache_namespace()
+
+    monkeypatch.setattr(settings, "EMBEDDING_TRUNCATION_SIDE", "left")
+    left = _disk_cache_namespace()
+
+    assert len({default, shorter, left}) == 3
@@ -0,0 +1,20 @@
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.v2.feedback import FeedbackBatchRequest, FeedbackRequest
+
+
+@pytest.mark.parametrize("text", ["", "   ", "\n\t 　"])
+def test_blank_text_content_is_rejected(text):
+    with pytest.raises(ValidationError):
+        FeedbackRequest(text_content=text, category_id=1, feedback_type="reinforce")
+
+
+def test_blank_item_rejects_whole_batch():
+    with pytest.raises(ValidationError):
+        FeedbackBatchRequest(
+            items=[
+                {"text_content": "정상 텍스트", "category_id": 1, "feedback_type": "weaken"},
+                {"text_content": " ", "category_id": 1, "feedback_type": "weaken"},
+            ]
+        )
@@ -0,0 +1,110 @@
+import time
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db import Base
+from app.services.v2 import feedback
+from app.services.v2.feedback_writer import FeedbackEvent, FeedbackWriteBehind
+from app.services.v2.vector import (
+    deserialize_vector,
+    normalize_vector,
+    serialize_matrix,
+    serialize_normalized_vector,
+)
+from app.v2.models import EMBEDDING_DIM, Category, User
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    yield factory
+    engine.dispose()
+
+
+def _unit(seed: int) -> np.ndarray:
+    return normalize_vector(np.random.default_rng(seed).standard_normal(EMBEDDING_DIM))
+
+
+def test_flush_retries_after_occ_retries_are_exhausted(session_factory, monkeypatch):
+    original = _unit(1)
+    with session_factory() as db:
+        db.add(User(id=1, username="user", password_hash="x"))
+        db.add(
+            Category(
+                id=1,
+                user_id=1,
+                name="정치",
+                embedding=serialize_normalized_vector(original),
+                prototypes=serialize_matrix(original.reshape(1, -1)),
+            )
+        )
+        db.commit()
+
+    # 첫 번째 반영에서 OCC 재시도 한도를 모두 소진하도록 StaleDataError를 강제
+    stale_calls = {"remaining": settings.FEEDBACK_OCC_RETRIES}
+    apply_events = feedback._apply_events
+
+    def flaky_apply_events(categories, events):
+        if stale_calls["remaining"] > 0:
+            stale_calls["remaining"] -= 1
+            raise StaleDataError("forced concurrent update")
+        return apply_events(categories, events)
+
+    monkeypatch.setattr(feedback, "_apply_events", flaky_apply_events)
+    monkeypatch.setattr(feedback, "patch_category_vectors", lambda *args: None)
+
+    def flush_fn(user_id, events):
+        with session_factory() as db:
+            feedback._commit_feedback(db, user_id, events)
+
+    writer = FeedbackWriteBehind(
+        flush_fn, flush_interval_ms=1, max_events=1, retry_base_ms=10, retry_max_ms=50
+    )
+    writer.submit(1, [FeedbackEvent(1, _unit(2), "reinforce")])
+
+    deadline = time.monotonic() + 5.0
+    while writer.stats()["category_updates"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    stats = writer.stats()
+    assert stats["flush_errors"] >= 1
+    assert stats["category_updates"] == 1
+    assert stats["pending"] == 0
+    assert stats["retrying_users"] == 0
+
+    with session_factory() as db:
+        updated = deserialize_vector(db.get(Category, 1).embedding)
+    assert not np.allclose(updated, original)
+
+
+def test_failed_events_stay_ahead_of_newer_events():
+    calls = []
+
+    def flush_fn(user_id, events):
+        calls.append([event.feedback_type for event in events])
+        if len(calls) == 1:
+            raise RuntimeError("db down")
+
+    writer = FeedbackWriteBehind(
+        flush_fn, flush_interval_ms=1000, max_events=100, retry_base_ms=1, retry_max_ms=1
+    )
+    vector = _unit(3)
+    writer._pending[1] = [FeedbackEvent(1, vector, "reinforce")]
+    writer._pending_count = 1
+    writer._write(writer._take_ready())
+    writer.submit(1, [FeedbackEvent(1, vector, "weaken")])
+    writer.flush()
+
+    assert calls == [["reinforce"], ["reinforce", "weaken"]]
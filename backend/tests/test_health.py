@@ -0,0 +1,13 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import health
+
+
+def test_ready_reports_embedding_cache_tiers():
+    app = FastAPI()
+    app.include_router(health.router)
+
+    payload = TestClient(app).get("/ready").json()
+
+    assert {"hits", "misses", "evictions"} <= set(payload["embedding_cache"]["l1"])
@@ -0,0 +1,108 @@
+import asyncio
+
+from app.schemas.v1.filter import DetectedContent
+from app.schemas.v1.filter import FilterResponse as LLMFilterResponse
+from app.schemas.v2.filter import (
+    FilterResponse,
+    FilterResult,
+    HybridFilterRequest,
+    MatchedCategoryInfo,
+)
+from app.services.v2 import hybrid
+
+
+def _result(text: str, scores: dict[str, float]) -> FilterResult:
+    matched = [
+        MatchedCategoryInfo(id=idx, name=name, similarity=score)
+        for idx, (name, score) in enumerate(
+            sorted(scores.items(), key=lambda item: -item[1])
+        )
+    ]
+    return FilterResult(text=text, should_filter=False, matched_categories=matched)
+
+
+def _patch_scores(monkeypatch, results):
+    async def fake_run_inference(func, *args):
+        return FilterResponse(results=results)
+
+    monkeypatch.setattr(hybrid, "run_inference", fake_run_inference)
+
+
+def _request(count: int) -> HybridFilterRequest:
+    return HybridFilterRequest(
+        texts=[f"t{idx}" for idx in range(count)],
+        threshold=0.6,
+        upper_margin=0.1,
+        lower_margin=0.1,
+    )
+
+
+def test_ambiguous_texts_are_asked_only_about_their_own_candidates(monkeypatch):
+    _patch_scores(
+        monkeypatch,
+        [
+            _result("t0", {"정치": 0.62, "외모": 0.55}),
+            _result("t1", {"욕설": 0.58}),
+            _result("t2", {"정치": 0.61, "외모": 0.52}),
+        ],
+    )
+    calls = []
+
+    async def fake_detect(llm_req):
+        calls.append(
+            (
+                sorted(llm_req.option.categories),
+                [content.idx for content in llm_req.contents],
+            )
+        )
+        # 텍스트의 첫 후보가 아닌 카테고리를 골라도 그 텍스트의 후보라면 인정
+        detected = [
+            DetectedContent(idx=content.idx, category=llm_req.option.categories[-1])
+            for content in llm_req.contents
+        ]
+        return LLMFilterResponse(detectedContents=detected)
+
+    monkeypatch.setattr(hybrid, "detectCategory", fake_detect)
+    resp = asyncio.run(hybrid.cascade_filter(1, _request(3)))
+
+    assert sorted(calls) == [(["외모", "정치"], [0, 2]), (["욕설"], [1])]
+    assert [r.should_filter for r in resp.results] == [True, True, True]
+    assert [r.matched_categories[0].name for r in resp.results] == ["정치", "욕설", "정치"]
+    assert resp.escalated == 3 and not resp.llm_fallback
+
+
+def test_failed_llm_group_falls_back_and_is_not_counted(monkeypatch):
+    _patch_scores(
+        monkeypatch,
+        [_result("t0", {"정치": 0.62}), _result("t1", {"욕설": 0.58})],
+    )
+
+    async def fake_detect(llm_req):
+        if "욕설" in llm_req.option.categories:
+            raise RuntimeError("LLM unavailable")
+        return LLMFilterResponse(detectedContents=[])
+
+    monkeypatch.setattr(hybrid, "detectCategory", fake_detect)
+    resp = asyncio.run(hybrid.cascade_filter(1, _request(2)))
+
+    # t0: LLM이 검출하지 않음 → 통과, t1: LLM 실패 → 임계값(0.6) 미만이라 통과
+    assert [r.should_filter for r in resp.results] == [False, False]
+    assert [r.escalated for r in resp.results] == [True, False]
+    assert resp.escalated == 1 and resp.llm_fallback
+
+
+def test_llm_can_confirm_several_candidates_for_one_text(monkeypatch):
+    _patch_scores(monkeypatch, [_result("t0", {"정치": 0.62, "외모": 0.55})])
+
+    async def fake_detect(llm_req):
+        return LLMFilterResponse(
+            detectedContents=[
+                DetectedContent(idx=0, category="외모"),
+                DetectedContent(idx=0, category="정치"),
+            ]
+        )
+
+    monkeypatch.setattr(hybrid, "detectCategory", fake_detect)
+    resp = asyncio.run(hybrid.cascade_filter(1, _request(1)))
+
+    assert [m.name for m in resp.results[0].matched_categories] == ["정치", "외모"]
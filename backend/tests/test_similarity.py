@@ -0,0 +1,49 @@
+import numpy as np
+
+from app.services.v2 import similarity as similarity_module
+from app.services.v2.category_cache import CategoryVectorMeta, CategoryVectors
+from app.services.v2.vector import QuantizedMatrix
+from app.v2.models import EMBEDDING_DIM
+
+
+def _unit(axis: int) -> np.ndarray:
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    vector[axis] = 1.0
+    return vector
+
+
+def _patch_model(monkeypatch):
+    # 정치가 들어간 구간만 카테고리 벡터와 같은 방향으로 임베딩
+    def fake_embed(texts):
+        return np.stack([_unit(0) if "정치" in text else _unit(1) for text in texts])
+
+    vectors = CategoryVectors(
+        matrix=QuantizedMatrix(data=_unit(0).reshape(1, -1)),
+        offsets=np.array([0]),
+        meta=[CategoryVectorMeta(id=1, name="정치")],
+    )
+    monkeypatch.setattr(similarity_module, "embed_canonical_texts", fake_embed)
+    monkeypatch.setattr(
+        similarity_module, "load_category_vectors", lambda db, user_id, loader: vectors
+    )
+
+
+def test_long_text_spans_follow_each_text_offsets(monkeypatch):
+    _patch_model(monkeypatch)
+    monkeypatch.setattr(similarity_module.settings, "LONG_TEXT_WINDOW_CHARS", 40)
+    text = "오늘은 날씨 이야기를 합니다. " * 6 + "정치 이야기는 그만했으면 합니다."
+    shifted = "     " + text
+
+    resp = similarity_module.similarity(
+        db=None,
+        user_id=1,
+        texts_to_check=[text, shifted],
+        threshold=0.5,
+        long_text_mode=True,
+    )
+
+    spans = [result.matched_categories[0].span for result in resp.results]
+    # 구간 정규형은 같아도 위치는 텍스트마다 달라야 한다
+    assert text[spans[0].start : spans[0].end].strip().startswith("정치")
+    assert shifted[spans[1].start : spans[1].end].strip().startswith("정치")
+    assert spans[1].start == spans[0].start + 5
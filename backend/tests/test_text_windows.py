@@ -0,0 +1,30 @@
+from app.services.v2.text import split_into_windows
+
+
+def _window_texts(text: str, max_chars: int = 400) -> list[str]:
+    return [text[start:end] for start, end in split_into_windows(text, max_chars)]
+
+
+def _page(count: int) -> list[str]:
+    return [
+        f"{idx}번째 문장에서는 오늘 있었던 일과 그에 대한 생각을 조금 길게 적어 봅니다."
+        for idx in range(count)
+    ]
+
+
+def test_windows_cover_text_within_max_chars():
+    text = " ".join(_page(30))
+    windows = split_into_windows(text, 400)
+    assert all(end - start <= 400 for start, end in windows)
+    assert windows[0][0] == 0 and windows[-1][1] == len(text)
+    assert all(prev[1] <= cur[0] for prev, cur in zip(windows, windows[1:]))
+
+
+def test_prepended_sentence_only_changes_leading_windows():
+    sentences = _page(30)
+    before = _window_texts(" ".join(sentences))
+    after = _window_texts(" ".join(["새로 추가된 첫 문장입니다."] + sentences))
+
+    unchanged = set(before) & set(after)
+    # 다음 내용 기반 경계 이후의 구간은 그대로 재사용된다
+    assert len(unchanged) >= len(before) - 2
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from app.schemas.v1.filter import DetectedContent, FilterRequest, FilterResponse
+from app.services.v1 import filter as v1_filter
+from app.services.v1.verdict_cache import verdict_cache
+
+
+def _request(*texts: str) -> FilterRequest:
+    return FilterRequest.model_validate(
+        {
+            "contents": [{"idx": idx, "text": text} for idx, text in enumerate(texts)],
+            "option": {"categories": ["정치", "외모"], "strength": 3},
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    verdict_cache.clear()
+    yield
+    verdict_cache.clear()
+
+
+def test_concurrent_misses_share_one_llm_call(monkeypatch):
+    sent = []
+
+    async def fake_detect_shard(texts, option):
+        sent.extend(texts)
+        await asyncio.sleep(0.05)
+        return [("정치",) if "정치" in text else () for text in texts]
+
+    monkeypatch.setattr(v1_filter, "_detect_shard", fake_detect_shard)
+
+    async def run():
+        return await asyncio.gather(
+            v1_filter.detectCategory(_request("정치 이야기", "날씨 이야기")),
+            v1_filter.detectCategory(_request("날씨 이야기", "정치 이야기")),
+        )
+
+    first, second = asyncio.run(run())
+
+    assert sorted(sent) == ["날씨 이야기", "정치 이야기"]
+    assert [(d.idx, d.category) for d in first.detectedContents] == [(0, "정치")]
+    assert [(d.idx, d.category) for d in second.detectedContents] == [(1, "정치")]
+    assert v1_filter._in_flight == {}
+
+
+def test_waiting_request_sees_shared_failure(monkeypatch):
+    async def failing_detect_shard(texts, option):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("LLM unavailable")
+
+    monkeypatch.setattr(v1_filter, "_detect_shard", failing_detect_shard)
+
+    async def run():
+        return await asyncio.gather(
+            v1_filter.detectCategory(_request("정치 이야기")),
+            v1_filter.detectCategory(_request("정치 이야기")),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert v1_filter._in_flight == {}
+
+
+def test_text_detected_in_two_categories_reports_both(monkeypatch):
+    calls = []
+
+    async def fake_agenerate_text(content, prompt, respSchema):
+        calls.append(content)
+        return FilterResponse(
+            detectedContents=[
+                DetectedContent(idx=0, category="외모"),
+                DetectedContent(idx=0, category="정치"),
+                DetectedContent(idx=0, category="정치"),
+            ]
+        )
+
+    monkeypatch.setattr(v1_filter, "agenerate_text", fake_agenerate_text)
+    req = _request("정치인의 외모를 비하하는 글", "날씨 이야기")
+
+    first = asyncio.run(v1_filter.detectCategory(req))
+    # 두 번째 요청은 캐시된 판정(카테고리 튜플)에서 같은 결과를 만든다
+    second = asyncio.run(v1_filter.detectCategory(req))
+
+    expected = [(0, "외모"), (0, "정치")]
+    assert [(d.idx, d.category) for d in first.detectedContents] == expected
+    assert [(d.idx, d.category) for d in second.detectedContents] == expected
+    assert len(calls) == 1